@@ -0,0 +1,59 @@
+"""usc section version mapping for delta release imports
+
+Revision ID: 3c8f1d6b9a52
+Revises: 7b0e4c9a2d13
+Create Date: 2026-10-18 17:02:11.418203
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3c8f1d6b9a52"
+down_revision: Union[str, Sequence[str], None] = "7b0e4c9a2d13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "usc_section_version",
+        sa.Column("usc_section_version_id", sa.Integer(), nullable=False),
+        sa.Column("version_id", sa.Integer(), nullable=False),
+        sa.Column("usc_section_id", sa.Integer(), nullable=False),
+        sa.Column("source_version_id", sa.Integer(), nullable=False),
+        sa.Column("usc_ident", sa.String(), nullable=False),
+        sa.Column("section_hash", sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["version_id"], ["version.version_id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(
+            ["usc_section_id"], ["usc_section.usc_section_id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(
+            ["source_version_id"], ["version.version_id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("usc_section_version_id"),
+    )
+    op.create_index(
+        "usc_section_version_ident",
+        "usc_section_version",
+        ["version_id", "usc_ident"],
+        unique=False,
+    )
+    op.create_index(
+        "usc_section_version_lookup",
+        "usc_section_version",
+        ["version_id", "usc_section_id", "source_version_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("usc_section_version_lookup", table_name="usc_section_version")
+    op.drop_index("usc_section_version_ident", table_name="usc_section_version")
+    op.drop_table("usc_section_version")
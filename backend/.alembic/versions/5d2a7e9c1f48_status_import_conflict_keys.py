@@ -0,0 +1,94 @@
+"""status import conflict keys
+
+Revision ID: 5d2a7e9c1f48
+Revises: 9e41b7c2d805
+Create Date: 2026-10-18 09:12:05.184223
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5d2a7e9c1f48"
+down_revision: Union[str, Sequence[str], None] = "9e41b7c2d805"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keep the oldest row of any duplicates before the unique keys go on
+    op.execute(
+        """
+        DELETE FROM legislation_committee_association a
+        USING legislation_committee_association b
+        WHERE a.legislation_committee_id = b.legislation_committee_id
+          AND a.legislation_id = b.legislation_id
+          AND a.committee_association_id > b.committee_association_id
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM legislative_subject_association a
+        USING legislative_subject_association b
+        WHERE a.legislation_id = b.legislation_id
+          AND a.legislative_subject_id = b.legislative_subject_id
+          AND a.legislative_subject_association_id > b.legislative_subject_association_id
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM legislative_policy_area_association a
+        USING legislative_policy_area_association b
+        WHERE a.legislation_id = b.legislation_id
+          AND a.legislative_policy_area_id = b.legislative_policy_area_id
+          AND a.legislative_policy_area_association_id
+              > b.legislative_policy_area_association_id
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM legislation_action a
+        USING legislation_action b
+        WHERE a.legislation_id = b.legislation_id
+          AND md5(a.raw::text) = md5(b.raw::text)
+          AND a.legislation_action_id > b.legislation_action_id
+        """
+    )
+    op.create_unique_constraint(
+        "unq_leg_committee_assoc",
+        "legislation_committee_association",
+        ["legislation_committee_id", "legislation_id"],
+    )
+    op.create_unique_constraint(
+        "unq_leg_subj_assoc",
+        "legislative_subject_association",
+        ["legislation_id", "legislative_subject_id"],
+    )
+    op.create_unique_constraint(
+        "unq_leg_pol_assoc",
+        "legislative_policy_area_association",
+        ["legislation_id", "legislative_policy_area_id"],
+    )
+    op.create_index(
+        "legislation_action_raw",
+        "legislation_action",
+        ["legislation_id", sa.text("md5(raw::text)")],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("legislation_action_raw", table_name="legislation_action")
+    op.drop_constraint(
+        "unq_leg_pol_assoc", "legislative_policy_area_association", type_="unique"
+    )
+    op.drop_constraint(
+        "unq_leg_subj_assoc", "legislative_subject_association", type_="unique"
+    )
+    op.drop_constraint(
+        "unq_leg_committee_assoc", "legislation_committee_association", type_="unique"
+    )
@@ -0,0 +1,59 @@
+"""legislation source file fingerprints
+
+Revision ID: 5d2c81f0a7e4
+Revises: f141b3473b1f, a1b2c3d4e5f6
+Create Date: 2026-10-18 14:02:11.418209
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5d2c81f0a7e4"
+down_revision: Union[str, Sequence[str], None] = ("f141b3473b1f", "a1b2c3d4e5f6")
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "legislation_source_file",
+        sa.Column("legislation_source_file_id", sa.Integer(), nullable=False),
+        sa.Column("member_name", sa.String(), nullable=False),
+        sa.Column("archive_name", sa.String(), nullable=True),
+        sa.Column("crc32", sa.BIGINT(), nullable=False),
+        sa.Column("file_size", sa.BIGINT(), nullable=False),
+        sa.Column("sha256", sa.String(), nullable=True),
+        sa.Column("legislation_version_id", sa.Integer(), nullable=True),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.ForeignKeyConstraint(
+            ["legislation_version_id"],
+            ["legislation_version.legislation_version_id"],
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("legislation_source_file_id"),
+        sa.UniqueConstraint("member_name"),
+    )
+    op.create_index(
+        op.f("ix_legislation_source_file_legislation_version_id"),
+        "legislation_source_file",
+        ["legislation_version_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f("ix_legislation_source_file_legislation_version_id"),
+        table_name="legislation_source_file",
+    )
+    op.drop_table("legislation_source_file")
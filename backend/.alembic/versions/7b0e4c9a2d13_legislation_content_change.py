@@ -0,0 +1,87 @@
+"""legislation content changes between versions
+
+Revision ID: 7b0e4c9a2d13
+Revises: 5d2c81f0a7e4
+Create Date: 2026-10-18 15:20:43.102871
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7b0e4c9a2d13"
+down_revision: Union[str, Sequence[str], None] = "5d2c81f0a7e4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "legislation_content_change",
+        sa.Column("legislation_content_change_id", sa.Integer(), nullable=False),
+        sa.Column("legislation_version_id", sa.Integer(), nullable=True),
+        sa.Column("previous_legislation_version_id", sa.Integer(), nullable=True),
+        sa.Column("legislation_content_id", sa.Integer(), nullable=True),
+        sa.Column("previous_legislation_content_id", sa.Integer(), nullable=True),
+        sa.Column("lc_ident", sa.String(), nullable=True),
+        sa.Column("change_type", sa.String(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["legislation_version_id"],
+            ["legislation_version.legislation_version_id"],
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["previous_legislation_version_id"],
+            ["legislation_version.legislation_version_id"],
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["legislation_content_id"],
+            ["legislation_content.legislation_content_id"],
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["previous_legislation_content_id"],
+            ["legislation_content.legislation_content_id"],
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("legislation_content_change_id"),
+    )
+    op.create_index(
+        op.f("ix_legislation_content_change_legislation_version_id"),
+        "legislation_content_change",
+        ["legislation_version_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_legislation_content_change_previous_legislation_version_id"),
+        "legislation_content_change",
+        ["previous_legislation_version_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_legislation_content_change_legislation_content_id"),
+        "legislation_content_change",
+        ["legislation_content_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f("ix_legislation_content_change_legislation_content_id"),
+        table_name="legislation_content_change",
+    )
+    op.drop_index(
+        op.f("ix_legislation_content_change_previous_legislation_version_id"),
+        table_name="legislation_content_change",
+    )
+    op.drop_index(
+        op.f("ix_legislation_content_change_legislation_version_id"),
+        table_name="legislation_content_change",
+    )
+    op.drop_table("legislation_content_change")
@@ -0,0 +1,41 @@
+"""usc section sort order
+
+Revision ID: 9e41b7c2d805
+Revises: 3c8f1d6b9a52
+Create Date: 2026-10-18 19:11:37.520914
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9e41b7c2d805"
+down_revision: Union[str, Sequence[str], None] = "3c8f1d6b9a52"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("usc_section", sa.Column("sort_order", sa.Integer(), nullable=True))
+    op.create_index(
+        "usc_section_chapter_order",
+        "usc_section",
+        ["usc_chapter_id", "sort_order"],
+        unique=False,
+    )
+    op.create_index(
+        "usc_section_parent_order",
+        "usc_section",
+        ["parent_id", "sort_order"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("usc_section_parent_order", table_name="usc_section")
+    op.drop_index("usc_section_chapter_order", table_name="usc_section")
+    op.drop_column("usc_section", "sort_order")
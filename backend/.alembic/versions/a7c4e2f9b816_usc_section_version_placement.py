@@ -0,0 +1,105 @@
+"""usc section version chapter and parent
+
+Revision ID: a7c4e2f9b816
+Revises: f3a6c8e1b254
+Create Date: 2026-10-18 12:31:05.772049
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a7c4e2f9b816"
+down_revision: Union[str, Sequence[str], None] = "f3a6c8e1b254"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "usc_section_version", sa.Column("usc_chapter_id", sa.Integer(), nullable=True)
+    )
+    op.add_column(
+        "usc_section_version", sa.Column("parent_id", sa.Integer(), nullable=True)
+    )
+    op.create_foreign_key(
+        "usc_section_version_usc_chapter_id_fkey",
+        "usc_section_version",
+        "usc_chapter",
+        ["usc_chapter_id"],
+        ["usc_chapter_id"],
+        ondelete="CASCADE",
+    )
+    op.create_foreign_key(
+        "usc_section_version_parent_id_fkey",
+        "usc_section_version",
+        "usc_section",
+        ["parent_id"],
+        ["usc_section_id"],
+        ondelete="CASCADE",
+    )
+    op.create_index(
+        "usc_section_version_chapter",
+        "usc_section_version",
+        ["usc_chapter_id", "parent_id"],
+        unique=False,
+    )
+    # Sections the release wrote itself are placed where their own row says
+    op.execute(
+        """
+        UPDATE usc_section_version v
+           SET usc_chapter_id = s.usc_chapter_id,
+               parent_id = s.parent_id
+          FROM usc_section s
+         WHERE s.usc_section_id = v.usc_section_id
+           AND v.source_version_id = v.version_id
+        """
+    )
+    # Carried sections go under the same title, and the organizational section with
+    # the same identifier, in the release that carried them
+    op.execute(
+        """
+        UPDATE usc_section_version v
+           SET usc_chapter_id = (
+                   SELECT c.usc_chapter_id
+                     FROM usc_section s
+                     JOIN usc_chapter sc ON sc.usc_chapter_id = s.usc_chapter_id
+                     JOIN usc_chapter c
+                       ON c.short_title = sc.short_title
+                      AND c.version_id = v.version_id
+                    WHERE s.usc_section_id = v.usc_section_id
+                    ORDER BY c.usc_chapter_id
+                    LIMIT 1
+               ),
+               parent_id = (
+                   SELECT p.usc_section_id
+                     FROM usc_section s
+                     JOIN usc_section sp ON sp.usc_section_id = s.parent_id
+                     JOIN usc_section p
+                       ON p.usc_ident = sp.usc_ident
+                      AND p.version_id = v.version_id
+                    WHERE s.usc_section_id = v.usc_section_id
+                    ORDER BY p.usc_section_id
+                    LIMIT 1
+               )
+         WHERE v.source_version_id <> v.version_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("usc_section_version_chapter", table_name="usc_section_version")
+    op.drop_constraint(
+        "usc_section_version_parent_id_fkey", "usc_section_version", type_="foreignkey"
+    )
+    op.drop_constraint(
+        "usc_section_version_usc_chapter_id_fkey",
+        "usc_section_version",
+        type_="foreignkey",
+    )
+    op.drop_column("usc_section_version", "parent_id")
+    op.drop_column("usc_section_version", "usc_chapter_id")
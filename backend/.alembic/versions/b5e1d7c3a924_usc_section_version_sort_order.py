@@ -0,0 +1,41 @@
+"""usc section version sort order
+
+Revision ID: b5e1d7c3a924
+Revises: a7c4e2f9b816
+Create Date: 2026-10-18 12:58:41.036617
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b5e1d7c3a924"
+down_revision: Union[str, Sequence[str], None] = "a7c4e2f9b816"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "usc_section_version", sa.Column("sort_order", sa.Integer(), nullable=True)
+    )
+    # Sections a release wrote keep their rank, carried sections have to be ranked
+    # with the rest of their title:
+    #   python -m congress_parser.importers.releases --backfill-sort-order
+    op.execute(
+        """
+        UPDATE usc_section_version v
+           SET sort_order = s.sort_order
+          FROM usc_section s
+         WHERE s.usc_section_id = v.usc_section_id
+           AND v.source_version_id = v.version_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("usc_section_version", "sort_order")
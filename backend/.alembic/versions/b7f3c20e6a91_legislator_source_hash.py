@@ -0,0 +1,27 @@
+"""legislator source hash
+
+Revision ID: b7f3c20e6a91
+Revises: 5d2a7e9c1f48
+Create Date: 2026-10-18 09:47:22.610385
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7f3c20e6a91"
+down_revision: Union[str, Sequence[str], None] = "5d2a7e9c1f48"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("legislator", sa.Column("source_hash", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("legislator", "source_hash")
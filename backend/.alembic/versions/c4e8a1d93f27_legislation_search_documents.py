@@ -0,0 +1,121 @@
+"""legislation search documents
+
+Revision ID: c4e8a1d93f27
+Revises: b7f3c20e6a91
+Create Date: 2026-10-18 10:21:37.904512
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c4e8a1d93f27"
+down_revision: Union[str, Sequence[str], None] = "b7f3c20e6a91"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_table(
+        "legislation_search",
+        sa.Column("legislation_id", sa.Integer(), nullable=False),
+        sa.Column("document", sa.String(), nullable=True),
+        sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=False),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.ForeignKeyConstraint(
+            ["legislation_id"], ["legislation.legislation_id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("legislation_id"),
+    )
+    op.create_index(
+        "legislation_search_vector",
+        "legislation_search",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
+    op.create_index(
+        "legislation_search_document_trgm",
+        "legislation_search",
+        ["document"],
+        postgresql_using="gin",
+        postgresql_ops={"document": "gin_trgm_ops"},
+    )
+    # The importers keep these current from here on, this fills in the existing
+    # bills (congress_parser.importers.search_documents.REFRESH_SQL as of now)
+    op.execute(
+        """
+        WITH target AS (
+            SELECT l.legislation_id,
+                   coalesce(l.title, '') AS title,
+                   (
+                       SELECT max(lv.legislation_version_id)
+                         FROM legislation_version lv
+                        WHERE lv.legislation_id = l.legislation_id
+                   ) AS latest_version_id
+              FROM legislation l
+        ), parts AS (
+            SELECT t.legislation_id,
+                   t.title,
+                   coalesce((
+                       SELECT string_agg(s.subject, ' ')
+                         FROM legislative_subject_association a
+                         JOIN legislative_subject s
+                           ON s.legislative_subject_id = a.legislative_subject_id
+                        WHERE a.legislation_id = t.legislation_id
+                   ), '') AS subjects,
+                   coalesce((
+                       SELECT string_agg(p.name, ' ')
+                         FROM legislative_policy_area_association a
+                         JOIN legislative_policy_area p
+                           ON p.legislative_policy_area_id = a.legislative_policy_area_id
+                        WHERE a.legislation_id = t.legislation_id
+                   ), '') AS policy_areas,
+                   coalesce((
+                       SELECT string_agg(DISTINCT replace(tag, '_', ' '), ' ')
+                         FROM legislation_version_tag vt, unnest(vt.tags) AS tag
+                        WHERE vt.legislation_version_id = t.latest_version_id
+                   ), '') AS tags,
+                   coalesce((
+                       SELECT string_agg(concat_ws(' ', lg.first_name, lg.last_name), ' ')
+                         FROM legislation_sponsorship sp
+                         JOIN legislator lg ON lg.bioguide_id = sp.legislator_bioguide_id
+                        WHERE sp.legislation_id = t.legislation_id
+                          AND sp.cosponsor = false
+                   ), '') AS sponsors,
+                   coalesce((
+                       SELECT string_agg(cs.summary, ' ')
+                         FROM legislation_content c
+                         JOIN legislation_content_summary cs
+                           ON cs.legislation_content_id = c.legislation_content_id
+                        WHERE c.legislation_version_id = t.latest_version_id
+                   ), '') AS summaries
+              FROM target t
+        )
+        INSERT INTO legislation_search (legislation_id, document, search_vector, updated_at)
+        SELECT legislation_id,
+               concat_ws(' ', title, subjects, policy_areas, tags, sponsors),
+               setweight(to_tsvector('english', title), 'A')
+               || setweight(to_tsvector('english', subjects || ' ' || policy_areas), 'B')
+               || setweight(to_tsvector('english', tags || ' ' || sponsors), 'C')
+               || setweight(to_tsvector('english', summaries), 'D'),
+               now()
+          FROM parts
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("legislation_search_document_trgm", table_name="legislation_search")
+    op.drop_index("legislation_search_vector", table_name="legislation_search")
+    op.drop_table("legislation_search")
@@ -0,0 +1,59 @@
+"""legislation latest version
+
+Revision ID: e2b9d4f7a610
+Revises: c4e8a1d93f27
+Create Date: 2026-10-18 11:02:14.551830
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e2b9d4f7a610"
+down_revision: Union[str, Sequence[str], None] = "c4e8a1d93f27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "legislation_latest_version",
+        sa.Column("legislation_id", sa.Integer(), nullable=False),
+        sa.Column("legislation_version_id", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["legislation_id"], ["legislation.legislation_id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(
+            ["legislation_version_id"],
+            ["legislation_version.legislation_version_id"],
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("legislation_id"),
+    )
+    op.create_index(
+        op.f("ix_legislation_latest_version_legislation_version_id"),
+        "legislation_latest_version",
+        ["legislation_version_id"],
+        unique=False,
+    )
+    op.execute(
+        """
+        INSERT INTO legislation_latest_version (legislation_id, legislation_version_id)
+        SELECT legislation_id, max(legislation_version_id)
+          FROM legislation_version
+         WHERE legislation_id IS NOT NULL
+         GROUP BY legislation_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f("ix_legislation_latest_version_legislation_version_id"),
+        table_name="legislation_latest_version",
+    )
+    op.drop_table("legislation_latest_version")
@@ -0,0 +1,27 @@
+"""api cache version
+
+Revision ID: f3a6c8e1b254
+Revises: e2b9d4f7a610
+Create Date: 2026-10-18 11:48:52.306127
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f3a6c8e1b254"
+down_revision: Union[str, Sequence[str], None] = "e2b9d4f7a610"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(sa.schema.CreateSequence(sa.Sequence("api_cache_version")))
+
+
+def downgrade() -> None:
+    op.execute(sa.schema.DropSequence(sa.Sequence("api_cache_version")))
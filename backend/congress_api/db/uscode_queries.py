@@ -3,9 +3,15 @@ from typing import List
 
 from cachetools import TTLCache, cached
 from flask_sqlalchemy_session import current_session
-from sqlalchemy import desc
+from sqlalchemy import desc, select, union_all
 
-from congress_db.models import USCChapter, USCContent, USCRelease, USCSection
+from congress_db.models import (
+    USCChapter,
+    USCContent,
+    USCRelease,
+    USCSection,
+    USCSectionVersion,
+)
 from congress_api.models.release_point_list import ReleasePointList
 from congress_api.models.release_point_metadata import ReleasePointMetadata
 from congress_api.models.usc_section_content import USCSectionContent
@@ -44,11 +50,34 @@ def _get_title_obj(release_id: int, short_title: str) -> USCChapter:
     return None
 
 
+def _release_sections(chapter_id: int):
+    """
+    The sections of a title in its release: the rows written for it, and the leaf
+    sections a delta import carried forward from an earlier release. Those still have
+    the earlier release's chapter, parent and rank, so their parent_id and sort_order
+    come from their usc_section_version row. Selects usc_section_id, parent_id and
+    sort_order.
+    """
+    own = select(
+        USCSection.usc_section_id, USCSection.parent_id, USCSection.sort_order
+    ).where(USCSection.usc_chapter_id == chapter_id)
+    carried = select(
+        USCSectionVersion.usc_section_id,
+        USCSectionVersion.parent_id,
+        USCSectionVersion.sort_order,
+    ).where(
+        USCSectionVersion.usc_chapter_id == chapter_id,
+        USCSectionVersion.source_version_id != USCSectionVersion.version_id,
+    )
+    return union_all(own, carried).subquery()
+
+
 @cached(TTLCache(CACHE_SIZE, CACHE_TIME))
 def _get_sect_obj(chapter_id: int, section_number: str) -> USCSection:
+    release = _release_sections(chapter_id)
     sect = (
         current_session.query(USCSection)
-        .filter(USCSection.usc_chapter_id == chapter_id)
+        .join(release, release.c.usc_section_id == USCSection.usc_section_id)
         .filter(USCSection.number == section_number)
         .filter(USCSection.content_type == "section")
         .all()
@@ -116,14 +145,16 @@ def get_title_sections(release_vers: str, short_title: str) -> USCSectionList:
     if title_obj is None:
         return None
 
-    sections: List[USCSection] = (
-        current_session.query(USCSection)
-        .filter(USCSection.usc_chapter_id == title_obj.usc_chapter_id)
+    release = _release_sections(title_obj.usc_chapter_id)
+    sections = (
+        current_session.query(USCSection, release.c.parent_id)
+        .join(release, release.c.usc_section_id == USCSection.usc_section_id)
         .filter(USCSection.content_type == "section")
+        .order_by(release.c.sort_order, USCSection.usc_section_id)
         .all()
     )
     sect_list = []
-    for sect in sections:
+    for sect, parent_id in sections:
         sect_list.append(
             USCSectionMetadata(
                 usc_section_id=sect.usc_section_id,
@@ -132,7 +163,7 @@ def get_title_sections(release_vers: str, short_title: str) -> USCSectionList:
                 section_display=sect.section_display,
                 heading=sect.heading,
                 usc_chapter_id=title_obj.usc_chapter_id,
-                parent_id=sect.parent_id,
+                parent_id=parent_id,
                 content_type=sect.content_type,
             )
         )
@@ -202,17 +233,20 @@ def get_section_levels(
     title_obj = _get_title_obj(target_rp_id, short_title)
     if title_obj is None:
         return None
-    sections: List[USCSection] = current_session.query(USCSection).filter(
-        USCSection.usc_chapter_id == title_obj.usc_chapter_id
+    release = _release_sections(title_obj.usc_chapter_id)
+    sections = current_session.query(USCSection, release.c.parent_id).join(
+        release, release.c.usc_section_id == USCSection.usc_section_id
     )
     if section_id not in [None, " ", ""]:
-        sections = sections.filter(USCSection.parent_id == int(section_id))
+        sections = sections.filter(release.c.parent_id == int(section_id))
     else:
-        sections = sections.filter(USCSection.parent_id == None)
-    sections = sections.all()
+        sections = sections.filter(release.c.parent_id == None)
+    sections = sections.order_by(
+        release.c.sort_order, USCSection.usc_section_id
+    ).all()
 
     sect_list = []
-    for sect in sections:
+    for sect, parent_id in sections:
         sect_list.append(
             USCSectionMetadata(
                 usc_section_id=sect.usc_section_id,
@@ -221,7 +255,7 @@ def get_section_levels(
                 section_display=sect.section_display,
                 heading=sect.heading,
                 usc_chapter_id=title_obj.usc_chapter_id,
-                parent_id=sect.parent_id,
+                parent_id=parent_id,
                 content_type=sect.content_type,
             )
         )
@@ -244,26 +278,22 @@ def get_section_lineage(
     if title_obj is None:
         return None
     max_depth = 20
-    current_section = (
-        current_session.query(USCSection)
-        .filter(USCSection.number == usc_section_number)
-        .filter(USCSection.usc_chapter_id == title_obj.usc_chapter_id)
-        .first()
+    release = _release_sections(title_obj.usc_chapter_id)
+    in_title = current_session.query(USCSection, release.c.parent_id).join(
+        release, release.c.usc_section_id == USCSection.usc_section_id
     )
+    current_section = in_title.filter(USCSection.number == usc_section_number).first()
     sect_list = []
     if current_section is not None:
         sect_list = [current_section]
         while current_section is not None and max_depth > 0:
             max_depth -= 1
-            current_section = (
-                current_session.query(USCSection)
-                .filter(USCSection.usc_section_id == sect_list[-1].parent_id)
-                .filter(USCSection.usc_chapter_id == title_obj.usc_chapter_id)
-                .first()
-            )
+            current_section = in_title.filter(
+                USCSection.usc_section_id == sect_list[-1][1]
+            ).first()
             if current_section is not None:
                 sect_list.append(current_section)
-                if current_section.parent_id is None:
+                if current_section[1] is None:
                     break
     return USCSectionList(
         usc_chapter_id=title_obj.usc_chapter_id,
@@ -275,9 +305,9 @@ def get_section_lineage(
                 section_display=sect.section_display,
                 heading=sect.heading,
                 usc_chapter_id=title_obj.usc_chapter_id,
-                parent_id=sect.parent_id,
+                parent_id=parent_id,
                 content_type=sect.content_type,
             )
-            for sect in sect_list
+            for sect, parent_id in sect_list
         ],
     )
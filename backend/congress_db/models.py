@@ -11,9 +11,10 @@ from sqlalchemy import (
     Date,
     UniqueConstraint,
     MetaData,
+    Sequence,
 )
 from sqlalchemy.sql import func
-from sqlalchemy.dialects.postgresql import JSONB, ARRAY, BIGINT
+from sqlalchemy.dialects.postgresql import JSONB, ARRAY, BIGINT, TSVECTOR
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 import sqlalchemy as sa
@@ -39,6 +40,10 @@ merge_metadata(Base.metadata, PromptsBase.metadata)
 merge_metadata(Base.metadata, SensitiveBase.metadata)
 merge_metadata(Base.metadata, AuthenticationBase.metadata)
 
+# Advanced by the importers after they commit, the API clears its response caches
+# when it moves (congress_fastapi.utils.cache)
+api_cache_version = Sequence("api_cache_version", metadata=Base.metadata)
+
 
 class CastingArray(ARRAY):
     def bind_expression(self, bindvalue):
@@ -512,6 +517,26 @@ class LegislationVersion(Base):
         return {k: v for (k, v) in boi.items() if v is not None}
 
 
+class LegislationLatestVersion(Base):
+    """
+    The highest legislation_version_id of each legislation, maintained by
+    congress_parser.importers.search_documents so readers skip the max() GROUP BY
+    """
+
+    __tablename__ = "legislation_latest_version"
+
+    legislation_id = Column(
+        Integer,
+        ForeignKey("legislation.legislation_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    legislation_version_id = Column(
+        Integer,
+        ForeignKey("legislation_version.legislation_version_id", ondelete="CASCADE"),
+        index=True,
+    )
+
+
 try:
     Index(
         "legis_version",
@@ -600,6 +625,38 @@ class LegislationContent(Base):
         return {k: v for (k, v) in boi.items() if v is not None and v != {}}
 
 
+class LegislationSourceFile(Base):
+    """
+    Fingerprint of a bill XML member of a govinfo bulk data archive, so the nightly
+    ingest can skip members that have not changed without decompressing them
+    """
+
+    __tablename__ = "legislation_source_file"
+
+    legislation_source_file_id = Column(Integer, primary_key=True)
+
+    # e.g. BILLS-118hr1234ih.xml
+    member_name = Column(String, nullable=False, unique=True)
+    archive_name = Column(String)
+
+    # Both come straight from the ZIP central directory
+    crc32 = Column(BIGINT, nullable=False)
+    file_size = Column(BIGINT, nullable=False)
+    # Computed while the member is streamed into the parser
+    sha256 = Column(String, nullable=True)
+
+    legislation_version_id = Column(
+        Integer,
+        ForeignKey("legislation_version.legislation_version_id", ondelete="CASCADE"),
+        index=True,
+        nullable=True,
+    )
+
+    updated_at = Column(
+        DateTime(timezone=False), server_default=func.now(), onupdate=func.now()
+    )
+
+
 class LegislationActionParse(Base):
     """
     Represents a parsed action in a piece of legislation
@@ -635,6 +692,45 @@ class LegislationActionParse(Base):
         return {k: v for (k, v) in boi.items() if v is not None and v != {}}
 
 
+class LegislationContentChange(Base):
+    """
+    A node that was added, removed or modified between a legislation version and the
+    version before it, matched on lc_ident. Unchanged nodes are not stored.
+    """
+
+    __tablename__ = "legislation_content_change"
+
+    legislation_content_change_id = Column(Integer, primary_key=True)
+
+    legislation_version_id = Column(
+        Integer,
+        ForeignKey("legislation_version.legislation_version_id", ondelete="CASCADE"),
+        index=True,
+    )
+    previous_legislation_version_id = Column(
+        Integer,
+        ForeignKey("legislation_version.legislation_version_id", ondelete="CASCADE"),
+        index=True,
+    )
+
+    # Null when the node was removed
+    legislation_content_id = Column(
+        Integer,
+        ForeignKey("legislation_content.legislation_content_id", ondelete="CASCADE"),
+        index=True,
+        nullable=True,
+    )
+    # Null when the node was added
+    previous_legislation_content_id = Column(
+        Integer,
+        ForeignKey("legislation_content.legislation_content_id", ondelete="CASCADE"),
+        nullable=True,
+    )
+
+    lc_ident = Column(String)
+    change_type = Column(String)  # added, removed or modified
+
+
 class LegislationContentTag(Base):
     """
     Represents a tag on a piece of legislation content
@@ -725,6 +821,15 @@ class LegislationAction(Base):
     created_at = Column(DateTime(timezone=False), server_default=func.now())
 
 
+# The status import skips actions already stored for a bill with ON CONFLICT
+Index(
+    "legislation_action_raw",
+    LegislationAction.legislation_id,
+    func.md5(sa.cast(LegislationAction.raw, sa.Text)),
+    unique=True,
+)
+
+
 class USCRelease(Base):
     """
     Represents a release point of the USCode, as described by the prior release points page
@@ -789,6 +894,10 @@ class USCSection(Base):
     """
 
     __tablename__ = "usc_section"
+    __table_args__ = (
+        Index("usc_section_chapter_order", "usc_chapter_id", "sort_order"),
+        Index("usc_section_parent_order", "parent_id", "sort_order"),
+    )
 
     usc_section_id = Column(Integer, primary_key=True)
 
@@ -817,6 +926,9 @@ class USCSection(Base):
         Integer, ForeignKey("version.version_id", ondelete="CASCADE"), index=True
     )
 
+    # Rank within the title by natural sort of the numbers, see section_sort_orders
+    sort_order = Column(Integer, nullable=True)
+
     def to_dict(self):
         boi = {
             "section_id": self.usc_section_id,
@@ -884,6 +996,64 @@ except:
     pass
 
 
+class USCSectionVersion(Base):
+    """
+    Maps a release point onto the leaf sections that are in effect for it. A section
+    whose subtree hash did not change since the previous release is not written again,
+    its row points at the section (and content) owned by the earlier release instead.
+    usc_chapter_id, parent_id and sort_order place the section in this release, a
+    carried section's own row still has the chapter, parent and rank of the release
+    that wrote it
+    """
+
+    __tablename__ = "usc_section_version"
+    __table_args__ = (
+        Index("usc_section_version_ident", "version_id", "usc_ident"),
+        Index(
+            "usc_section_version_lookup",
+            "version_id",
+            "usc_section_id",
+            "source_version_id",
+        ),
+        Index("usc_section_version_chapter", "usc_chapter_id", "parent_id"),
+    )
+
+    usc_section_version_id = Column(Integer, primary_key=True)
+
+    # The release this mapping belongs to
+    version_id = Column(
+        Integer, ForeignKey("version.version_id", ondelete="CASCADE"), nullable=False
+    )
+    usc_section_id = Column(
+        Integer,
+        ForeignKey("usc_section.usc_section_id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    # The release that owns the usc_section/usc_content rows, equal to version_id
+    # unless the section was carried forward
+    source_version_id = Column(
+        Integer, ForeignKey("version.version_id", ondelete="CASCADE"), nullable=False
+    )
+
+    usc_ident = Column(String, nullable=False)
+    # sha256 over the guids and normalized text of the section subtree
+    section_hash = Column(String, nullable=False)
+
+    # The title and organizational section it is under in this release
+    usc_chapter_id = Column(
+        Integer,
+        ForeignKey("usc_chapter.usc_chapter_id", ondelete="CASCADE"),
+        nullable=True,
+    )
+    parent_id = Column(
+        Integer,
+        ForeignKey("usc_section.usc_section_id", ondelete="CASCADE"),
+        nullable=True,
+    )
+    # Rank within the title in this release, see usc_title.title_sort_orders
+    sort_order = Column(Integer, nullable=True)
+
+
 class USCContentDiff(Base):
     """
     A contentdiff of a specific content
@@ -1077,6 +1247,12 @@ class LegislationCommitteeAssociation(Base):
         Integer, ForeignKey("congress.congress_id", ondelete="CASCADE"), index=True
     )
 
+    __table_args__ = (
+        UniqueConstraint(
+            "legislation_committee_id", "legislation_id", name="unq_leg_committee_assoc"
+        ),
+    )
+
 
 class Legislator(Base):
     """
@@ -1115,6 +1291,9 @@ class Legislator(Base):
     youtube = Column(String, index=False, nullable=True)
     instagram = Column(String, index=False, nullable=True)
 
+    # sha256 of the bioguide row last imported, see bioguide.manager.row_hash
+    source_hash = Column(String, index=False, nullable=True)
+
 
 class LegislationSponsorship(Base):
     """
@@ -1181,6 +1360,12 @@ class LegislativeSubjectAssociation(Base):
         index=True,
     )
 
+    __table_args__ = (
+        UniqueConstraint(
+            "legislation_id", "legislative_subject_id", name="unq_leg_subj_assoc"
+        ),
+    )
+
 
 class LegislativePolicyArea(Base):
     """
@@ -1221,6 +1406,44 @@ class LegislativePolicyAreaAssociation(Base):
         index=True,
     )
 
+    __table_args__ = (
+        UniqueConstraint(
+            "legislation_id", "legislative_policy_area_id", name="unq_leg_pol_assoc"
+        ),
+    )
+
+
+class LegislationSearch(Base):
+    """
+    One denormalized search document per legislation, maintained by
+    congress_parser.importers.search_documents for /legislation/search
+    """
+
+    __tablename__ = "legislation_search"
+
+    legislation_id = Column(
+        Integer,
+        ForeignKey("legislation.legislation_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+
+    # Title, subjects, policy area, tags and sponsor names, for trigram matches
+    document = Column(String)
+    # The same plus the summaries, weighted A (title) to D (summaries)
+    search_vector = Column(TSVECTOR)
+
+    updated_at = Column(DateTime(timezone=False), server_default=func.now())
+
+    __table_args__ = (
+        Index("legislation_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "legislation_search_document_trgm",
+            "document",
+            postgresql_using="gin",
+            postgresql_ops={"document": "gin_trgm_ops"},
+        ),
+    )
+
 class Appropriation(AppropriationsBase):
     """
     A table for holding detected appropriations
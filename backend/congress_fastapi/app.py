@@ -1,4 +1,5 @@
 import traceback
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
@@ -13,6 +14,8 @@ from congress_fastapi.routes.user import router as user_router
 from congress_fastapi.routes.stats import router as stats_router
 from congress_fastapi.routes.uscode import router as uscode_router
 from congress_fastapi.routes.committees import router as committees_router
+from congress_fastapi.routes.health import router as health_router
+from congress_fastapi.db import postgres
 from congress_fastapi.utils.limiter import limiter
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
@@ -22,7 +25,19 @@ origins = [
     "http://localhost:3000",
     "https://congress.dev",
 ]
-app = FastAPI()
+# GETs under these paths write or need to read their own writes, keep them on the
+# primary
+PRIMARY_ONLY_PATHS = ("/user",)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await postgres.connect()
+    yield
+    await postgres.disconnect()
+
+
+app = FastAPI(lifespan=lifespan)
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 app.add_middleware(
@@ -48,6 +63,16 @@ async def log_exceptions_middleware(request: Request, call_next):
         raise e
 
 
+@app.middleware("http")
+async def read_replica_middleware(request: Request, call_next):
+    if request.method == "GET" and not request.url.path.startswith(
+        PRIMARY_ONLY_PATHS
+    ):
+        with postgres.read_replica():
+            return await call_next(request)
+    return await call_next(request)
+
+
 app.include_router(members_router)
 app.include_router(legislation_router)
 app.include_router(legislation_version_router)
@@ -56,4 +81,5 @@ app.include_router(user_router)
 app.include_router(stats_router)
 app.include_router(uscode_router)
 app.include_router(committees_router)
+app.include_router(health_router)
 print("Loaded")
@@ -1,19 +1,174 @@
+"""
+Connection pools for the API.
+
+The app opens the pools on startup and closes them on shutdown (see app.py), and
+handlers get one with get_database(). Outside the app, scripts and the like, the
+first get_database() call connects.
+
+Pool settings, all per process:
+
+    API_DB_MIN_SIZE / API_DB_MAX_SIZE   connections kept open / allowed
+    API_DB_STATEMENT_CACHE_SIZE         prepared statements cached per connection
+    API_DB_COMMAND_TIMEOUT              seconds a single query may run
+
+When db_replica_host is set, requests run inside read_replica() (GET requests, see
+app.py) read from a second pool on that host. get_database(primary=True) always
+returns the primary.
+"""
+
+import asyncio
 import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
 
 from databases import Database
 
 DATABASE_URL = f"postgresql://{os.getenv('db_user')}:{os.getenv('db_pass')}@{os.getenv('db_host')}/{os.getenv('db_table')}"
+REPLICA_HOST = os.getenv("db_replica_host")
+REPLICA_URL = (
+    f"postgresql://{os.getenv('db_user')}:{os.getenv('db_pass')}@{REPLICA_HOST}/{os.getenv('db_table')}"
+    if REPLICA_HOST
+    else None
+)
+
+API_DB_MIN_SIZE = int(os.environ.get("API_DB_MIN_SIZE", 2))
+API_DB_MAX_SIZE = int(os.environ.get("API_DB_MAX_SIZE", 10))
+API_DB_STATEMENT_CACHE_SIZE = int(os.environ.get("API_DB_STATEMENT_CACHE_SIZE", 100))
+API_DB_COMMAND_TIMEOUT = float(os.environ.get("API_DB_COMMAND_TIMEOUT", 30))
+
+database: Optional[Database] = None
+replica: Optional[Database] = None
+
+_connect_lock: Optional[asyncio.Lock] = None
+_use_replica: ContextVar[bool] = ContextVar("use_replica", default=False)
+
+
+class PoolMetrics:
+    """
+    Counts acquires on an asyncpg pool: how many are waiting right now, how many
+    finished and how long they took
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pool = None
+        self.waiting = 0
+        self.acquired = 0
+        self.acquire_seconds = 0.0
+        self.max_acquire_seconds = 0.0
+
+    def instrument(self, pool):
+        self.pool = pool
+        acquire = pool.acquire
+
+        async def timed_acquire(*, timeout=None):
+            self.waiting += 1
+            start = time.perf_counter()
+            try:
+                return await acquire(timeout=timeout)
+            finally:
+                elapsed = time.perf_counter() - start
+                self.waiting -= 1
+                self.acquired += 1
+                self.acquire_seconds += elapsed
+                self.max_acquire_seconds = max(self.max_acquire_seconds, elapsed)
+
+        # databases awaits pool.acquire() for every connection it takes
+        pool.acquire = timed_acquire
+
+    def snapshot(self) -> Dict[str, float]:
+        size = self.pool.get_size() if self.pool is not None else 0
+        idle = self.pool.get_idle_size() if self.pool is not None else 0
+        return {
+            "size": size,
+            "in_use": size - idle,
+            "idle": idle,
+            "max_size": self.pool.get_max_size() if self.pool is not None else 0,
+            "waiting": self.waiting,
+            "acquired": self.acquired,
+            "acquire_ms_avg": (
+                1000 * self.acquire_seconds / self.acquired if self.acquired else 0.0
+            ),
+            "acquire_ms_max": 1000 * self.max_acquire_seconds,
+        }
 
-database = None
 
+metrics: Dict[str, PoolMetrics] = {}
 
-async def get_database() -> Database:
+
+async def _open(name: str, url: str, host: Optional[str]) -> Database:
+    db = Database(
+        url,
+        min_size=API_DB_MIN_SIZE,
+        max_size=API_DB_MAX_SIZE,
+        statement_cache_size=API_DB_STATEMENT_CACHE_SIZE,
+        command_timeout=API_DB_COMMAND_TIMEOUT,
+    )
+    await db.connect()
+    metrics[name] = PoolMetrics(name)
+    metrics[name].instrument(db._backend._pool)
+    print(
+        f"Connected {name} pool to {host}/{os.getenv('db_table')} "
+        f"({API_DB_MIN_SIZE}-{API_DB_MAX_SIZE} connections)"
+    )
+    return db
+
+
+def _lock() -> asyncio.Lock:
+    # Created by the first connect(), so it belongs to the loop the app runs on
+    global _connect_lock
+    if _connect_lock is None:
+        _connect_lock = asyncio.Lock()
+    return _connect_lock
+
+
+async def connect():
     """
-    Connects to Postgres and returns a database object
+    Opens the primary pool, and the replica pool if one is configured
+    """
+    global database, replica
+    async with _lock():
+        if database is None:
+            database = await _open("primary", DATABASE_URL, os.getenv("db_host"))
+        if REPLICA_URL is not None and replica is None:
+            replica = await _open("replica", REPLICA_URL, REPLICA_HOST)
+
+
+async def disconnect():
+    global database, replica
+    async with _lock():
+        for db in (replica, database):
+            if db is not None:
+                await db.disconnect()
+        database = None
+        replica = None
+        metrics.clear()
+
+
+@contextmanager
+def read_replica():
+    """
+    get_database() calls made inside this block may read from the replica
+    """
+    token = _use_replica.set(True)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+async def get_database(primary: bool = False) -> Database:
+    """
+    Returns the pool to query, the replica inside read_replica() unless primary
     """
-    print(f"Connecting to {DATABASE_URL}")
-    global database
     if database is None:
-        database = Database(DATABASE_URL)
-        await database.connect()
+        await connect()
+    if replica is not None and not primary and _use_replica.get():
+        return replica
     return database
+
+
+def pool_stats() -> Dict[str, Dict[str, float]]:
+    return {name: x.snapshot() for name, x in metrics.items()}
@@ -1,8 +1,14 @@
+import asyncio
+import base64
+import json
+import os
 import re
 from collections import defaultdict
-from typing import Dict, List, Tuple
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
 
 from sqlalchemy import (
+    and_,
     select,
     join,
     func,
@@ -13,6 +19,7 @@ from sqlalchemy import (
     or_,
     any_,
     cast,
+    Date,
     String,
 )
 from sqlalchemy.dialects import postgresql
@@ -27,6 +34,8 @@ from congress_db.models import (
     LegislationContent,
     LegislationContentSummary,
     LegislationContentTag,
+    LegislationLatestVersion,
+    LegislationSearch,
     LegislationSponsorship,
     LegislationVersionTag,
     LegislationVersion,
@@ -41,10 +50,6 @@ from congress_fastapi.models.legislation.metadata import (
     LegislatorMetadata,
 )
 from congress_fastapi.models.legislation.search import SearchResult
-from congress_fastapi.handlers.legislation.policy_subject import (
-    get_legislation_policy_area,
-    get_legislation_subjects,
-)
 
 
 def normalize_tags(tags: List[str]) -> List[str]:
@@ -64,38 +69,15 @@ def normalize_tags(tags: List[str]) -> List[str]:
 async def get_distinct_tags(legislation_ids: List[int]) -> Dict[int, List[str]]:
     database = await get_database()
 
-    # Subquery to get the highest legislation_version_id for each legislation_id
-    subquery = (
-        select(
-            LegislationVersion.legislation_id,
-            func.max(LegislationVersion.legislation_version_id).label("max_version_id"),
-        )
-        .group_by(LegislationVersion.legislation_id)
-        .subquery()
-    )
-
-    # Aliases for the tables
-    lv_alias = aliased(LegislationVersion)
-    lvt_alias = aliased(LegislationVersionTag)
-
-    # Main query to get distinct tags
+    # Tags of the latest version of each legislation
     query = (
-        select(Legislation.legislation_id, lvt_alias.tags)
-        .select_from(
-            join(
-                Legislation,
-                subquery,
-                Legislation.legislation_id == subquery.c.legislation_id,
-            )
-            .join(
-                lv_alias, lv_alias.legislation_version_id == subquery.c.max_version_id
-            )
-            .join(
-                lvt_alias,
-                lv_alias.legislation_version_id == lvt_alias.legislation_version_id,
-            )
+        select(LegislationLatestVersion.legislation_id, LegislationVersionTag.tags)
+        .join(
+            LegislationVersionTag,
+            LegislationVersionTag.legislation_version_id
+            == LegislationLatestVersion.legislation_version_id,
         )
-        .where(Legislation.legislation_id.in_(legislation_ids))
+        .where(LegislationLatestVersion.legislation_id.in_(legislation_ids))
     )
     results = await database.fetch_all(query)
     # Pivot it
@@ -114,42 +96,19 @@ async def get_bill_summaries(legislation_ids: List[int]) -> Dict[int, str]:
     """
     database = await get_database()
 
-    # Subquery to get the highest legislation_version_id for each legislation_id
-    subquery = (
-        select(
-            LegislationVersion.legislation_id,
-            func.max(LegislationVersion.legislation_version_id).label("max_version_id"),
-        )
-        .group_by(LegislationVersion.legislation_id)
-        .subquery()
-    )
-
-    # Aliases for the tables
-    lv_alias = aliased(LegislationVersion)
-    lc_alias = aliased(LegislationContent)
-    lcs_alias = aliased(LegislationContentSummary)
-    # Main query to get distinct tags
     query = (
-        select(Legislation.legislation_id, lcs_alias.summary)
-        .select_from(
-            join(
-                Legislation,
-                subquery,
-                Legislation.legislation_id == subquery.c.legislation_id,
-            )
-            .join(
-                lv_alias, lv_alias.legislation_version_id == subquery.c.max_version_id
-            )
-            .join(
-                lc_alias,
-                lv_alias.legislation_version_id == lc_alias.legislation_version_id,
-            )
-            .join(
-                lcs_alias,
-                lc_alias.legislation_content_id == lcs_alias.legislation_content_id,
-            )
+        select(LegislationLatestVersion.legislation_id, LegislationContentSummary.summary)
+        .join(
+            LegislationContent,
+            LegislationContent.legislation_version_id
+            == LegislationLatestVersion.legislation_version_id,
+        )
+        .join(
+            LegislationContentSummary,
+            LegislationContentSummary.legislation_content_id
+            == LegislationContent.legislation_content_id,
         )
-        .where(Legislation.legislation_id.in_(legislation_ids))
+        .where(LegislationLatestVersion.legislation_id.in_(legislation_ids))
     )
     results = await database.fetch_all(query)
     return {result["legislation_id"]: result["summary"] for result in results}
@@ -161,49 +120,63 @@ async def get_bill_appropriations(legislation_ids: List[int]) -> Dict[int, float
     """
     database = await get_database()
 
-    # Subquery to get the highest legislation_version_id for each legislation_id
-    subquery = (
+    query = (
         select(
-            LegislationVersion.legislation_id,
-            func.max(LegislationVersion.legislation_version_id).label("max_version_id"),
+            LegislationLatestVersion.legislation_id,
+            func.sum(Appropriation.amount).label("amount"),
         )
-        .group_by(LegislationVersion.legislation_id)
-        .subquery()
-    )
-
-    # Aliases for the tables
-    lv_alias = aliased(LegislationVersion)
-    lc_alias = aliased(LegislationContent)
-    a_alias = aliased(Appropriation)
-    # Main query to get distinct tags
-    query = (
-        select(Legislation.legislation_id, func.sum(a_alias.amount).label("amount"))
-        .select_from(
-            join(
-                Legislation,
-                subquery,
-                Legislation.legislation_id == subquery.c.legislation_id,
-            )
-            .join(
-                lv_alias, lv_alias.legislation_version_id == subquery.c.max_version_id
-            )
-            .join(
-                lc_alias,
-                lv_alias.legislation_version_id == lc_alias.legislation_version_id,
-            )
-            .join(
-                a_alias,
-                lc_alias.legislation_content_id == a_alias.legislation_content_id,
-            )
+        .join(
+            LegislationContent,
+            LegislationContent.legislation_version_id
+            == LegislationLatestVersion.legislation_version_id,
+        )
+        .join(
+            Appropriation,
+            Appropriation.legislation_content_id
+            == LegislationContent.legislation_content_id,
         )
-        .where(Legislation.legislation_id.in_(legislation_ids))
-        .where(a_alias.parent_id == None)
-        .group_by(Legislation.legislation_id)
+        .where(LegislationLatestVersion.legislation_id.in_(legislation_ids))
+        .where(Appropriation.parent_id == None)
+        .group_by(LegislationLatestVersion.legislation_id)
     )
     results = await database.fetch_all(query)
     return {result["legislation_id"]: int(result["amount"]) for result in results}
 
 
+async def get_bill_policy_areas(legislation_ids: List[int]) -> Dict[int, List[str]]:
+    database = await get_database()
+
+    query = select(
+        LegislativePolicyAreaAssociation.legislation_id, LegislativePolicyArea.name
+    ).join(
+        LegislativePolicyArea,
+        LegislativePolicyArea.legislative_policy_area_id
+        == LegislativePolicyAreaAssociation.legislative_policy_area_id,
+    ).where(LegislativePolicyAreaAssociation.legislation_id.in_(legislation_ids))
+    results = await database.fetch_all(query)
+    results_by_legislation_id = defaultdict(list)
+    for result in results:
+        results_by_legislation_id[result["legislation_id"]].append(result["name"])
+    return dict(results_by_legislation_id)
+
+
+async def get_bill_subjects(legislation_ids: List[int]) -> Dict[int, List[str]]:
+    database = await get_database()
+
+    query = select(
+        LegislativeSubjectAssociation.legislation_id, LegislativeSubject.subject
+    ).join(
+        LegislativeSubject,
+        LegislativeSubject.legislative_subject_id
+        == LegislativeSubjectAssociation.legislative_subject_id,
+    ).where(LegislativeSubjectAssociation.legislation_id.in_(legislation_ids))
+    results = await database.fetch_all(query)
+    results_by_legislation_id = defaultdict(list)
+    for result in results:
+        results_by_legislation_id[result["legislation_id"]].append(result["subject"])
+    return dict(results_by_legislation_id)
+
+
 async def get_bill_sponsor(legislation_ids: List[int]):
     database = await get_database()
 
@@ -234,6 +207,109 @@ async def get_bill_sponsor(legislation_ids: List[int]):
     return {result["legislation_id"]: dict(result) for result in results}
 
 
+# Estimate the total of unfiltered searches from planner statistics
+SEARCH_ESTIMATE_COUNT = os.environ.get("SEARCH_ESTIMATE_COUNT", "0") == "1"
+
+BILL_NUMBER = re.compile(r"(H\.?R\.?|S\.?)\s?(\d+)", re.IGNORECASE)
+CHAMBER_LOOKUP = {
+    "H.R.": "House",
+    "HR": "House",
+    "S.": "Senate",
+    "S": "Senate",
+}
+
+
+def _filter_text(query, text: str):
+    """
+    Narrows query to the legislation matching text, returns it with the relevance
+    expression to order by, None for an exact bill number like "H.R. 1".
+
+    Free text probes the legislation_search document, the tsvector for words and
+    the trigram index for substrings of the title, subjects, policy area, tags and
+    sponsor.
+    """
+    number_match = BILL_NUMBER.search(text)
+    if number_match:
+        query = query.where(
+            Legislation.chamber == CHAMBER_LOOKUP[number_match.group(1).upper()]
+        ).where(Legislation.number == int(number_match.group(2)))
+        return query, None
+
+    ts_query = func.websearch_to_tsquery("english", text)
+    matches = [
+        LegislationSearch.search_vector.op("@@")(ts_query),
+        LegislationSearch.document.ilike(f"%{text}%"),
+    ]
+    if text.strip().isdigit():
+        matches.append(Legislation.number == int(text))
+    query = query.join(
+        LegislationSearch,
+        LegislationSearch.legislation_id == Legislation.legislation_id,
+    ).where(or_(*matches))
+    rank = func.ts_rank_cd(LegislationSearch.search_vector, ts_query) + func.similarity(
+        LegislationSearch.document, text
+    )
+    return query, rank
+
+
+def encode_cursor(sort: Optional[str], value: Any, legislation_id: int) -> str:
+    """
+    Opaque cursor for the page after the row with this sort value and id
+    """
+    if isinstance(value, date):
+        value = value.isoformat()
+    raw = json.dumps([sort, value, legislation_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: Optional[str], key) -> Tuple[Any, int]:
+    """
+    Returns the (sort value, legislation_id) of an encode_cursor cursor, raises a
+    ValueError for one that is malformed or was made for another sort
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, value, legislation_id = json.loads(raw)
+        legislation_id = int(legislation_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if cursor_sort != sort:
+        raise ValueError(f"Cursor was made for sort {cursor_sort}, not {sort}")
+    if value is not None and key is not None and isinstance(key.type, Date):
+        value = date.fromisoformat(value)
+    return value, legislation_id
+
+
+def _after_cursor(key, id_column, value, last_id: int, descending: bool):
+    """
+    Keyset condition for the rows after (value, last_id) when ordering by key
+    (nulls last ascending, first descending) and then id_column ascending
+    """
+    after_id = id_column > last_id
+    if key is None:
+        return after_id
+    if value is None:
+        tied = and_(key.is_(None), after_id)
+        return or_(tied, key.isnot(None)) if descending else tied
+    tied = and_(key == value, after_id)
+    if descending:
+        return or_(key < value, tied)
+    return or_(key > value, tied, key.is_(None))
+
+
+async def estimate_count(database, query) -> int:
+    """
+    The planner's row estimate for query, from pg_class statistics instead of a scan
+    """
+    sql = query.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    plan = await database.fetch_val(f"EXPLAIN (FORMAT JSON) {sql}")
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
 async def search_legislation(
     congress: str,
     chamber: str,
@@ -244,14 +320,16 @@ async def search_legislation(
     direction: str,
     page: int,
     page_size: int,
-) -> Tuple[List[SearchResult], int]:
+    cursor: Optional[str] = None,
+) -> Tuple[List[SearchResult], int, Optional[str]]:
+    """
+    Returns a page of results, the total number of matches and the cursor of the
+    next page (None on the last one). A cursor from a previous response continues
+    after that page instead of using page.
+    """
     if congress:
         congress = [int(c) for c in congress.split(",")]
 
-    sort_order = asc(sort)
-    if direction == "desc":
-        sort_order = desc(sort)
-
     database = await get_database()
     lv_alias = aliased(LegislationVersion)
     subquery = (
@@ -267,6 +345,15 @@ async def search_legislation(
             == LegislationVersionTag.legislation_version_id,
         )
     )
+    if tags:
+        subquery = subquery.where(
+            or_(
+                *[
+                    LegislationVersionTag.tags.any(cast(tag, String))
+                    for tag in tags.split(",")
+                ]
+            )
+        )
 
     legis_query = (
         select(
@@ -296,93 +383,84 @@ async def search_legislation(
             Legislation.chamber,
         )
         .having(exists(subquery))
-        .order_by(sort_order, Legislation.legislation_id)
-        .limit(page_size)
-        .offset((page - 1) * page_size)
+    )
+    # The matching legislation_ids, one row each, for the total
+    id_query = (
+        select(Legislation.legislation_id)
+        .select_from(
+            join(Legislation, Congress, Legislation.congress_id == Congress.congress_id)
+        )
+        .where(exists(subquery))
     )
     if congress:
         legis_query = legis_query.where(Congress.session_number.in_(congress))
+        id_query = id_query.where(Congress.session_number.in_(congress))
     if chamber:
         legis_query = legis_query.where(Legislation.chamber.in_(chamber.split(",")))
-    if tags:
-        subquery = subquery.where(
-            or_(
-                *[
-                    LegislationVersionTag.tags.any(cast(tag, String))
-                    for tag in tags.split(",")
-                ]
-            )
-        )
+        id_query = id_query.where(Legislation.chamber.in_(chamber.split(",")))
     if text:
-        number_match = re.search(r"(H\.?R\.?|S\.?)\s?(\d+)", text, re.IGNORECASE)
-        if number_match:
-            chamber_lookup = {
-                "H.R.": "House",
-                "HR": "House",
-                "S.": "Senate",
-                "S": "Senate",
-            }
-            legis_query = legis_query.where(
-                Legislation.chamber == chamber_lookup[number_match.group(1).upper()]
-            )
-            legis_query = legis_query.where(
-                Legislation.number == int(number_match.group(2))
-            )
-        else:
-            # Subject search
-            legis_query = legis_query.join(
-                LegislativeSubjectAssociation,
-                Legislation.legislation_id
-                == LegislativeSubjectAssociation.legislation_id,
-                isouter=True,
-            ).join(
-                LegislativeSubject,
-                LegislativeSubject.legislative_subject_id
-                == LegislativeSubjectAssociation.legislative_subject_id,
-                isouter=True,
-            )
-
-            legis_query = legis_query.join(
-                LegislativePolicyAreaAssociation,
-                Legislation.legislation_id
-                == LegislativePolicyAreaAssociation.legislation_id,
-                isouter=True,
-            ).join(
-                LegislativePolicyArea,
-                LegislativePolicyArea.legislative_policy_area_id
-                == LegislativePolicyAreaAssociation.legislative_policy_area_id,
-                isouter=True,
-            )
-            try:
-
-                legis_query = legis_query.where(
-                    or_(
-                        Legislation.title.ilike(f"%{text}%"),
-                        Legislation.number == int(text),
-                        LegislativeSubject.subject.ilike(f"%{text}%"),
-                        LegislativePolicyArea.name.ilike(f"%{text}%"),
-                    )
-                )
-            except ValueError:
-                legis_query = legis_query.where(
-                    or_(
-                        Legislation.title.ilike(f"%{text}%"),
-                        LegislativeSubject.subject.ilike(f"%{text}%"),
-                        LegislativePolicyArea.name.ilike(f"%{text}%"),
-                    )
-                )
-
-    results = await database.fetch_all(legis_query)
+        legis_query, rank = _filter_text(legis_query, text)
+        id_query, _ = _filter_text(id_query, text)
+        if rank is not None:
+            # Aggregated since the page query groups per legislation
+            legis_query = legis_query.add_columns(func.max(rank).label("relevance"))
+            if sort is None:
+                sort = "relevance"
+    if sort == "relevance" and not text:
+        sort = None
+
+    matches = legis_query.subquery()
+    key = matches.c.get(sort) if sort else None
+    descending = direction == "desc" or sort == "relevance"
+    # One row past the page tells whether there is a next one
+    page_query = select(matches).limit(page_size + 1)
+    if key is not None:
+        page_query = page_query.order_by(desc(key) if descending else asc(key))
+    page_query = page_query.order_by(matches.c.legislation_id)
+    if cursor:
+        value, last_id = decode_cursor(cursor, sort, key)
+        page_query = page_query.where(
+            _after_cursor(key, matches.c.legislation_id, value, last_id, descending)
+        )
+    else:
+        page_query = page_query.offset((page - 1) * page_size)
+
+    if SEARCH_ESTIMATE_COUNT and not (congress or chamber or text or tags):
+        total_query = estimate_count(database, id_query)
+    else:
+        total_query = database.fetch_val(
+            select(func.count()).select_from(id_query.subquery())
+        )
+    results, total = await asyncio.gather(
+        database.fetch_all(page_query), total_query
+    )
     results = [dict(result) for result in results]
 
-    # Perform same search against policy areas and subjects
+    next_cursor = None
+    if len(results) > page_size:
+        results = results[:page_size]
+        last = results[-1]
+        next_cursor = encode_cursor(
+            sort, last[sort] if key is not None else None, last["legislation_id"]
+        )
 
+    # Everything else on the page, keyed on its legislation_ids
     legislation_ids = [result["legislation_id"] for result in results]
-
-    tags_by_id = await get_distinct_tags(legislation_ids)
-    summaries_by_id = await get_bill_summaries(legislation_ids)
-    appropriations_by_id = await get_bill_appropriations(legislation_ids)
-    sponsors_by_id = await get_bill_sponsor(legislation_ids)
+    (
+        tags_by_id,
+        summaries_by_id,
+        appropriations_by_id,
+        sponsors_by_id,
+        policy_areas_by_id,
+        subjects_by_id,
+    ) = await asyncio.gather(
+        get_distinct_tags(legislation_ids),
+        get_bill_summaries(legislation_ids),
+        get_bill_appropriations(legislation_ids),
+        get_bill_sponsor(legislation_ids),
+        get_bill_policy_areas(legislation_ids),
+        get_bill_subjects(legislation_ids),
+    )
 
     objs = [
         SearchResult(
@@ -400,99 +478,13 @@ async def search_legislation(
             appropriations=appropriations_by_id.get(result["legislation_id"], None),
             sponsor=sponsors_by_id.get(result["legislation_id"], None),
             effective_date=result.get("effective_date"),
-            policy_areas=sorted(
-                [
-                    x.name
-                    for x in await get_legislation_policy_area(result["legislation_id"])
-                ]
-            ),
-            subjects=sorted(
-                [
-                    x.subject
-                    for x in await get_legislation_subjects(result["legislation_id"])
-                ]
-            ),
+            policy_areas=sorted(policy_areas_by_id.get(result["legislation_id"], [])),
+            subjects=sorted(subjects_by_id.get(result["legislation_id"], [])),
         )
         for result in results
     ]
 
-    count_query = (
-        select(
-            func.count(distinct(Legislation.legislation_id)),
-        )
-        .select_from(
-            join(
-                Legislation,
-                lv_alias,
-                Legislation.legislation_id == lv_alias.legislation_id,
-            ).join(Congress, Legislation.congress_id == Congress.congress_id)
-        )
-        .group_by(
-            Legislation.legislation_id,
-        )
-    ).having(exists(subquery))
-    if congress:
-        count_query = count_query.where(Congress.session_number.in_(congress))
-    if chamber:
-        count_query = count_query.where(Legislation.chamber.in_(chamber.split(",")))
-    if text:
-        number_match = re.search(r"(H\.?R\.?|S\.?)\s?(\d+)", text, re.IGNORECASE)
-        if number_match:
-            chamber_lookup = {
-                "H.R.": "House",
-                "HR": "House",
-                "S.": "Senate",
-                "S": "Senate",
-            }
-            count_query = count_query.where(
-                Legislation.chamber == chamber_lookup[number_match.group(1).upper()]
-            )
-            count_query = count_query.where(
-                Legislation.number == int(number_match.group(2))
-            )
-        else:
-            count_query = count_query.join(
-                LegislativeSubjectAssociation,
-                Legislation.legislation_id
-                == LegislativeSubjectAssociation.legislation_id,
-                isouter=True,
-            ).join(
-                LegislativeSubject,
-                LegislativeSubject.legislative_subject_id
-                == LegislativeSubjectAssociation.legislative_subject_id,
-            )
-
-            count_query = count_query.join(
-                LegislativePolicyAreaAssociation,
-                Legislation.legislation_id
-                == LegislativePolicyAreaAssociation.legislation_id,
-                isouter=True,
-            ).join(
-                LegislativePolicyArea,
-                LegislativePolicyArea.legislative_policy_area_id
-                == LegislativePolicyAreaAssociation.legislative_policy_area_id,
-                isouter=True,
-            )
-            try:
-                count_query = count_query.where(
-                    or_(
-                        Legislation.title.ilike(f"%{text}%"),
-                        Legislation.number == int(text),
-                        LegislativeSubject.subject.ilike(f"%{text}%"),
-                        LegislativePolicyArea.name.ilike(f"%{text}%"),
-                    )
-                )
-            except ValueError:
-                count_query = count_query.where(
-                    or_(
-                        Legislation.title.ilike(f"%{text}%"),
-                        LegislativeSubject.subject.ilike(f"%{text}%"),
-                        LegislativePolicyArea.name.ilike(f"%{text}%"),
-                    )
-                )
-
-    count_results = await database.fetch_all(count_query)
-    return objs, len(count_results)
+    return objs, total, next_cursor
 
 
 async def get_legislation_tag_options() -> List[str]:
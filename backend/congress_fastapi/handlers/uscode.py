@@ -4,13 +4,14 @@ import chromadb
 from chromadb.api.models.AsyncCollection import AsyncCollection
 from chromadb.api.types import IncludeEnum
 from chromadb.config import DEFAULT_TENANT, DEFAULT_DATABASE, Settings
-from sqlalchemy import select, or_
+from sqlalchemy import select, or_, union_all
 
 from congress_fastapi.db.postgres import get_database
 from congress_db.models import (
     USCContent,
     USCChapter,
     USCSection,
+    USCSectionVersion,
 )
 
 chroma_host = (
@@ -69,14 +70,24 @@ async def get_usc_chapter_by_short_titles(short_titles: List[str]) -> List[USCCh
 
 async def read_usc_content(congress_id: int, citation: str) -> List[USCContent]:
     database = await get_database()
-    query = (
-        select(USCContent)
-        .join(USCChapter, USCChapter.usc_release_id == congress_id)
-        .join(USCSection, USCSection.usc_chapter_id == USCChapter.usc_chapter_id)
-        .where(
-            USCContent.usc_section_id == USCSection.usc_section_id,
-                USCContent.usc_ident.ilike(citation),
+    # The release's own sections, and the ones a delta import carried forward, which
+    # are filed under the chapter of the release that wrote them
+    release_sections = union_all(
+        select(USCSection.usc_section_id)
+        .join(USCChapter, USCChapter.usc_chapter_id == USCSection.usc_chapter_id)
+        .where(USCChapter.usc_release_id == congress_id),
+        select(USCSectionVersion.usc_section_id)
+        .join(
+            USCChapter, USCChapter.usc_chapter_id == USCSectionVersion.usc_chapter_id
         )
+        .where(
+            USCChapter.usc_release_id == congress_id,
+            USCSectionVersion.source_version_id != USCSectionVersion.version_id,
+        ),
+    ).subquery()
+    query = select(USCContent).where(
+        USCContent.usc_section_id.in_(select(release_sections.c.usc_section_id)),
+        USCContent.usc_ident.ilike(citation),
     )
     return await database.fetch_all(query)
 
@@ -32,3 +32,5 @@ class SearchResult(BaseModel):
 class SearchResponse(BaseModel):
     legislation: List[SearchResult]
     total_results: int
+    # Pass as cursor to get the next page, None on the last page
+    next_cursor: Optional[str] = None
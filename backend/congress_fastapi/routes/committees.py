@@ -13,11 +13,13 @@ from congress_fastapi.models.committees import (
     LegislationCommitteeInfo,
     LegislationCommitteeSearchResponse,
 )
+from congress_fastapi.utils.cache import cached_route
 
 router = APIRouter(tags=["Committees"])
 
 
 @router.get("/committees")
+@cached_route()
 async def get_committees_search(
     page: int = Query(1, description="Offset for pagination"),
     page_size: int = Query(
@@ -74,6 +76,7 @@ async def get_committees_search(
         },
     },
 )
+@cached_route()
 async def get_committee_info(committee_id: int) -> LegislationCommitteeInfo:
     """Returns a LegislationCommitteeInfo object for a given committee_id"""
     obj = await get_committee_by_id(committee_id)
@@ -93,6 +96,7 @@ async def get_committee_info(committee_id: int) -> LegislationCommitteeInfo:
         },
     },
 )
+@cached_route()
 async def get_committees_by_congress_endpoint(
     congress_id: int,
 ) -> List[LegislationCommitteeInfo]:
@@ -109,6 +113,7 @@ async def get_committees_by_congress_endpoint(
         },
     },
 )
+@cached_route()
 async def get_subcommittees_endpoint(
     committee_id: int,
 ) -> List[LegislationCommitteeInfo]:
@@ -0,0 +1,17 @@
+from typing import Dict
+
+from fastapi import APIRouter
+
+from congress_fastapi.db.postgres import pool_stats
+
+router = APIRouter(tags=["Health"])
+
+
+@router.get("/health/db")
+async def get_db_health() -> Dict[str, Dict[str, float]]:
+    """
+    Returns the connection pool counters of this process: connections open, in
+    use and idle, acquires waiting right now, and the average and worst acquire
+    time in milliseconds
+    """
+    return pool_stats()
@@ -33,6 +33,7 @@ from congress_fastapi.models.legislation import (
     LegislationClauseSummary,
     LegislationVersionMetadata,
 )
+from congress_fastapi.utils.cache import cached_route
 
 router = APIRouter(tags=["Legislation", "Legislation Version"])
 
@@ -129,6 +130,7 @@ async def get_legislation_version_actions(
         },
     },
 )
+@cached_route(ttl=3600, maxsize=512, max_age=3600)
 async def get_legislation_version_text(
     legislation_version_id: int,
     include_parsed: bool = Query(False, description="Include parsed actions"),
@@ -254,6 +256,7 @@ async def post_legislation_version_llm(
     response_model=List[BillDiffMetadataList],
     response_model_exclude_unset=True,
 )
+@cached_route(ttl=3600, maxsize=512, max_age=3600)
 async def get_legislation_version_diffs(
     legislation_version_id: int,
 ) -> List[BillDiffMetadataList]:
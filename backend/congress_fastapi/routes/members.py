@@ -14,11 +14,13 @@ from congress_fastapi.models.members import (
     MemberSearchInfo,
     MemberSearchResponse,
 )
+from congress_fastapi.utils.cache import cached_route
 
 router = APIRouter(tags=["Members"])
 
 
 @router.get("/members")
+@cached_route()
 async def get_members_search(
     page: int = Query(1, description="Offset for pagination"),
     page_size: int = Query(10, description="Number of members to return", alias="pageSize"),
@@ -72,6 +74,7 @@ async def get_members_search(
         },
     },
 )
+@cached_route()
 async def get_member_info(bioguide_id: str) -> MemberInfo:
     """Returns a MemberInfo object for a given bioguide_id"""
     obj = await get_member_by_bioguide_id(bioguide_id)
@@ -83,6 +86,7 @@ async def get_member_info(bioguide_id: str) -> MemberInfo:
 
 
 @router.get("/member/{bioguide_id}/sponsorships")
+@cached_route()
 async def get_member_sponsorships(
     bioguide_id: str,
     responses={
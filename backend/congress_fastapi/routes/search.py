@@ -32,13 +32,32 @@ async def get_search_legislation(
     page: int = Query(1),
     tags: str = Query(None),
     page_size: int = Query(10, alias="pageSize"),
+    cursor: str = Query(None),
 ) -> SearchResponse:
-    """Returns a list of LegislationMetadata objects for a given query"""
-    obj, total = await search_legislation(
-        congress, chamber, versions, text, tags, sort, direction, page, page_size
-    )
+    """
+    Returns a list of LegislationMetadata objects for a given query, text matches
+    come back most relevant first unless another sort is given. Pass the
+    next_cursor of a response as cursor to fetch the page after it.
+    """
+    try:
+        obj, total, next_cursor = await search_legislation(
+            congress,
+            chamber,
+            versions,
+            text,
+            tags,
+            sort,
+            direction,
+            page,
+            page_size,
+            cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     if obj is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Legislation not found"
         )
-    return SearchResponse(legislation=obj, total_results=total)
+    return SearchResponse(
+        legislation=obj, total_results=total, next_cursor=next_cursor
+    )
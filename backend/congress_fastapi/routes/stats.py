@@ -21,11 +21,13 @@ from congress_fastapi.handlers.stats import (
     handle_get_legislation_calendar,
     handle_get_legislation_funnel,
 )
+from congress_fastapi.utils.cache import cached_route
 
 
 router = APIRouter(tags=["Stats"])
 
 @router.get("/stats/legislation_calendar")
+@cached_route(ttl=900, maxsize=8, max_age=300)
 async def legislation_calendar(request: Request) -> NivoCalendarResponse:
     try:
         data = await handle_get_legislation_calendar()
@@ -37,6 +39,7 @@ async def legislation_calendar(request: Request) -> NivoCalendarResponse:
         return NivoCalendarResponse(**data)
 
 @router.get("/stats/legislation_funnel")
+@cached_route(ttl=900, maxsize=8, max_age=300)
 async def legislation_funnel(request: Request) -> NivoFunnelResponse:
     try:
         data = await handle_get_legislation_funnel()
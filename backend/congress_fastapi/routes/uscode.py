@@ -14,6 +14,7 @@ from congress_parser.prompt_runners.utils import (
     get_usc_content_by_parent_and_id,
     print_clause,
 )
+from congress_fastapi.utils.cache import cached_route
 
 
 router = APIRouter(tags=["USCode"])
@@ -25,6 +26,7 @@ async def post_uscode_search(body: USCodeSearchRequest) -> List[USCodeSearchResp
 
 
 @router.get("/uscode/{title}/{section}", tags=["MCP"])
+@cached_route(ttl=3600, maxsize=1024, max_age=3600)
 async def get_uscode_section(
     title: str,
     section: str,
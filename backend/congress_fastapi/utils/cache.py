@@ -0,0 +1,163 @@
+"""
+Process-local response cache for GET routes.
+
+    @router.get("/stats/legislation_funnel")
+    @cached_route(ttl=600)
+    async def legislation_funnel(...): ...
+
+Entries are keyed on the route's arguments and on the API cache version, the
+api_cache_version sequence the importers advance once they have committed
+(congress_parser.utils.cache_version). The version is read from the primary at most
+every API_CACHE_VERSION_INTERVAL seconds and a new one clears every route cache.
+
+Concurrent misses for the same key wait on a single call of the route. Responses
+carry an ETag made from the route, its arguments and the version, and a
+Cache-Control max-age, so a matching If-None-Match is answered with a 304.
+"""
+
+import asyncio
+import hashlib
+import inspect
+import os
+import time
+from functools import wraps
+from typing import Any, Dict, List, Optional, Tuple
+
+from cachetools import TTLCache
+from fastapi import Request, Response
+
+from congress_fastapi.db.postgres import get_database
+
+API_CACHE = os.environ.get("API_CACHE", "1") == "1"
+API_CACHE_VERSION_INTERVAL = float(os.environ.get("API_CACHE_VERSION_INTERVAL", "5"))
+
+
+class CacheVersion:
+    """
+    The last seen value of the api_cache_version sequence, clearing the registered
+    caches whenever it moves
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.value: Optional[int] = None
+        self.checked_at: Optional[float] = None
+        self.caches: List[TTLCache] = []
+        # Made on first use, a lock built at import binds to whatever loop is
+        # current then (Python < 3.10), not the one serving requests
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _stale(self) -> bool:
+        return (
+            self.checked_at is None
+            or time.monotonic() - self.checked_at >= self.interval
+        )
+
+    async def current(self) -> Optional[int]:
+        if not self._stale():
+            return self.value
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._stale():
+                try:
+                    # A standby only advances a sequence when the primary WAL-logs a
+                    # batch of nextval calls, so a bump may never show up there
+                    database = await get_database(primary=True)
+                    value = await database.fetch_val(
+                        "SELECT last_value FROM api_cache_version"
+                    )
+                except Exception as e:
+                    print(f"Could not read api_cache_version: {e}")
+                    value = self.value
+                if value != self.value:
+                    for cache in self.caches:
+                        cache.clear()
+                    self.value = value
+                self.checked_at = time.monotonic()
+        return self.value
+
+
+cache_version = CacheVersion(API_CACHE_VERSION_INTERVAL)
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is None:
+        return False
+    return any(x.strip() in (etag, "*") for x in if_none_match.split(","))
+
+
+def cached_route(ttl: float = 300, maxsize: int = 256, max_age: int = 60):
+    """
+    Caches an async GET route for ttl seconds, up to maxsize argument combinations
+    (least recently used go first), and tells clients and the CDN they may reuse
+    the response for max_age seconds. Errors raised by the route are not cached.
+
+    Adds request and response parameters to the route's signature if it does not
+    take them already, FastAPI fills them in.
+    """
+
+    def decorator(func):
+        cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        in_flight: Dict[Tuple, asyncio.Future] = {}
+        cache_version.caches.append(cache)
+
+        signature = inspect.signature(func)
+        extra = [
+            inspect.Parameter(name, inspect.Parameter.KEYWORD_ONLY, annotation=annotation)
+            for name, annotation in (("request", Request), ("response", Response))
+            if name not in signature.parameters
+        ]
+        route_name = f"{func.__module__}.{func.__qualname__}"
+
+        def finished(key: Tuple, future: asyncio.Future):
+            in_flight.pop(key, None)
+            if not future.cancelled() and future.exception() is None:
+                cache[key] = future.result()
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            request: Request = kwargs["request"]
+            response: Response = kwargs["response"]
+            call_kwargs = {
+                name: value
+                for name, value in kwargs.items()
+                if name in signature.parameters
+            }
+            if not API_CACHE:
+                return await func(*args, **call_kwargs)
+
+            version = await cache_version.current()
+            key = (version,) + tuple(
+                (name, repr(value))
+                for name, value in sorted(call_kwargs.items())
+                if name not in ("request", "response")
+            )
+            digest = hashlib.sha1(repr((route_name, key)).encode()).hexdigest()
+            headers = {
+                "ETag": f'W/"{digest[:24]}"',
+                "Cache-Control": f"public, max-age={max_age}",
+            }
+            if _etag_matches(request, headers["ETag"]):
+                return Response(status_code=304, headers=headers)
+
+            try:
+                value: Any = cache[key]
+            except KeyError:
+                future = in_flight.get(key)
+                if future is None:
+                    future = asyncio.ensure_future(func(*args, **call_kwargs))
+                    in_flight[key] = future
+                    future.add_done_callback(lambda f: finished(key, f))
+                # A client going away does not cancel the call the others wait on
+                value = await asyncio.shield(future)
+            response.headers.update(headers)
+            return value
+
+        wrapper.__signature__ = signature.replace(
+            parameters=[*signature.parameters.values(), *extra]
+        )
+        return wrapper
+
+    return decorator
@@ -23,7 +23,7 @@ patterns would miss.
 """
 
 import re
-from typing import Dict, Optional, TypedDict
+from typing import Dict, Iterable, Optional, Set, TypedDict
 from congress_parser.logger import log
 from unidecode import unidecode
 from enum import Enum
@@ -234,6 +234,107 @@ for action in regex_holder:
     regex_holder[action] = [re.compile(x, flags=re.I) for x in regex_holder[action]]
 
 
+# Literal keywords for the prefilter. Every regex of an action type contains at least one
+# of its keywords as a mandatory literal, so a clause without any of them cannot match
+# that type and its regexes are skipped. Matching is case-insensitive like the regexes.
+# When adding a regex above, make sure one of these (or a new keyword) is in it.
+action_keywords = {
+    ActionType.SHORT_TITLE: ["cited as"],
+    ActionType.PURPOSE: ["purpose of this act"],
+    ActionType.CONGRESS_FINDS: ["congress finds the following:"],
+    ActionType.REPLACE_SECTION: ["to read as follows"],
+    ActionType.IN_CONTEXT: ["in "],
+    ActionType.AMEND_MULTIPLE: ["amended"],
+    ActionType.STRIKE_TEXT: ["by striking"],
+    ActionType.STRIKE_END: ["at the end and inserting"],
+    ActionType.STRIKE_TEXT_MULTIPLE: ["each place"],
+    ActionType.STRIKE_INSERT_SECTION: ["and inserting the following"],
+    ActionType.INSERT_SECTION_AFTER: ["inserting after "],
+    ActionType.INSERT_END: ["insert the following", "adding at the end"],
+    ActionType.INSERT_TEXT_AFTER: ["by inserting"],
+    ActionType.INSERT_TEXT_BEFORE: ["by inserting before"],
+    ActionType.INSERT_TEXT: ["by inserting"],
+    ActionType.INSERT_TEXT_END: ["by adding"],
+    ActionType.STRIKE_SECTION_INSERT: ["by striking"],
+    ActionType.STRIKE_SUBSECTION: ["by striking"],
+    ActionType.STRIKE_PARAGRAPHS_MULTIPLE: ["by striking paragraphs"],
+    ActionType.REDESIGNATE: ["redesignating"],
+    ActionType.REPEAL: ["repealed"],
+    ActionType.EFFECTIVE_DATE: [
+        "enactment",
+        "taxable years",
+        "shall take effect on",
+        "effective date of this act",
+    ],
+    ActionType.SUNSET: ["cease to", "expire", "terminate"],
+    ActionType.TABLE_OF_CONTENTS: ["the table of contents "],
+    ActionType.TABLE_OF_CHAPTERS: ["the table of chapters for title"],
+    ActionType.INSERT_CHAPTER_AT_END: ["new chapter"],
+    ActionType.TERM_DEFINITION: ["the term"],
+    ActionType.TERM_DEFINITION_SECTION: ["the term"],
+    ActionType.TERM_DEFINITION_REF: ["has the meaning given"],
+    ActionType.DATE: [
+        "january",
+        "february",
+        "march",
+        "april",
+        "may",
+        "june",
+        "july",
+        "august",
+        "september",
+        "october",
+        "november",
+        "december",
+    ],
+    ActionType.FINANCIAL: ["$"],
+    ActionType.TRANSFER_FUNDS: ["notwithstanding", "appropriated"],
+    ActionType.RECISSION: ["are rescinded"],
+}
+
+
+def _build_prefilter():
+    """
+    Compiles all the keywords into one alternation, wrapped in a lookahead so that
+    overlapping keywords (e.g. "at the end and inserting the following") are all found.
+    At any one position only the longest alternative is reported, so each keyword also
+    carries the action types of the keywords that are a prefix of it.
+    """
+    keyword_actions: Dict[str, Set[ActionType]] = {}
+    for action, keywords in action_keywords.items():
+        for keyword in keywords:
+            keyword_actions.setdefault(keyword, set()).add(action)
+    closed = {
+        keyword: {
+            action
+            for other, actions in keyword_actions.items()
+            if keyword.startswith(other)
+            for action in actions
+        }
+        for keyword in keyword_actions
+    }
+    ordered = sorted(keyword_actions, key=len, reverse=True)
+    regex = re.compile(
+        "(?=(" + "|".join(re.escape(x) for x in ordered) + "))", flags=re.I
+    )
+    return regex, closed
+
+
+ActionPrefilter, _prefilter_actions = _build_prefilter()
+
+
+def candidate_actions(text: str) -> Set[ActionType]:
+    """
+    Single pass over the (already unidecoded) text that returns the action types whose
+    regexes could possibly match it.
+    """
+    return {
+        action
+        for keyword in set(ActionPrefilter.findall(text))
+        for action in _prefilter_actions[keyword.lower()]
+    }
+
+
 class Action(TypedDict):
     action_type: ActionType
 
@@ -280,10 +381,20 @@ def determine_action(text: str) -> Dict[ActionType, Action]:
     Returns:
         dict: A dict of the matching action regexes
     """
-    actions = {}
     text = unidecode(text).replace("--", "-")
+    return _match_actions(text, candidate_actions(text))
+
 
+def _match_actions(text: str, candidates: Iterable[ActionType]) -> Dict[ActionType, Action]:
+    """
+    Runs the regexes of the candidate action types, in regex_holder order.
+    Passing every action type gives the unfiltered behaviour.
+    """
+    actions = {}
+    candidates = set(candidates)
     for action in regex_holder:
+        if action not in candidates:
+            continue
         c = 0
         for reg in regex_holder[action]:
             res = reg.search(text)
@@ -0,0 +1,398 @@
+"""
+Incremental action parsing between consecutive versions of the same bill.
+
+A reported or engrossed version usually only amends a handful of clauses of the
+version before it, but parse_bill_for_actions runs every clause through
+determine_action/apply_action again. This module matches the content nodes of two
+versions on lc_ident (the id attribute from the bill XML) plus a hash of the node,
+so that:
+
+- only added, removed and modified nodes are stored, as LegislationContentChange rows
+- clauses whose action parse cannot have changed get the previous version's
+  LegislationActionParse and USCContentDiff rows copied over instead of reparsed
+
+A clause's parse depends on its own text, on the quoted-blocks under it, and on the
+citations of its ancestors, so the reuse check hashes all three (the context hash).
+The content hash only covers the node itself, and decides what counts as modified.
+"""
+
+import hashlib
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple, TypedDict
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Session
+
+from congress_db.models import (
+    LegislationActionParse,
+    LegislationContent,
+    LegislationContentChange,
+    LegislationVersion,
+    USCContent,
+    USCContentDiff,
+    Version,
+)
+
+ContentTree = Dict[Optional[int], List[LegislationContent]]
+
+# Columns of USCContentDiff that describe the change itself, the rest are re-pointed
+DIFF_COPY_COLUMNS = [
+    "usc_ident",
+    "usc_guid",
+    "order_number",
+    "number",
+    "section_display",
+    "heading",
+    "content_str",
+    "content_type",
+    "usc_content_id",
+    "usc_section_id",
+    "usc_chapter_id",
+]
+
+
+class NodeFingerprint(TypedDict):
+    identity: Optional[str]
+    content_hash: str
+    context_hash: str
+
+
+class VersionDelta(TypedDict):
+    # new legislation_content_id -> previous legislation_content_id
+    unchanged: Dict[int, int]
+    # The subset of unchanged whose action parse can be copied
+    reusable: Dict[int, int]
+    modified: Dict[int, int]
+    added: List[int]
+    removed: List[int]
+
+
+class PreviousResult(TypedDict):
+    action_parse: Optional[LegislationActionParse]
+    diffs: List[USCContentDiff]
+
+
+def group_by_parent(contents: List[LegislationContent]) -> ContentTree:
+    """
+    Builds the parent -> children lookup the action parser traverses, with the
+    children in document order.
+    """
+    content_by_parent_id: ContentTree = defaultdict(list)
+    for content in contents:
+        content_by_parent_id[content.parent_id].append(content)
+    for content_list in content_by_parent_id.values():
+        content_list.sort(key=lambda x: x.legislation_content_id)
+    return content_by_parent_id
+
+
+def _hash(*parts: Optional[str]) -> str:
+    return hashlib.sha1(
+        "\x1f".join("" if x is None else x for x in parts).encode("utf-8")
+    ).hexdigest()
+
+
+def content_hash(content: LegislationContent) -> str:
+    return _hash(
+        content.content_type,
+        content.section_display,
+        content.heading,
+        content.content_str,
+    )
+
+
+def fingerprint_contents(content_by_parent_id: ContentTree) -> Dict[int, NodeFingerprint]:
+    """
+    Computes the identity, content hash and context hash of every node in the tree.
+
+    The identity is the lc_ident, or for nodes without one the path of content types and
+    section displays (falling back to the sibling position) from the nearest ancestor.
+    Identities that are not unique within the version are dropped, so those nodes are
+    never matched.
+    """
+    fingerprints: Dict[int, NodeFingerprint] = {}
+    subtree_hashes: Dict[int, str] = {}
+
+    def subtree_hash(content: LegislationContent) -> str:
+        content_id = content.legislation_content_id
+        if content_id not in subtree_hashes:
+            subtree_hashes[content_id] = _hash(
+                content_hash(content),
+                *[subtree_hash(x) for x in content_by_parent_id[content_id]],
+            )
+        return subtree_hashes[content_id]
+
+    def visit(content: LegislationContent, position: int, parent_identity: str, parent_context: str):
+        content_id = content.legislation_content_id
+        children = content_by_parent_id[content_id]
+        identity = content.lc_ident or (
+            f"{parent_identity}/{content.content_type}:"
+            f"{content.section_display or position}"
+        )
+        own_hash = content_hash(content)
+        context_hash = _hash(
+            parent_context,
+            own_hash,
+            *[subtree_hash(x) for x in children if x.content_type == "quoted-block"],
+        )
+        fingerprints[content_id] = {
+            "identity": identity,
+            "content_hash": own_hash,
+            "context_hash": context_hash,
+        }
+        for i, child in enumerate(children):
+            visit(child, i, identity, context_hash)
+
+    for i, root in enumerate(content_by_parent_id[None]):
+        visit(root, i, "", "")
+
+    counts: Dict[str, int] = defaultdict(int)
+    for fingerprint in fingerprints.values():
+        counts[fingerprint["identity"]] += 1
+    for fingerprint in fingerprints.values():
+        if counts[fingerprint["identity"]] > 1:
+            fingerprint["identity"] = None
+    return fingerprints
+
+
+def diff_versions(
+    previous: Dict[int, NodeFingerprint], current: Dict[int, NodeFingerprint]
+) -> VersionDelta:
+    """
+    Matches the nodes of two versions on identity and sorts them into
+    unchanged/modified/added/removed.
+    """
+    previous_by_identity = {
+        x["identity"]: content_id
+        for content_id, x in previous.items()
+        if x["identity"] is not None
+    }
+    delta: VersionDelta = {
+        "unchanged": {},
+        "reusable": {},
+        "modified": {},
+        "added": [],
+        "removed": [],
+    }
+    matched = set()
+    for content_id, fingerprint in current.items():
+        previous_id = previous_by_identity.get(fingerprint["identity"])
+        if fingerprint["identity"] is None or previous_id is None:
+            delta["added"].append(content_id)
+            continue
+        matched.add(previous_id)
+        previous_fingerprint = previous[previous_id]
+        if fingerprint["content_hash"] != previous_fingerprint["content_hash"]:
+            delta["modified"][content_id] = previous_id
+            continue
+        delta["unchanged"][content_id] = previous_id
+        if fingerprint["context_hash"] == previous_fingerprint["context_hash"]:
+            delta["reusable"][content_id] = previous_id
+    delta["removed"] = [x for x in previous if x not in matched]
+    return delta
+
+
+def content_change_rows(
+    delta: VersionDelta,
+    current: Dict[int, NodeFingerprint],
+    previous: Dict[int, NodeFingerprint],
+    legislation_version_id: int,
+    previous_legislation_version_id: int,
+) -> List[LegislationContentChange]:
+    rows = []
+
+    def row(change_type, content_id, previous_id, fingerprint):
+        return LegislationContentChange(
+            legislation_version_id=legislation_version_id,
+            previous_legislation_version_id=previous_legislation_version_id,
+            legislation_content_id=content_id,
+            previous_legislation_content_id=previous_id,
+            lc_ident=fingerprint["identity"],
+            change_type=change_type,
+        )
+
+    for content_id in delta["added"]:
+        rows.append(row("added", content_id, None, current[content_id]))
+    for content_id, previous_id in delta["modified"].items():
+        rows.append(row("modified", content_id, previous_id, current[content_id]))
+    for previous_id in delta["removed"]:
+        rows.append(row("removed", None, previous_id, previous[previous_id]))
+    return rows
+
+
+def find_previous_version(
+    session: "Session", legislation_version: LegislationVersion
+) -> Optional[LegislationVersion]:
+    """
+    Returns the version of the same bill that came right before this one, if any.
+    """
+    query = select(LegislationVersion).where(
+        LegislationVersion.legislation_id == legislation_version.legislation_id,
+        LegislationVersion.legislation_version_id
+        != legislation_version.legislation_version_id,
+    )
+    if legislation_version.effective_date is not None:
+        query = query.where(
+            or_(
+                LegislationVersion.effective_date < legislation_version.effective_date,
+                and_(
+                    LegislationVersion.effective_date
+                    == legislation_version.effective_date,
+                    LegislationVersion.legislation_version_id
+                    < legislation_version.legislation_version_id,
+                ),
+            )
+        )
+    else:
+        query = query.where(
+            LegislationVersion.legislation_version_id
+            < legislation_version.legislation_version_id
+        )
+    query = query.order_by(
+        LegislationVersion.effective_date.desc().nullslast(),
+        LegislationVersion.legislation_version_id.desc(),
+    ).limit(1)
+    result = session.execute(query).first()
+    return result[0] if result is not None else None
+
+
+def load_previous_results(
+    session: "Session",
+    previous_version: LegislationVersion,
+    reusable: Dict[int, int],
+) -> Dict[int, PreviousResult]:
+    """
+    Loads the action parses and diffs of the previous version for the reusable nodes,
+    keyed by the new legislation_content_id.
+
+    Nodes are left out (and so get reparsed) when the previous version was never
+    action parsed, or when their diffs point at USC content that the previous version's
+    own insert actions created, since those rows belong to that version.
+    """
+    if len(reusable) == 0:
+        return {}
+    parses = (
+        session.execute(
+            select(LegislationActionParse).where(
+                LegislationActionParse.legislation_version_id
+                == previous_version.legislation_version_id
+            )
+        )
+        .scalars()
+        .all()
+    )
+    if len(parses) == 0:
+        return {}
+    parse_by_content: Dict[int, LegislationActionParse] = {}
+    for parse in parses:
+        parse_by_content.setdefault(parse.legislation_content_id, parse)
+
+    previous_ids = list(reusable.values())
+    diff_rows = session.execute(
+        select(USCContentDiff, USCContent.version_id)
+        .join(USCContent, USCContent.usc_content_id == USCContentDiff.usc_content_id)
+        .where(
+            USCContentDiff.legislation_content_id.in_(previous_ids),
+            USCContentDiff.version_id == previous_version.version_id,
+        )
+    ).all()
+    diffs_by_content: Dict[int, List[USCContentDiff]] = defaultdict(list)
+    version_owned = set()
+    for diff, usc_version_id in diff_rows:
+        if usc_version_id == previous_version.version_id:
+            version_owned.add(diff.legislation_content_id)
+        diffs_by_content[diff.legislation_content_id].append(diff)
+
+    results: Dict[int, PreviousResult] = {}
+    for content_id, previous_id in reusable.items():
+        if previous_id in version_owned:
+            continue
+        results[content_id] = {
+            "action_parse": parse_by_content.get(previous_id),
+            "diffs": diffs_by_content[previous_id],
+        }
+    return results
+
+
+def copy_previous_result(
+    previous: PreviousResult,
+    content: LegislationContent,
+    version_id: int,
+) -> Tuple[Optional[LegislationActionParse], List[USCContentDiff]]:
+    """
+    Copies the previous version's parse and diffs onto the new content node. The new
+    action parse (None if the clause had none) is passed down to the children like a
+    freshly parsed one, the caller stores both.
+    """
+    previous_parse = previous["action_parse"]
+    if previous_parse is None:
+        return None, []
+    new_action = LegislationActionParse(
+        legislation_content_id=content.legislation_content_id,
+        legislation_version_id=content.legislation_version_id,
+        actions=previous_parse.actions,
+        citations=previous_parse.citations,
+    )
+    diffs = [
+        USCContentDiff(
+            **{x: getattr(diff, x) for x in DIFF_COPY_COLUMNS},
+            legislation_content_id=content.legislation_content_id,
+            version_id=version_id,
+        )
+        for diff in previous["diffs"]
+    ]
+    return new_action, diffs
+
+
+def prepare_incremental_parse(
+    session: "Session",
+    legislation_version: LegislationVersion,
+    content_by_parent_id: ContentTree,
+    base_id: int,
+    load_contents,
+) -> Tuple[Dict[int, PreviousResult], Optional[VersionDelta]]:
+    """
+    Diffs the version against the one before it, records the added/removed/modified
+    nodes, and returns the previous results that can be reused for the unchanged ones.
+
+    Args:
+        session (Session): Parser session
+        legislation_version (LegislationVersion): The version about to be action parsed
+        content_by_parent_id (ContentTree): Its content, from group_by_parent
+        base_id (int): USC release version the actions will be applied against
+        load_contents (Callable): Returns the LegislationContent of a legislation_version_id
+
+    Returns:
+        Tuple[Dict[int, PreviousResult], Optional[VersionDelta]]: Reusable results keyed
+        by legislation_content_id, and the delta (None when there is no previous version)
+    """
+    previous_version = find_previous_version(session, legislation_version)
+    if previous_version is None:
+        return {}, None
+    previous = fingerprint_contents(
+        group_by_parent(load_contents(previous_version.legislation_version_id))
+    )
+    current = fingerprint_contents(content_by_parent_id)
+    delta = diff_versions(previous, current)
+
+    session.query(LegislationContentChange).filter(
+        LegislationContentChange.legislation_version_id
+        == legislation_version.legislation_version_id
+    ).delete(synchronize_session=False)
+    session.add_all(
+        content_change_rows(
+            delta,
+            current,
+            previous,
+            legislation_version.legislation_version_id,
+            previous_version.legislation_version_id,
+        )
+    )
+
+    # Diffs are computed against a USC release, they only carry over if both
+    # versions were applied against the same one
+    previous_base = session.execute(
+        select(Version.base_id).where(Version.version_id == previous_version.version_id)
+    ).scalar()
+    if previous_base != base_id:
+        return {}, delta
+    return load_previous_results(session, previous_version, delta["reusable"]), delta
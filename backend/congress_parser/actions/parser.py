@@ -15,17 +15,21 @@ The diff records are what the frontend displays as red/green change highlights.
 Key concepts:
     - Citations are resolved hierarchically: a subsection's partial cite "/a/1"
       is combined with its parent section's full cite "/us/usc/t42/s1395"
-    - QueryInjector ensures all USC queries target the correct base version
+    - USCRepository scopes all USC lookups to the correct base version
     - quoted-block elements in bill XML contain the new text to be inserted
 """
 
 from congress_parser.utils.logger import LogContext
 from congress_parser.actions import ActionObject, ActionType, determine_action
+from congress_parser.actions.incremental import (
+    PreviousResult,
+    copy_previous_result,
+    group_by_parent,
+    prepare_incremental_parse,
+)
+from congress_parser.actions.repository import USCRepository
+from congress_parser.actions.snapshot import get_usc_snapshot
 from congress_parser.actions.utils import strike_emulation
-from sqlalchemy.orm import Session
-from sqlalchemy.sql import Select
-from sqlalchemy import Table
-from sqlalchemy.dialects import postgresql
 from congress_parser.utils.cite_parser import (
     CiteObject,
     parse_action_for_cite,
@@ -33,20 +37,18 @@ from congress_parser.utils.cite_parser import (
 )
 from congress_db.session import Session, get_scoped_session
 
-from sqlalchemy import select, update
-from sqlalchemy.orm import aliased
+from sqlalchemy import event, select, update
 from sqlalchemy.sql import func
 
 import logging
+import os
 
-from collections import defaultdict
 from typing import Dict, List, Optional, Tuple
 from congress_db.models import (
     Legislation,
     LegislationContent,
     LegislationActionParse,
     LegislationVersion,
-    USCChapter,
     USCContent,
     USCContentDiff,
     USCSection,
@@ -54,48 +56,64 @@ from congress_db.models import (
 )
 
 PARSER_SESSION = None
+# Counters for the bill currently being parsed, returned by parse_bill_for_actions
+PARSE_STATS: Dict[str, int] = {}
+# Hold the action parses and diffs of a bill in memory and insert them at the end,
+# instead of adding (and flushing) them one clause at a time
+BATCH_WRITES = os.environ.get("PARSE_BATCH_WRITES", "1") == "1"
+PENDING_PARSES: List[LegislationActionParse] = []
+PENDING_DIFFS: List[USCContentDiff] = []
+# Reuse the previous version's parses for clauses that did not change
+INCREMENTAL = os.environ.get("PARSE_INCREMENTAL_ACTIONS", "1") == "1"
+# Answer the USC lookups from an in-memory snapshot of the base release
+SNAPSHOT = os.environ.get("PARSE_USC_SNAPSHOT", "1") == "1"
+# Version-scoped USC lookups for the bill currently being parsed
+USC_REPOSITORY: Optional[USCRepository] = None
+
+
+def store_action_parse(action: LegislationActionParse):
+    if BATCH_WRITES:
+        PENDING_PARSES.append(action)
+    else:
+        PARSER_SESSION.add(action)
+        PARSER_SESSION.flush()
+
+
+def store_diffs(diffs: List[USCContentDiff]):
+    if BATCH_WRITES:
+        PENDING_DIFFS.extend(diffs)
+    else:
+        for diff in diffs:
+            PARSER_SESSION.add(diff)
 
 
-class QueryInjector:
+def _insert_rows(objects: list) -> List[dict]:
+    table = objects[0].__table__
+    columns = [x.name for x in table.columns if not x.primary_key]
+    return [{x: getattr(obj, x) for x in columns} for obj in objects]
+
+
+def write_pending(session: "Session"):
     """
-    Context manager that monkey-patches session.execute to automatically inject
-    a WHERE clause filtering by version_id on queries involving the target table.
-
-    This ensures all USCContent/USCSection queries return data from the correct
-    US Code release version, without requiring every query call-site to manually
-    add the version filter. Supports nesting (e.g. one for USCContent, another
-    for USCSection).
-
-    Usage:
-        with QueryInjector(session, USCContent.version_id == base_id, USCContent.__table__):
-            # All session.execute() calls that SELECT from usc_content
-            # will automatically have "WHERE version_id = base_id" appended
-            results = session.execute(select(USCContent).where(...))
+    Inserts the collected action parses and diffs, one executemany each. Nothing
+    refers to their primary keys, so the database assigns them.
     """
+    if PENDING_PARSES:
+        session.execute(
+            LegislationActionParse.__table__.insert(), _insert_rows(PENDING_PARSES)
+        )
+    if PENDING_DIFFS:
+        session.execute(USCContentDiff.__table__.insert(), _insert_rows(PENDING_DIFFS))
+    clear_pending()
 
-    def __init__(self, session: "Session", where_clause, target_table: Table):
-        self.session = session
-        self.where_clause = where_clause
-        self.target_table = target_table
-
-    def __enter__(self):
-        self.original_execute = self.session.execute
-        self.session.execute = self._execute_with_injection
-        return self.session
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        self.session.execute = self.original_execute
-
-    def _execute_with_injection(self, query, *args, **kwargs):
-        # Only inject the WHERE clause for SELECT queries that involve our target table
-        if isinstance(query, Select) and any(
-            self.target_table.name == x.name for x in query.froms if hasattr(x, "name")
-        ):
-            query = query.where(self.where_clause)
-            compiled_query = query.compile(
-                dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
-            )
-        return self.original_execute(query, *args, **kwargs)
+
+def clear_pending():
+    PENDING_PARSES.clear()
+    PENDING_DIFFS.clear()
+
+
+def _count_flush(session, flush_context):
+    PARSE_STATS["flushes"] = PARSE_STATS.get("flushes", 0) + 1
 
 
 def get_bill_contents(legislation_version_id: int) -> List[LegislationContent]:
@@ -108,9 +126,7 @@ def get_bill_contents(legislation_version_id: int) -> List[LegislationContent]:
 
 
 def get_chapter_id(chapter: str) -> int:
-    query = select(USCChapter).where(USCChapter.short_title == chapter.zfill(2))
-    result = PARSER_SESSION.execute(query).first()[0]
-    return result.usc_chapter_id
+    return USC_REPOSITORY.chapter_id(chapter)
 
 
 def strike_text(
@@ -122,17 +138,15 @@ def strike_text(
     end: bool = False,
 ) -> List[USCContentDiff]:
     if multiple == False:
-        query = select(USCContent).where(USCContent.usc_ident == citation)
+        results = [x for x in [USC_REPOSITORY.content(citation)] if x is not None]
     else:
-        query = select(USCContent).where(USCContent.usc_ident.like(f"{citation}%"))
-    results = session.execute(query).all()
+        results = USC_REPOSITORY.contents_with_prefix(citation)
 
     if len(results) == 0:
         logging.debug("Could not find content", extra={"usc_ident": citation})
         return []
     diffs: List[USCContentDiff] = []
-    for content_ in results:
-        content = content_[0]
+    for content in results:
         to_strike: Optional[str] = action.get("to_remove_text")
         to_replace: Optional[str] = action.get("to_replace")
         if end:
@@ -189,14 +203,12 @@ def strike_text(
 def insert_text_end(
     action: ActionObject, citation: str, session: "Session"
 ) -> List[USCContentDiff]:
-    query = select(USCContent).where(USCContent.usc_ident == citation)
-    results = session.execute(query).all()
+    content = USC_REPOSITORY.content(citation)
 
-    if len(results) == 0:
+    if content is None:
         logging.debug("Could not find content", extra={"usc_ident": citation})
         return []
 
-    content = results[0][0]
     to_insert_text: Optional[str] = action.get("to_insert_text")
     if to_insert_text is None:
         logging.debug("No insert text")
@@ -299,12 +311,10 @@ def insert_section_after(
     root = content_by_parent_id[quote_block.legislation_content_id][0]
 
     created_diffs: List[USCContentDiff] = []
-    query = select(USCSection).where(USCSection.usc_ident == citation)
-    results = session.execute(query).all()
-    if len(results) == 0:
+    target_section: USCSection = USC_REPOSITORY.section(citation)
+    if target_section is None:
         logging.debug("Could not find section", extra={"usc_ident": citation})
         return []
-    target_section: USCSection = results[0][0]
     parent_id = target_section.parent_id
     new_citation = (
         f"{target_section.usc_ident.rsplit('/', 1)[0]}/s{root.section_display}"
@@ -367,13 +377,11 @@ def insert_subsection_after(
     """
     created_diffs: List[USCContentDiff] = []
     # TODO: Manage multiple versions
-    query = select(USCContent).where(USCContent.usc_ident == citation)
-    results = session.execute(query).all()
+    current_sibling = USC_REPOSITORY.content(citation)
 
-    if len(results) == 0:
+    if current_sibling is None:
         logging.debug("Could not find content", extra={"usc_ident": citation})
         return []
-    current_sibling = results[0][0]
 
     # First we need to find the quote-block, it should be the singular child
     quote_block = content_by_parent_id[action_parse.legislation_content_id]
@@ -411,23 +419,14 @@ def insert_subsection_end(
     session: "Session",
 ):
     # We assume our target citation is the parent section, so to insert at the end we need to find the last child
-    query = select(USCContent).where(USCContent.usc_ident == citation)
-    results = session.execute(query).all()
-    if len(results) == 0:
+    target_section = USC_REPOSITORY.content(citation)
+    if target_section is None:
         logging.warning("No target section found", extra={"usc_ident": citation})
         return []
-    target_section = results[0][0]
-    query = (
-        select(USCContent)
-        .where(USCContent.parent_id == target_section.usc_content_id)
-        .order_by(USCContent.order_number.desc())
-        .limit(1)
-    )
-    results = session.execute(query).all()
-    if len(results) == 0:
+    last_content = USC_REPOSITORY.last_child(target_section)
+    if last_content is None:
         logging.warning("No children found for section", extra={"usc_ident": citation})
         return []
-    last_content = results[0][0]
     return insert_subsection_after(
         target_section,
         action_parse,
@@ -442,39 +441,16 @@ def strike_section(
     action: ActionObject, citation: str, session: "Session"
 ) -> List[USCContentDiff]:
     # Create USCContentDiffs with the content_str and heading set to ""
-    query = select(USCContent).where(USCContent.usc_ident == citation)
-    target_section = session.execute(query).first()
+    target_section = USC_REPOSITORY.content(citation)
     if target_section is None:
         logging.warning("Could not find target section", extra={"usc_ident": citation})
         return []
-    target_section = target_section[0]
-    parent = aliased(USCContent)
-    child = aliased(USCContent)
-
-    # Recursive CTE to get all descendants
-    cte = (
-        select(parent.usc_content_id)
-        .where(
-            parent.usc_content_id == target_section.usc_content_id
-        )  # Replace target_id with the starting USCContent ID
-        .cte(name="descendants", recursive=True)
-    )
-
-    cte = cte.union_all(
-        select(child.usc_content_id).where(child.parent_id == cte.c.usc_content_id)
-    )
-
-    # Query to get all descendant IDs
-    query = select(cte.c.usc_content_id)
-    results = session.execute(query).scalars().all()
-
-    query = select(USCContent).where(USCContent.usc_content_id.in_(results))
-    contents = session.execute(query).all()
+    contents = USC_REPOSITORY.descendants(target_section)
 
     return [
         USCContentDiff(
-            usc_content_id=x[0].usc_content_id,
-            usc_section_id=x[0].usc_section_id,
+            usc_content_id=x.usc_content_id,
+            usc_section_id=x.usc_section_id,
             usc_chapter_id=get_chapter_id(citation.split("/")[3].replace("t", "")),
             content_str="",
             heading="",
@@ -496,8 +472,7 @@ def replace_section(
     # This should create a red x blob, and then a new content blob in the diff view
     diffs: List[USCContentDiff] = []
     diffs.extend(strike_section(action, citation, session))
-    query = select(USCContent).where(USCContent.usc_ident == citation)
-    target_section = session.execute(query).first()[0]
+    target_section = USC_REPOSITORY.content(citation)
     diffs.extend(
         insert_subsection_after(
             target_section,
@@ -614,17 +589,15 @@ def apply_action(
                     # If this is actually a subsection, we need to insert it after the parent
                     if not computed_citation.rsplit("/", 1)[-1].startswith("s"):
                         print("subsection")
-                        query = select(USCContent).where(
-                            USCContent.usc_ident == computed_citation.rsplit("/", 1)[0]
+                        parent_content = USC_REPOSITORY.content(
+                            computed_citation.rsplit("/", 1)[0]
                         )
-                        parent_content = PARSER_SESSION.execute(query).first()
                         if parent_content is None:
                             logging.warning(
                                 "Could not find parent content",
                                 extra={"usc_ident": computed_citation},
                             )
                             continue
-                        parent_content = parent_content[0]
                         diffs.extend(
                             insert_subsection_after(
                                 parent_content,
@@ -670,10 +643,11 @@ def apply_action(
             logging.exception(f"Unexpected failure while parsing action {act_obj}")
     if len(diffs) > 0:
         print(f"Created {len(diffs)} diffs")
+    PARSE_STATS["diffs"] = PARSE_STATS.get("diffs", 0) + len(diffs)
     for diff in diffs:
         diff.legislation_content_id = action.legislation_content_id
         diff.version_id = version_id
-        PARSER_SESSION.add(diff)
+    store_diffs(diffs)
 
 
 def recursively_extract_actions(
@@ -681,6 +655,7 @@ def recursively_extract_actions(
     content: LegislationContent,
     parent_actions: List[LegislationActionParse] = [],
     version_id: int = 0,
+    reusable: Dict[int, PreviousResult] = {},
 ):
     """
     Depth-first traversal of bill content that extracts actions and applies them.
@@ -695,6 +670,9 @@ def recursively_extract_actions(
 
     quoted-block nodes are skipped — their content is consumed by the parent
     action that references them (e.g. INSERT_END reads its quote-block child).
+
+    Nodes in `reusable` are unchanged since the previous version of the bill, their
+    parse and diffs are copied from it instead of being recomputed.
     """
     with LogContext(
         {
@@ -710,8 +688,25 @@ def recursively_extract_actions(
             return
         new_action = None
         new_parents = []
-        if content.content_str is not None and content.content_str.strip() != "":
+        if content.legislation_content_id in reusable:
+            if content.content_str is not None and content.content_str.strip() != "":
+                previous = reusable[content.legislation_content_id]
+                PARSE_STATS["clauses"] = PARSE_STATS.get("clauses", 0) + 1
+                PARSE_STATS["reused"] = PARSE_STATS.get("reused", 0) + 1
+                if previous["action_parse"] is not None:
+                    PARSE_STATS["diffs"] = PARSE_STATS.get("diffs", 0) + len(
+                        previous["diffs"]
+                    )
+                new_action, diffs = copy_previous_result(previous, content, version_id)
+                if new_action is not None:
+                    store_action_parse(new_action)
+                    store_diffs(diffs)
+                    new_parents = [*parent_actions] + [new_action]
+            else:
+                new_parents = parent_actions
+        elif content.content_str is not None and content.content_str.strip() != "":
             # If it has content, then we can extract actions from it
+            PARSE_STATS["clauses"] = PARSE_STATS.get("clauses", 0) + 1
             action_dict = determine_action(content.content_str)
             cite_list = parse_text_for_cite(content.content_str, action_dict)
             if action_dict != {} or cite_list != []:
@@ -721,8 +716,7 @@ def recursively_extract_actions(
                     actions=[action_dict],
                     citations=cite_list,
                 )
-                PARSER_SESSION.add(new_action)
-                PARSER_SESSION.flush()
+                store_action_parse(new_action)
                 apply_action(
                     content_by_parent_id, new_action, parent_actions, version_id
                 )
@@ -733,20 +727,40 @@ def recursively_extract_actions(
         # Continue to recurse
         for child in content_by_parent_id[content.legislation_content_id]:
             recursively_extract_actions(
-                content_by_parent_id, child, new_parents, version_id
+                content_by_parent_id, child, new_parents, version_id, reusable
             )
 
 
-def parse_bill_for_actions(legislation_version: LegislationVersion):
+def parse_bill_for_actions(legislation_version: LegislationVersion) -> Dict[str, int]:
     """
     Main entry point for action parsing. Given a legislation version, retrieves
     all its content from the database, builds a parent→children lookup, and
     kicks off recursive action extraction with version-filtered queries.
+
+    Returns the number of clauses parsed (or reused), diffs created and session
+    flushes. The action parses and diffs are written together at the end, a failure
+    rolls the whole version back.
     """
     global PARSER_SESSION
     if PARSER_SESSION is None:
         PARSER_SESSION = get_scoped_session()
+        event.listen(PARSER_SESSION, "after_flush", _count_flush)
     PARSER_SESSION.rollback()
+    clear_pending()
+    PARSE_STATS.clear()
+    PARSE_STATS.update({"clauses": 0, "diffs": 0, "reused": 0, "flushes": 0})
+    try:
+        _parse_bill_for_actions(legislation_version)
+    except Exception:
+        # Nothing of a half parsed bill is kept
+        PARSER_SESSION.rollback()
+        clear_pending()
+        raise
+    return dict(PARSE_STATS)
+
+
+def _parse_bill_for_actions(legislation_version: LegislationVersion):
+    global USC_REPOSITORY
     with LogContext(
         {
             "legislation_version": {
@@ -759,41 +773,51 @@ def parse_bill_for_actions(legislation_version: LegislationVersion):
             Version.version_id == legislation_version.version_id
         )
         result = PARSER_SESSION.execute(base_version).first()[0]
-
-        # These make sure we always select the correct version
-        # it works by injecting this additional where clause for queries
-        # involving the given table
-        with QueryInjector(
+        # Every USC lookup goes through this, scoped to the base release
+        USC_REPOSITORY = USCRepository(
             PARSER_SESSION,
-            USCContent.version_id == result.base_id,
-            USCContent.__table__,
-        ):
-            with QueryInjector(
+            result.base_id,
+            get_usc_snapshot(result.base_id) if SNAPSHOT else None,
+        )
+
+        # Retrieve all the content for the legislation version
+        # and put it into a dict by parent, this will constitute our traversal of the tree
+        contents = get_bill_contents(legislation_version.legislation_version_id)
+        content_by_parent_id = group_by_parent(contents)
+
+        reusable: Dict[int, PreviousResult] = {}
+        if INCREMENTAL:
+            reusable, delta = prepare_incremental_parse(
                 PARSER_SESSION,
-                USCSection.version_id == result.base_id,
-                USCSection.__table__,
-            ):
-                # Retrieve all the content for the legislation version
-                contents = get_bill_contents(legislation_version.legislation_version_id)
-
-                # Put into a dict by parent
-                # This will constitute our traversal of the tree
-                content_by_parent_id: Dict[int, List[LegislationContent]] = defaultdict(
-                    list
+                legislation_version,
+                content_by_parent_id,
+                result.base_id,
+                get_bill_contents,
+            )
+            if delta is not None:
+                logging.info(
+                    "Incremental action parse",
+                    extra={
+                        "added": len(delta["added"]),
+                        "modified": len(delta["modified"]),
+                        "removed": len(delta["removed"]),
+                        "reused": len(reusable),
+                    },
                 )
-                for content in contents:
-                    content_by_parent_id[content.parent_id].append(content)
 
-                # Sort the lists now so we can proceed in a depth first manner
-                for parent_id, content_list in content_by_parent_id.items():
-                    content_list.sort(key=lambda x: x.legislation_content_id)
+        root_content = content_by_parent_id[None]
 
-                root_content = content_by_parent_id[None]
-
-                # Iterate over the root children
-                for content in root_content:
-                    recursively_extract_actions(
-                        content_by_parent_id, content, [], legislation_version.version_id
-                    )
-                PARSER_SESSION.flush()
-                PARSER_SESSION.commit()
+        # Iterate over the root children
+        for content in root_content:
+            recursively_extract_actions(
+                content_by_parent_id,
+                content,
+                [],
+                legislation_version.version_id,
+                reusable,
+            )
+        write_pending(PARSER_SESSION)
+        PARSER_SESSION.flush()
+        PARSER_SESSION.commit()
+        PARSE_STATS["lookup_hits"] = USC_REPOSITORY.hits
+        PARSE_STATS["lookup_misses"] = USC_REPOSITORY.misses
@@ -1,20 +1,27 @@
+from typing import Optional
 from congress_db.session import Session
 from congress_db.models import USCContentDiff, USCSection, USCContent
 from congress_parser.logger import log
 import re
 from congress_parser.actions import ActionObject
+from congress_parser.actions.repository import USCRepository
 
 
 name_extract = re.compile(r"\((?P<name>.+?)")
 
 # TODO: Fix redesignation to fix usc_ident
-def redesignate(action_obj: ActionObject, session: "Session") -> None:
+def redesignate(
+    action_obj: ActionObject,
+    session: "Session",
+    repository: Optional[USCRepository] = None,
+) -> None:
     """
     Handles changing the display letter to something new for a section
 
     Args:
         action_obj (ActionObject): Parsed action
         session (Session): Current database session
+        repository (USCRepository, optional): Version-scoped lookups to use for the section
     """
     action = action_obj.action
     new_vers_id = action_obj.version_id
@@ -33,12 +40,16 @@ def redesignate(action_obj: ActionObject, session: "Session") -> None:
     if from_name not in cited_content.section_display:
         log.warn("Not found?")
         return
-    chapter = (
-        session.query(USCSection)
-        .filter(USCSection.usc_section_id == cited_content.usc_section_id)
-        .limit(1)
-        .all()
-    )
+    if repository is not None:
+        section = repository.section_by_id(cited_content.usc_section_id)
+        chapter = [section] if section is not None else []
+    else:
+        chapter = (
+            session.query(USCSection)
+            .filter(USCSection.usc_section_id == cited_content.usc_section_id)
+            .limit(1)
+            .all()
+        )
     if len(chapter) > 0:
         chapter_id = chapter[0].usc_chapter_id
         diff = USCContentDiff(
@@ -0,0 +1,194 @@
+"""
+Version-scoped access to the US Code for the action engine.
+
+Every lookup the engine makes against usc_content/usc_section goes through a
+USCRepository bound to the base release the bill is applied against. The version filter
+is part of each statement, with the identifier and version as bound parameters, so the
+statements below are built once and hit SQLAlchemy's compiled cache on every call.
+
+When a USCSnapshot is given, lookups are answered from memory and only the first lookup
+into a title goes to the database. Without one, exact lookups are still cached for the
+lifetime of the repository (one bill). The hit/miss counters record how many lookups
+were answered without a statement.
+
+The version filter is in_release, so sections a delta release import carried forward
+from an earlier release are found as well.
+"""
+
+from typing import Dict, List, Optional
+
+from sqlalchemy import bindparam, select
+from sqlalchemy.orm import Session, aliased
+
+from congress_db.models import USCChapter, USCContent, USCSection
+from congress_parser.actions.snapshot import USCSnapshot
+from congress_parser.importers.release_delta import in_release
+
+BASE_ID = bindparam("base_id")
+
+CONTENT_BY_IDENT = select(USCContent).where(
+    USCContent.usc_ident == bindparam("usc_ident"),
+    in_release(USCContent, BASE_ID),
+)
+CONTENT_BY_PREFIX = select(USCContent).where(
+    USCContent.usc_ident.like(bindparam("prefix")),
+    in_release(USCContent, BASE_ID),
+)
+SECTION_BY_IDENT = select(USCSection).where(
+    USCSection.usc_ident == bindparam("usc_ident"),
+    in_release(USCSection, BASE_ID),
+)
+SECTION_BY_ID = select(USCSection).where(
+    USCSection.usc_section_id == bindparam("usc_section_id")
+)
+LAST_CHILD = (
+    select(USCContent)
+    .where(
+        USCContent.parent_id == bindparam("parent_id"),
+        in_release(USCContent, BASE_ID),
+    )
+    .order_by(USCContent.order_number.desc())
+    .limit(1)
+)
+CHAPTER_BY_TITLE = select(USCChapter).where(
+    USCChapter.short_title == bindparam("short_title")
+)
+
+
+def _descendants_statement():
+    parent = aliased(USCContent)
+    child = aliased(USCContent)
+    # Recursive CTE to get all descendants
+    cte = (
+        select(parent.usc_content_id)
+        .where(parent.usc_content_id == bindparam("root_id"))
+        .cte(name="descendants", recursive=True)
+    )
+    cte = cte.union_all(
+        select(child.usc_content_id).where(child.parent_id == cte.c.usc_content_id)
+    )
+    return select(USCContent).where(
+        USCContent.usc_content_id.in_(select(cte.c.usc_content_id)),
+        in_release(USCContent, BASE_ID),
+    )
+
+
+DESCENDANTS = _descendants_statement()
+
+_MISSING = object()
+
+
+class USCRepository:
+    def __init__(
+        self, session: "Session", base_id: int, snapshot: Optional[USCSnapshot] = None
+    ):
+        self.session = session
+        self.base_id = base_id
+        self.snapshot = snapshot
+        self.hits = 0
+        self.misses = 0
+        self._content_cache: Dict[str, Optional[USCContent]] = {}
+        self._section_cache: Dict[str, Optional[USCSection]] = {}
+        self._chapter_cache: Dict[str, int] = {}
+
+    def _from_snapshot(self, lookup, *args):
+        queries = self.snapshot.queries
+        result = lookup(self.session, *args)
+        if self.snapshot.queries == queries:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return result
+
+    def _first(self, statement, params: dict):
+        self.misses += 1
+        result = self.session.execute(statement, params).first()
+        return result[0] if result is not None else None
+
+    def content(self, citation: str) -> Optional[USCContent]:
+        """
+        The content with the given identifier, or None
+        """
+        if self.snapshot is not None:
+            return self._from_snapshot(self.snapshot.content, citation)
+        cached = self._content_cache.get(citation, _MISSING)
+        if cached is not _MISSING:
+            self.hits += 1
+            return cached
+        content = self._first(
+            CONTENT_BY_IDENT, {"usc_ident": citation, "base_id": self.base_id}
+        )
+        self._content_cache[citation] = content
+        return content
+
+    def contents_with_prefix(self, prefix: str) -> List[USCContent]:
+        """
+        Every content whose identifier starts with the prefix
+        """
+        if self.snapshot is not None:
+            results = self._from_snapshot(self.snapshot.contents_with_prefix, prefix)
+            if results is not None:
+                return results
+        self.misses += 1
+        return (
+            self.session.execute(
+                CONTENT_BY_PREFIX, {"prefix": f"{prefix}%", "base_id": self.base_id}
+            )
+            .scalars()
+            .all()
+        )
+
+    def section(self, citation: str) -> Optional[USCSection]:
+        if self.snapshot is not None:
+            return self._from_snapshot(self.snapshot.section, citation)
+        cached = self._section_cache.get(citation, _MISSING)
+        if cached is not _MISSING:
+            self.hits += 1
+            return cached
+        section = self._first(
+            SECTION_BY_IDENT, {"usc_ident": citation, "base_id": self.base_id}
+        )
+        self._section_cache[citation] = section
+        return section
+
+    def section_by_id(self, usc_section_id: int) -> Optional[USCSection]:
+        return self._first(SECTION_BY_ID, {"usc_section_id": usc_section_id})
+
+    def last_child(self, content: USCContent) -> Optional[USCContent]:
+        """
+        The child of the content with the highest order_number
+        """
+        if self.snapshot is not None:
+            self.hits += 1
+            return self.snapshot.last_child(content)
+        return self._first(
+            LAST_CHILD, {"parent_id": content.usc_content_id, "base_id": self.base_id}
+        )
+
+    def descendants(self, content: USCContent) -> List[USCContent]:
+        """
+        The content and everything below it
+        """
+        if self.snapshot is not None:
+            self.hits += 1
+            return self.snapshot.descendants(content)
+        self.misses += 1
+        return (
+            self.session.execute(
+                DESCENDANTS, {"root_id": content.usc_content_id, "base_id": self.base_id}
+            )
+            .scalars()
+            .all()
+        )
+
+    def chapter_id(self, chapter: str) -> int:
+        if self.snapshot is not None:
+            chapter_id = self._from_snapshot(self.snapshot.chapter_id, chapter)
+            if chapter_id is not None:
+                return chapter_id
+        if chapter in self._chapter_cache:
+            self.hits += 1
+            return self._chapter_cache[chapter]
+        result = self._first(CHAPTER_BY_TITLE, {"short_title": chapter.zfill(2)})
+        self._chapter_cache[chapter] = result.usc_chapter_id
+        return result.usc_chapter_id
@@ -0,0 +1,204 @@
+"""
+In-memory snapshot of the US Code for one base release, used by the action engine.
+
+apply_action and its helpers look up USC content by identifier for every clause they
+apply, and get_chapter_id looks up the chapter for every diff. With a snapshot, a title
+is loaded with a single query the first time a citation into it is seen, and every
+lookup after that is a dict or bisect lookup:
+
+- exact usc_ident lookups (the `usc_ident == citation` queries)
+- prefix lookups over the sorted identifiers of a title (the `LIKE 'x%'` queries)
+- children and descendants by parent_id (insert at end, strike section)
+
+The snapshot only holds the rows in effect for the base release, including sections
+carried forward from an earlier release, which is what the statements of
+USCRepository restrict the queries to as well. Rows inserted while applying a bill
+belong to the bill's own version and are never looked up.
+"""
+
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+from congress_db.models import USCChapter, USCContent, USCSection
+from congress_parser.importers.release_delta import in_release
+
+
+class SnapshotContent:
+    """
+    The columns of a USCContent row the action engine reads
+    """
+
+    __slots__ = (
+        "usc_content_id",
+        "parent_id",
+        "usc_ident",
+        "order_number",
+        "heading",
+        "content_str",
+        "content_type",
+        "usc_section_id",
+    )
+
+    def __init__(self, *values):
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+
+class SnapshotSection:
+    """
+    The columns of a USCSection row the action engine reads
+    """
+
+    __slots__ = ("usc_section_id", "parent_id", "usc_ident", "heading", "usc_chapter_id")
+
+    def __init__(self, *values):
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+
+CONTENT_COLUMNS = [getattr(USCContent, x) for x in SnapshotContent.__slots__]
+SECTION_COLUMNS = [getattr(USCSection, x) for x in SnapshotSection.__slots__]
+
+
+def citation_title(citation: str) -> Optional[str]:
+    """
+    "/us/usc/t42/s1395/a" -> "t42"
+    """
+    parts = citation.split("/")
+    if len(parts) < 4 or parts[1] != "us" or parts[2] != "usc":
+        return None
+    return parts[3]
+
+
+class USCSnapshot:
+    def __init__(self, base_id: int):
+        self.base_id = base_id
+        self.queries = 0
+        self._titles: Set[str] = set()
+        self._content_by_ident: Dict[str, List[SnapshotContent]] = defaultdict(list)
+        self._content_by_parent: Dict[int, List[SnapshotContent]] = defaultdict(list)
+        self._sorted_idents: Dict[str, List[str]] = {}
+        self._section_by_ident: Dict[str, List[SnapshotSection]] = defaultdict(list)
+        self._chapters: Optional[Dict[str, int]] = None
+
+    def _load_title(self, session: "Session", title: str):
+        if title in self._titles:
+            return
+        self._titles.add(title)
+        prefix = f"/us/usc/{title}"
+        self.queries += 2
+        contents = session.execute(
+            select(*CONTENT_COLUMNS)
+            .where(
+                in_release(USCContent, self.base_id),
+                or_(
+                    USCContent.usc_ident == prefix,
+                    USCContent.usc_ident.like(f"{prefix}/%"),
+                ),
+            )
+            .order_by(USCContent.usc_content_id)
+        ).all()
+        for row in contents:
+            content = SnapshotContent(*row)
+            self._content_by_ident[content.usc_ident].append(content)
+            self._content_by_parent[content.parent_id].append(content)
+        self._sorted_idents[title] = sorted({x[2] for x in contents if x[2] is not None})
+
+        sections = session.execute(
+            select(*SECTION_COLUMNS)
+            .where(
+                in_release(USCSection, self.base_id),
+                or_(
+                    USCSection.usc_ident == prefix,
+                    USCSection.usc_ident.like(f"{prefix}/%"),
+                ),
+            )
+            .order_by(USCSection.usc_section_id)
+        ).all()
+        for row in sections:
+            section = SnapshotSection(*row)
+            self._section_by_ident[section.usc_ident].append(section)
+
+    def _ensure(self, session: "Session", citation: str) -> bool:
+        title = citation_title(citation)
+        if title is None:
+            return False
+        self._load_title(session, title)
+        return True
+
+    def content(self, session: "Session", citation: str) -> Optional[SnapshotContent]:
+        if not self._ensure(session, citation):
+            return None
+        matches = self._content_by_ident.get(citation)
+        return matches[0] if matches else None
+
+    def contents_with_prefix(
+        self, session: "Session", prefix: str
+    ) -> Optional[List[SnapshotContent]]:
+        """
+        Equivalent of `usc_ident LIKE 'prefix%'`, returns None for prefixes that could
+        reach past a single title (e.g. "/us/usc/t4" also matches t42).
+        """
+        if prefix.count("/") < 4 or not self._ensure(session, prefix):
+            return None
+        idents = self._sorted_idents[citation_title(prefix)]
+        results = []
+        i = bisect_left(idents, prefix)
+        while i < len(idents) and idents[i].startswith(prefix):
+            results.extend(self._content_by_ident[idents[i]])
+            i += 1
+        return results
+
+    def section(self, session: "Session", citation: str) -> Optional[SnapshotSection]:
+        if not self._ensure(session, citation):
+            return None
+        matches = self._section_by_ident.get(citation)
+        return matches[0] if matches else None
+
+    def last_child(self, content: SnapshotContent) -> Optional[SnapshotContent]:
+        children = self._content_by_parent.get(content.usc_content_id)
+        if not children:
+            return None
+        return max(children, key=lambda x: x.order_number or 0)
+
+    def descendants(self, content: SnapshotContent) -> List[SnapshotContent]:
+        """
+        The content itself and everything below it
+        """
+        results = [content]
+        i = 0
+        while i < len(results):
+            results.extend(self._content_by_parent.get(results[i].usc_content_id, []))
+            i += 1
+        return results
+
+    def chapter_id(self, session: "Session", chapter: str) -> Optional[int]:
+        if self._chapters is None:
+            self.queries += 1
+            rows = session.execute(
+                select(USCChapter.short_title, USCChapter.usc_chapter_id)
+                .where(USCChapter.version_id == self.base_id)
+                .order_by(USCChapter.usc_chapter_id)
+            ).all()
+            self._chapters = {}
+            for short_title, usc_chapter_id in rows:
+                self._chapters.setdefault(short_title, usc_chapter_id)
+        return self._chapters.get(chapter.zfill(2))
+
+
+_SNAPSHOT: Optional[USCSnapshot] = None
+
+
+def get_usc_snapshot(base_id: int) -> USCSnapshot:
+    """
+    Returns the worker's snapshot, it is kept between bills and replaced when a bill
+    is applied against a different base release.
+    """
+    global _SNAPSHOT
+    if _SNAPSHOT is None or _SNAPSHOT.base_id != base_id:
+        _SNAPSHOT = USCSnapshot(base_id)
+    return _SNAPSHOT
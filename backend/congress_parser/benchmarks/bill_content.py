@@ -0,0 +1,93 @@
+"""
+Compares the per-node commit path (recursive_bill_content) against the COPY path
+(write_bill_content_bulk) for storing a bill's LegislationContent tree.
+
+Everything runs inside a transaction that is rolled back at the end, so it is safe
+to point at a real database. Rows are written with a NULL legislation_version_id.
+
+Usage:
+    python -m congress_parser.benchmarks.bill_content
+    python -m congress_parser.benchmarks.bill_content path/to/BILLS-118hr1ih.xml --repeat 5
+"""
+
+import argparse
+import glob
+import os
+import time
+from typing import Callable, Dict, List
+
+from lxml import etree
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from congress_db.session import engine
+from congress_parser.run_through import recursive_bill_content, write_bill_content_bulk
+
+FIXTURES_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "tests", "fixtures"
+)
+
+
+def _time_path(connection, legis, writer: Callable, repeat: int) -> Dict[str, float]:
+    statements = {"count": 0}
+
+    def count_statement(*args, **kwargs):
+        statements["count"] += 1
+
+    event.listen(connection, "before_cursor_execute", count_statement)
+    try:
+        durations = []
+        for _ in range(repeat):
+            session = sessionmaker(bind=connection)()
+            start = time.perf_counter()
+            writer(legis, session)
+            session.flush()
+            durations.append(time.perf_counter() - start)
+            session.close()
+    finally:
+        event.remove(connection, "before_cursor_execute", count_statement)
+    return {
+        "best": min(durations),
+        "mean": sum(durations) / len(durations),
+        "statements": statements["count"] / repeat,
+    }
+
+
+def _orm_writer(legis, session):
+    recursive_bill_content(None, legis, 0, None, {}, "", None, session=session)
+
+
+def _bulk_writer(legis, session):
+    write_bill_content_bulk(legis, None, session)
+
+
+def run(paths: List[str], repeat: int):
+    connection = engine.connect()
+    transaction = connection.begin()
+    try:
+        print(f"{'file':<32} {'path':<6} {'best ms':>9} {'mean ms':>9} {'stmts':>7}")
+        for path in paths:
+            with open(path, "rb") as file:
+                root = etree.fromstring(file.read())
+            legis = root.xpath("//legis-body")
+            if len(legis) == 0:
+                continue
+            for name, writer in [("orm", _orm_writer), ("copy", _bulk_writer)]:
+                result = _time_path(connection, legis[0], writer, repeat)
+                print(
+                    f"{os.path.basename(path):<32} {name:<6} "
+                    f"{result['best'] * 1000:>9.2f} {result['mean'] * 1000:>9.2f} "
+                    f"{result['statements']:>7.0f}"
+                )
+    finally:
+        transaction.rollback()
+        connection.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark bill content writers")
+    parser.add_argument("paths", nargs="*", help="Bill XML files, defaults to the test fixtures")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    paths = args.paths or sorted(glob.glob(os.path.join(FIXTURES_DIR, "bill_*.xml")))
+    run(paths, args.repeat)
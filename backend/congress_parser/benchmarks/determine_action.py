@@ -0,0 +1,83 @@
+"""
+Compares determine_action with the keyword prefilter against running every regex.
+
+The corpus is every clause text in tests/test_actions.py plus the clauses of the
+bill fixtures, optionally extended with bill XML files given on the command line.
+
+Usage:
+    python -m congress_parser.benchmarks.determine_action
+    python -m congress_parser.benchmarks.determine_action path/to/BILLS-118hr1ih.xml --repeat 20
+"""
+
+import argparse
+import ast
+import glob
+import os
+import time
+from typing import Callable, List
+
+from unidecode import unidecode
+
+from congress_parser.actions import _match_actions, determine_action, regex_holder
+from congress_parser.run_through import stream_bill_document
+
+TESTS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "tests")
+
+
+def load_clause_corpus(paths: List[str] = []) -> List[str]:
+    """
+    Returns the clause texts of test_actions.py and of the given (or fixture) bills.
+    """
+    texts = []
+    with open(os.path.join(TESTS_DIR, "test_actions.py")) as file:
+        tree = ast.parse(file.read())
+    for node in ast.walk(tree):
+        if (
+            isinstance(node, ast.Assign)
+            and any(isinstance(x, ast.Name) and x.id == "text" for x in node.targets)
+            and isinstance(node.value, ast.Constant)
+            and isinstance(node.value.value, str)
+        ):
+            texts.append(node.value.value)
+    bills = paths or sorted(glob.glob(os.path.join(TESTS_DIR, "fixtures", "bill_*.xml")))
+    for path in bills:
+        with open(path, "rb") as file:
+            for record in stream_bill_document(file)["records"]:
+                if record["content_str"]:
+                    texts.append(record["content_str"])
+    return texts
+
+
+def _unfiltered(text: str):
+    text = unidecode(text).replace("--", "-")
+    return _match_actions(text, regex_holder)
+
+
+def _time(func: Callable, texts: List[str], repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            func(text)
+        duration = time.perf_counter() - start
+        best = duration if best is None else min(best, duration)
+    return best
+
+
+def run(paths: List[str], repeat: int):
+    texts = load_clause_corpus(paths)
+    mismatches = [x for x in texts if determine_action(x) != _unfiltered(x)]
+    unfiltered = _time(_unfiltered, texts, repeat)
+    prefiltered = _time(determine_action, texts, repeat)
+    print(f"{len(texts)} clauses, {len(mismatches)} mismatches")
+    print(f"{'all regexes':<14} {unfiltered * 1000:>9.2f} ms")
+    print(f"{'prefiltered':<14} {prefiltered * 1000:>9.2f} ms")
+    print(f"{'speedup':<14} {unfiltered / prefiltered:>9.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark determine_action")
+    parser.add_argument("paths", nargs="*", help="Bill XML files, defaults to the test fixtures")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.paths, args.repeat)
@@ -0,0 +1,86 @@
+"""
+Compares the flush-per-row path (write_title_orm) against the COPY path
+(write_title_bulk) for storing one US Code title.
+
+Everything runs inside a transaction that is rolled back at the end, so it is safe
+to point at a real database. Rows are written with a NULL version_id under a
+throwaway USCChapter, and without a previous release so every section is written.
+
+Usage:
+    python -m congress_parser.benchmarks.usc_title
+    python -m congress_parser.benchmarks.usc_title path/to/usc42.xml --repeat 3
+"""
+
+import argparse
+import os
+import time
+from typing import Callable, Dict
+
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from congress_db.models import USCChapter
+from congress_db.session import engine
+from congress_parser.importers.releases import open_usc, write_title_orm
+from congress_parser.importers.usc_title import write_title_bulk
+
+SAMPLE_TITLE = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "tests", "fixtures", "usc_title_sample.xml"
+)
+
+
+def _time_path(connection, elements, writer: Callable, repeat: int) -> Dict[str, float]:
+    statements = {"count": 0}
+
+    def count_statement(*args, **kwargs):
+        statements["count"] += 1
+
+    durations = []
+    rows = 0
+    for _ in range(repeat):
+        session = sessionmaker(bind=connection)()
+        chapter = USCChapter(short_title="benchmark", document="usc")
+        session.add(chapter)
+        session.flush()
+        event.listen(connection, "before_cursor_execute", count_statement)
+        try:
+            start = time.perf_counter()
+            result = writer(session, elements, "00", chapter.usc_chapter_id, None)
+            session.flush()
+            durations.append(time.perf_counter() - start)
+        finally:
+            event.remove(connection, "before_cursor_execute", count_statement)
+        rows = result["written"]
+        session.close()
+    return {
+        "best": min(durations),
+        "mean": sum(durations) / len(durations),
+        "statements": statements["count"] / repeat,
+        "sections": rows,
+    }
+
+
+def run(path: str, repeat: int):
+    with open(path, "rb") as file:
+        _, elements = open_usc(file.read())
+    connection = engine.connect()
+    transaction = connection.begin()
+    try:
+        print(f"{'path':<6} {'sections':>9} {'best ms':>10} {'mean ms':>10} {'stmts':>8}")
+        for name, writer in [("orm", write_title_orm), ("copy", write_title_bulk)]:
+            result = _time_path(connection, elements, writer, repeat)
+            print(
+                f"{name:<6} {result['sections']:>9} {result['best'] * 1000:>10.2f} "
+                f"{result['mean'] * 1000:>10.2f} {result['statements']:>8.0f}"
+            )
+    finally:
+        transaction.rollback()
+        connection.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark US Code title writers")
+    parser.add_argument("path", nargs="?", default=SAMPLE_TITLE, help="Title XML file")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.path, args.repeat)
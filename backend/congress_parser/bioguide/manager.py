@@ -1,17 +1,157 @@
 import requests
-from typing import List
+from typing import Any, Dict, Iterator, List, Optional
+import hashlib
 import logging
+import os
 import zipfile
 import json
 import io
-import json
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
 
 from congress_db.session import Session
 from congress_db.models import Legislator
 from congress_parser.bioguide.types import BioGuideMember
+from congress_parser.utils.cache_version import bump_cache_version
 
 BULK_BIOGUIDE_URL = "https://bioguide.congress.gov/bioguide/data/BioguideProfiles.zip"
 SENATE_LIST_URL = "https://www.senate.gov/legislative/LIS_MEMBER/cvc_member_data.xml"
+# Legislator rows per INSERT ... ON CONFLICT statement
+BIOGUIDE_BATCH = int(os.environ.get("PARSE_BIOGUIDE_BATCH", 1000))
+
+# The Legislator columns a bioguide profile fills in, in the order they are hashed
+LEGISLATOR_COLUMNS = [
+    "bioguide_id",
+    "lis_id",
+    "first_name",
+    "last_name",
+    "middle_name",
+    "party",
+    "state",
+    "job",
+    "congress_id",
+    "image_url",
+    "image_source",
+    "profile",
+    "twitter",
+    "facebook",
+    "youtube",
+    "instagram",
+]
+
+
+def profile_data(jdata: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Some profiles in the zip are wrapped in {"data": ...}
+    """
+    if jdata.get('data') is None:
+        return jdata
+    return jdata.get('data')
+
+
+def iter_profiles(z: zipfile.ZipFile) -> Iterator[Dict[str, Any]]:
+    """
+    Decodes the profiles one member at a time
+    """
+    for filename in z.namelist():
+        with z.open(filename) as f:
+            yield profile_data(json.load(f))
+
+
+def _last_position(profile: Dict[str, Any]) -> Dict[str, Any]:
+    positions = profile.get('jobPositions') or []
+    return positions[-1] if positions else {}
+
+
+def legislator_row(
+    profile: Dict[str, Any], lis_lookup: Dict[str, str], social_lookup: Dict[str, dict]
+) -> Optional[Dict[str, Any]]:
+    """
+    Flattens a bioguide profile into a Legislator row, None for members that were
+    neither a Senator nor a Representative. Values the profile does not have are None.
+    """
+    bioguide_id = profile.get('usCongressBioId')
+    if not bioguide_id:
+        return None
+    position = _last_position(profile)
+    affiliation = position.get('congressAffiliation') or {}
+    # TODO: If we're modeling this for real, we'd want to have a table for the jobs
+    job = (position.get('job') or {}).get('name')
+    if job is not None and job not in ('Senator', 'Representative'):
+        return None
+    # Not everybody has a party
+    parties = affiliation.get('partyAffiliation') or []
+    party = parties[0]['party']['name'] if parties else None
+    state = (affiliation.get('represents') or {}).get('regionCode')
+
+    congress_id = []
+    for job_position in profile.get('jobPositions') or []:
+        congress = (job_position.get('congressAffiliation') or {}).get('congress')
+        if congress is None:
+            congress_id = []
+            break
+        congress_id.append(congress['congressNumber'])
+
+    image_url = None
+    image_source = None
+    assets = profile.get('asset') or []
+    if assets and assets[-1].get('contentUrl') and 'creditLine' in assets[-1]:
+        image_url = "https://bioguide.congress.gov/photo/" + assets[-1]['contentUrl'].split("/")[-1]
+        image_source = assets[-1]['creditLine']
+
+    socials = social_lookup.get(bioguide_id) or {}
+    row = {
+        'bioguide_id': bioguide_id,
+        'lis_id': lis_lookup.get(bioguide_id),
+        'first_name': profile.get('nickName') or profile.get('unaccentedGivenName') or profile.get('givenName'),
+        'last_name': profile.get('unaccentedFamilyName') or profile.get('familyName'),
+        'middle_name': profile.get('unaccentedMiddleName') or profile.get('middleName'),
+        'party': party,
+        'state': state,
+        'job': job,
+        'congress_id': congress_id,
+        'image_url': image_url,
+        'image_source': image_source,
+        'profile': profile.get('profileText'),
+        'twitter': socials.get('twitter'),
+        'facebook': socials.get('facebook'),
+        'youtube': socials.get('youtube'),
+        'instagram': socials.get('instagram'),
+    }
+    # Empty values never overwrite what is stored, see upsert_legislators
+    return {k: (v or None) for k, v in row.items()}
+
+
+def row_hash(row: Dict[str, Any]) -> str:
+    return hashlib.sha256(
+        json.dumps([row[x] for x in LEGISLATOR_COLUMNS]).encode()
+    ).hexdigest()
+
+
+def upsert_legislators(session, rows: List[Dict[str, Any]]):
+    """
+    A single INSERT ... ON CONFLICT (bioguide_id) DO UPDATE for the rows. A column
+    keeps its stored value where the profile has none, and rows whose source_hash
+    did not change are left alone.
+    """
+    if not rows:
+        return
+    query = insert(Legislator).values(rows)
+    table = Legislator.__table__
+    set_ = {
+        x: func.coalesce(getattr(query.excluded, x), table.c[x])
+        for x in LEGISLATOR_COLUMNS
+        if x != 'bioguide_id'
+    }
+    set_['source_hash'] = query.excluded.source_hash
+    session.execute(
+        query.on_conflict_do_update(
+            index_elements=[Legislator.bioguide_id],
+            set_=set_,
+            where=table.c.source_hash.is_distinct_from(query.excluded.source_hash),
+        )
+    )
 
 class BioGuideImporter:
     def __init__(
@@ -76,107 +216,39 @@ class BioGuideImporter:
         return member_social_lookup
 
     def download_to_database(self) -> None:
-        legislators = self.run_import()
+        """
+        Streams the profiles out of the zip and upserts them BIOGUIDE_BATCH at a time,
+        skipping members whose row hash matches the one stored on the last import
+        """
         lis_lookup = self.run_metadata()
         social_lookup = self.run_socials()
+        stored_hashes = dict(
+            self.session.query(Legislator.bioguide_id, Legislator.source_hash)
+        )
 
-        db_items = []
-        with self.session.begin():
-            for legislator in legislators:
-                try:
-                    # TODO: Make this look nicer, but not everybody has a party
-                    # TODO: If we're modeling this for real, we'd want to have a table for the jobs
-                    # TODO: What can I do to extract the image url?
-                    party = legislator.jobPositions[-1].congressAffiliation.partyAffiliation[0].party.name
-                except:
-                    party = None
-
-                try:
-                    state = legislator.jobPositions[-1].congressAffiliation.represents.regionCode
-                except:
-                    state = None
-
-                try:
-                    job = legislator.jobPositions[-1].job.name
-                except:
-                    job = None
-
-                if job is not None:
-                    if job != 'Senator' and job != 'Representative':
-                        continue
-
-                try:
-                    congress_id = []
-                    for jobPosition in legislator.jobPositions:
-                        congress_id.append(jobPosition.congressAffiliation.congress.congressNumber)
-                except:
-                    congress_id = []
-
-                try:
-                    image_url = "https://bioguide.congress.gov/photo/"
-                    image_url += legislator.asset[-1]['contentUrl'].split("/")[-1]
-                    image_source = legislator.asset[-1]['creditLine']
-                except:
-                    image_url = None
-                    image_source = None
-
-                try:
-                    socials = social_lookup[ legislator.usCongressBioId]
-
-                    if socials is not None:
-                        twitter = socials.get('twitter', None)
-                        facebook = socials.get('facebook', None)
-                        youtube = socials.get('youtube', None)
-                        instagram = socials.get('instagram', None)
-                except:
-                    twitter = None
-                    facebook = None
-                    youtube = None
-                    instagram = None
-
-                record_data = {}
-
-                if lis_lookup.get(legislator.usCongressBioId, None):
-                    record_data['lis_id'] = lis_lookup.get(legislator.usCongressBioId, None)
-                if legislator.usCongressBioId:
-                    record_data['bioguide_id'] = legislator.usCongressBioId
-                if legislator.nickName or legislator.unaccentedGivenName or legislator.givenName:
-                    record_data['first_name'] = legislator.nickName or legislator.unaccentedGivenName or legislator.givenName
-                if legislator.unaccentedFamilyName or legislator.familyName:
-                    record_data['last_name'] = legislator.unaccentedFamilyName or legislator.familyName
-                if legislator.unaccentedMiddleName or legislator.middleName:
-                    record_data['middle_name'] = legislator.unaccentedMiddleName or legislator.middleName
-                if party:
-                    record_data['party'] = party
-                if state:
-                    record_data['state'] = state
-                if job:
-                    record_data['job'] = job
-                if congress_id:
-                    record_data['congress_id'] = congress_id
-                if image_url:
-                    record_data['image_url'] = image_url
-                if image_source:
-                    record_data['image_source'] = image_source
-                if legislator.profileText:
-                    record_data['profile'] = legislator.profileText
-                if twitter:
-                    record_data['twitter'] = twitter
-                if facebook:
-                    record_data['facebook'] = facebook
-                if youtube:
-                    record_data['youtube'] = youtube
-                if instagram:
-                    record_data['instagram'] = instagram
-
-                existing_record = self.session.query(Legislator).filter(Legislator.bioguide_id == legislator.usCongressBioId).first()
-                if existing_record is None:
-                    new_legislator = Legislator(**record_data)
-                    db_items.append(new_legislator)
-                else:
-                    for key, value in record_data.items():
-                        setattr(existing_record, key, value)
-
-            self.session.add_all(db_items)
-            self.session.commit()
-        logging.debug("Finished adding legislators to database")
\ No newline at end of file
+        pending = {}
+        written = 0
+        skipped = 0
+        with zipfile.ZipFile('./.sources/BioguideProfiles.zip', 'r') as z:
+            for profile in iter_profiles(z):
+                row = legislator_row(profile, lis_lookup, social_lookup)
+                if row is None:
+                    continue
+                row['source_hash'] = row_hash(row)
+                if stored_hashes.get(row['bioguide_id']) == row['source_hash']:
+                    skipped += 1
+                    continue
+                pending[row['bioguide_id']] = row
+                if len(pending) >= BIOGUIDE_BATCH:
+                    upsert_legislators(self.session, list(pending.values()))
+                    written += len(pending)
+                    pending = {}
+        upsert_legislators(self.session, list(pending.values()))
+        written += len(pending)
+        self.session.commit()
+        if written:
+            bump_cache_version(self.session)
+        logging.debug(
+            "Finished adding legislators to database",
+            extra={"written": written, "skipped": skipped},
+        )
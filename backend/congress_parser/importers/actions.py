@@ -1,13 +1,33 @@
 import os
 import time
-from typing import Dict, List
-from congress_db.models import LegislationActionParse, LegislationVersion
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple, TypedDict
+from congress_db.models import LegislationActionParse, LegislationVersion, Version
 from joblib import Parallel, delayed
 from sqlalchemy import func
 from congress_parser.actions.parser import parse_bill_for_actions
 from congress_db.session import Session, init_session
+from congress_parser.utils.cache_version import bump_cache_version
 
 THREADS = int(os.environ.get("PARSE_THREADS", -4))
+# How many versions a worker takes at a time, chunks never mix base versions
+CHUNK_SIZE = int(os.environ.get("PARSE_ACTIONS_CHUNK", 25))
+# Versions that finished are appended here, so a crashed run resumes after them
+CHECKPOINT_PATH = os.environ.get(
+    "PARSE_ACTIONS_CHECKPOINT", "action_parse_checkpoint.txt"
+)
+
+
+class ChunkStats(TypedDict):
+    pid: int
+    base_id: int
+    versions: int
+    failed: int
+    clauses: int
+    diffs: int
+    reused: int
+    flushes: int
+    seconds: float
 
 
 def get_legislation_versions() -> List[LegislationVersion]:
@@ -39,29 +59,161 @@ def check_for_action_parses(legislation_version_id: List[int]) -> Dict[int, int]
     return {x[0]: x[1] for x in results}
 
 
+def read_checkpoint(path: str = CHECKPOINT_PATH) -> Set[int]:
+    """
+    Returns the legislation_version_ids recorded as done, this also covers versions
+    that had no actions in them and so have no action parses to find
+    """
+    if not os.path.exists(path):
+        return set()
+    with open(path) as file:
+        return {int(x) for x in file.read().split() if x.isdigit()}
+
+
+def write_checkpoint(legislation_version_id: int, path: str = CHECKPOINT_PATH):
+    # One short line per append, so concurrent workers do not interleave
+    with open(path, "a") as file:
+        file.write(f"{legislation_version_id}\n")
+
+
+def get_pending_versions() -> List[Tuple[int, int]]:
+    """
+    Returns (legislation_version_id, base_id) for every version that has neither
+    action parses nor a checkpoint entry
+    """
+    session = Session()
+    results = (
+        session.query(LegislationVersion.legislation_version_id, Version.base_id)
+        .join(Version, Version.version_id == LegislationVersion.version_id)
+        .all()
+    )
+    session.close()
+    action_parse_counts = check_for_action_parses([x[0] for x in results])
+    done = read_checkpoint()
+    return [
+        (x[0], x[1])
+        for x in results
+        if action_parse_counts.get(x[0], 0) == 0 and x[0] not in done
+    ]
+
+
+def plan_chunks(
+    pending: Iterable[Tuple[int, Optional[int]]], chunk_size: int = CHUNK_SIZE
+) -> List[Tuple[int, List[int]]]:
+    """
+    Groups the pending versions by base USC version and splits each group into chunks,
+    so that a worker keeps applying against the same snapshot. The largest groups go
+    first, and within a chunk the versions stay in id order.
+    """
+    by_base: Dict[Optional[int], List[int]] = defaultdict(list)
+    for legislation_version_id, base_id in pending:
+        by_base[base_id].append(legislation_version_id)
+    chunks = []
+    for base_id, version_ids in sorted(by_base.items(), key=lambda x: -len(x[1])):
+        version_ids.sort()
+        for i in range(0, len(version_ids), chunk_size):
+            chunks.append((base_id, version_ids[i : i + chunk_size]))
+    return chunks
+
+
+def parse_version_chunk(base_id: int, legislation_version_ids: List[int]) -> ChunkStats:
+    """
+    Worker entry point, only ids cross the process boundary. Each version is loaded,
+    parsed, and checkpointed on its own so a crash loses at most the version in flight.
+    """
+    stats: ChunkStats = {
+        "pid": os.getpid(),
+        "base_id": base_id,
+        "versions": 0,
+        "failed": 0,
+        "clauses": 0,
+        "diffs": 0,
+        "reused": 0,
+        "flushes": 0,
+        "seconds": 0.0,
+    }
+    session = Session()
+    start = time.perf_counter()
+    for legislation_version_id in legislation_version_ids:
+        legislation_version = session.get(LegislationVersion, legislation_version_id)
+        if legislation_version is None:
+            continue
+        session.expunge(legislation_version)
+        try:
+            result = parse_bill_for_actions(legislation_version)
+        except Exception as e:
+            print(f"Failed to parse actions for {legislation_version_id}: {e}")
+            stats["failed"] += 1
+            continue
+        write_checkpoint(legislation_version_id)
+        stats["versions"] += 1
+        for key in ["clauses", "diffs", "reused", "flushes"]:
+            stats[key] += result.get(key, 0)
+    if stats["versions"]:
+        # The parsed actions show up in the API's cached /text and /diffs
+        bump_cache_version(session)
+    session.close()
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+
+def summarize(chunk_stats: List[ChunkStats]) -> Dict[int, ChunkStats]:
+    """
+    Totals the chunk results per worker process
+    """
+    per_worker: Dict[int, ChunkStats] = {}
+    for stats in chunk_stats:
+        total = per_worker.setdefault(
+            stats["pid"],
+            {
+                "pid": stats["pid"],
+                "base_id": stats["base_id"],
+                "versions": 0,
+                "failed": 0,
+                "clauses": 0,
+                "diffs": 0,
+                "reused": 0,
+                "flushes": 0,
+                "seconds": 0.0,
+            },
+        )
+        for key in [
+            "versions",
+            "failed",
+            "clauses",
+            "diffs",
+            "reused",
+            "flushes",
+            "seconds",
+        ]:
+            total[key] += stats[key]
+    return per_worker
+
+
+def print_summary(per_worker: Dict[int, ChunkStats]):
+    print(
+        f"{'worker':>8} {'versions':>9} {'failed':>7} {'clauses/s':>10} "
+        f"{'diffs/s':>9} {'reused':>8} {'flushes':>8}"
+    )
+    for pid, stats in sorted(per_worker.items()):
+        seconds = stats["seconds"] or 1
+        print(
+            f"{pid:>8} {stats['versions']:>9} {stats['failed']:>7} "
+            f"{stats['clauses'] / seconds:>10.1f} {stats['diffs'] / seconds:>9.1f} "
+            f"{stats['reused']:>8} {stats['flushes']:>8}"
+        )
+
+
 if __name__ == "__main__":
     """
     Identify which bills need to have they actions parsed
     then parse them
     """
-    all_legislation_versions = get_legislation_versions()
-    action_parse_counts = check_for_action_parses(
-        (x.legislation_version_id for x in all_legislation_versions)
+    pending = get_pending_versions()
+    chunks = plan_chunks(pending)
+    print(f"Found {len(pending)} versions to parse in {len(chunks)} chunks")
+    results = Parallel(n_jobs=THREADS, backend="loky", verbose=5)(
+        delayed(parse_version_chunk)(base_id, version_ids)
+        for base_id, version_ids in chunks
     )
-    valid_versions = []
-    for legis_vers in all_legislation_versions:
-        if legis_vers.legislation_version_id not in action_parse_counts:
-            valid_versions.append(legis_vers)
-        else:
-            if action_parse_counts[legis_vers.legislation_version_id] == 0:
-                valid_versions.append(legis_vers)
-    print(f"Found {len(valid_versions)} versions to parse")
-    session = Session()
-    session.commit()
-    time.sleep(5)
-    Parallel(n_jobs=THREADS, verbose=5)(delayed(parse_bill_for_actions)(x) for x in valid_versions)
-    # for version in valid_versions:
-    #     try:
-    #         parse_bill_for_actions(version)
-    #     except:
-    #         pass
+    print_summary(summarize(results))
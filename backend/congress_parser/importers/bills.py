@@ -20,12 +20,14 @@ import json
 import zipfile
 from congress_parser.appropriations.parser import parse_bill_for_appropriations
 from congress_db.models import LegislationVersion
-import requests
 import argparse
 from datetime import datetime
 from congress_parser.run_through import parse_archives, ensure_congress
+from congress_parser.utils.download import fetch, mark_parsed
 
 webhook_url = os.environ.get("DISCORD_WEBHOOK", None)
+# Do not parse archives the server says have not changed since the last run
+SKIP_UNCHANGED = os.environ.get("PARSE_SKIP_UNCHANGED", "1") == "1"
 
 parser = argparse.ArgumentParser(description="Reprocess")
 parser.add_argument("--bill", type=str, help="Which bill you want to reprocess")
@@ -34,15 +36,14 @@ PATH_TEMPLATE = "https://www.govinfo.gov/bulkdata/BILLS/{congress}/{session}/{ch
 
 
 def download_path(url: str, *, dir_name: str = "bills"):
-    os.makedirs(dir_name, exist_ok=True)
-    output_name = url.split("/")[-1]
-    if os.path.exists(f"{dir_name}/{output_name}"):
-        return f"{dir_name}/{output_name}"
-    res = requests.head(url)
-    if res.status_code == 404:
+    """
+    Local path of the archive at url, downloaded or revalidated through the cache
+    in utils/download. None if the server does not have it.
+    """
+    download = fetch(url, dir_name)
+    if download is None:
         return None
-    os.system(f"wget {url} --output-document {dir_name}/{output_name}")
-    return f"{dir_name}/{output_name}"
+    return download["path"]
 
 
 def calculate_congress_from_year() -> int:
@@ -81,15 +82,19 @@ if __name__ == "__main__":
         for chamber in ["hr", "s"]:
             print("=" * 5)
             print(f"{congress}: {session} - {chamber}")
-            zip_file_path = download_path(
+            download = fetch(
                 PATH_TEMPLATE.format(
                     congress=congress, session=session, chamber=chamber
-                )
+                ),
+                "bills",
             )
-            if zip_file_path is None:
+            if download is None:
                 print("Could not find archive")
                 continue
-            zip_paths.append(zip_file_path)
+            if SKIP_UNCHANGED and bill is None and not download["changed"]:
+                print(f"{download['path']} unchanged, skipping")
+                continue
+            zip_paths.append(download["path"])
 
     if bill != None:
         legis_objs = parse_archives(
@@ -99,6 +104,9 @@ if __name__ == "__main__":
         )
     else:
         legis_objs = parse_archives(zip_paths)
+        # Only now are these archives skipped until govinfo changes them
+        for zip_path in zip_paths:
+            mark_parsed(zip_path)
 
     send_message(
         f"Added {len(legis_objs)} new bills today"
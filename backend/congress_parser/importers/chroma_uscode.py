@@ -83,14 +83,36 @@ async def get_latest_version_id(database) -> int:
     return row[0]
 
 
+# The release's own content rows, and those of the sections a delta import carried
+# forward from an earlier release. A carried section's own row still points at the
+# chapter of the release that wrote it, so its chapter comes from usc_section_version.
+RELEASE_CONTENT = """
+    WITH release_content AS (
+        SELECT uc.usc_ident, uc.heading, uc.content_str, uc.number,
+               uc.section_display, us_sec.usc_chapter_id
+        FROM usc_content uc
+        JOIN usc_section us_sec ON us_sec.usc_section_id = uc.usc_section_id
+        WHERE uc.version_id = :vid
+        UNION ALL
+        SELECT uc.usc_ident, uc.heading, uc.content_str, uc.number,
+               uc.section_display, sv.usc_chapter_id
+        FROM usc_section_version sv
+        JOIN usc_content uc ON uc.usc_section_id = sv.usc_section_id
+                           AND uc.version_id     = sv.source_version_id
+        WHERE sv.version_id = :vid
+          AND sv.source_version_id != sv.version_id
+    )
+"""
+
+
 async def count_sections(database, version_id: int) -> int:
     """Count indexable top-level USC sections for this version."""
     row = await database.fetch_one(
-        """
+        RELEASE_CONTENT
+        + """
         SELECT COUNT(*)
-        FROM usc_content
-        WHERE version_id = :vid
-          AND usc_ident ~ '^/us/usc/t[0-9]+/s[^/]+$'
+        FROM release_content
+        WHERE usc_ident ~ '^/us/usc/t[0-9]+/s[^/]+$'
           AND heading IS NOT NULL
           AND heading != ''
         """,
@@ -109,7 +131,8 @@ async def fetch_sections_batch(
     the IDs stored in ChromaDB and resolved back to Postgres in search_chroma().
     """
     return await database.fetch_all(
-        """
+        RELEASE_CONTENT
+        + """
         SELECT
             uc.usc_ident,
             uc.heading,
@@ -118,11 +141,9 @@ async def fetch_sections_batch(
             uc.section_display,
             ch.long_title  AS chapter_title,
             ch.short_title AS chapter_short_title
-        FROM usc_content uc
-        JOIN usc_section  us_sec ON us_sec.usc_section_id  = uc.usc_section_id
-        JOIN usc_chapter  ch     ON ch.usc_chapter_id      = us_sec.usc_chapter_id
-        WHERE uc.version_id = :vid
-          AND uc.usc_ident ~ '^/us/usc/t[0-9]+/s[^/]+$'
+        FROM release_content uc
+        JOIN usc_chapter  ch ON ch.usc_chapter_id = uc.usc_chapter_id
+        WHERE uc.usc_ident ~ '^/us/usc/t[0-9]+/s[^/]+$'
           AND uc.heading IS NOT NULL
           AND uc.heading != ''
         ORDER BY uc.usc_ident
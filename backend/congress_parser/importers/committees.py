@@ -1,5 +1,6 @@
 from congress_db.models import LegislationChamber, LegislationCommittee
 from congress_db.session import Session
+from congress_parser.utils.cache_version import bump_cache_version
 import yaml
 import requests
 
@@ -147,6 +148,7 @@ if __name__ == "__main__":
         yaml_str = fetch_committees_yaml()
         insert_committees_from_yaml(session, yaml_str, 1)
         session.commit()
+        bump_cache_version(session)
         print("Successfully imported committees from GitHub repository")
     except requests.RequestException as e:
         print(f"Error fetching committees data: {e}")
@@ -0,0 +1,190 @@
+"""
+Release-to-release delta import for US Code release points.
+
+A release point usually changes a handful of sections, yet every title used to be
+imported in full, giving each release its own copy of every usc_section/usc_content row.
+With the delta import, every leaf section (/us/usc/tXX/sYYY) is hashed over its subtree
+and compared with the hash recorded for the same usc_ident in the previous release:
+
+- changed or new sections are written as before, under the new release's version_id
+- unchanged sections are not written, the usc_section_version row of the new release
+  points at the section owned by the release it was last written in
+
+Chapters and the organizational sections above the leaf sections (chapter, subchapter,
+part, ...) are few and are always written for the new release.
+
+Readers that select USC rows for a release go through in_release, which accepts the
+release's own rows and the rows it carried forward. A carried row keeps the chapter and
+parent of the release that wrote it, the usc_section_version row has the chapter and
+parent the section has in the new release.
+"""
+
+import hashlib
+import re
+from datetime import date
+from typing import Dict, List, Optional, TypedDict
+
+from sqlalchemy import and_, or_, select, tuple_
+from unidecode import unidecode
+
+from congress_db.models import USCRelease, USCSectionVersion
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class PreviousSection(TypedDict):
+    usc_section_id: int
+    source_version_id: int
+    section_hash: str
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """
+    Formatting-only changes (line breaks, indentation, unicode dashes) do not make
+    a section count as changed
+    """
+    return _WHITESPACE.sub(" ", unidecode(text or "")).strip()
+
+
+def section_hash(section) -> str:
+    """
+    sha256 over the tag, guid, identifier and normalized text of every element in the
+    section's subtree, in document order
+    """
+    digest = hashlib.sha256()
+    for node in section.iter():
+        tag = node.tag.split("}")[-1] if isinstance(node.tag, str) else ""
+        digest.update(
+            "\x1f".join(
+                [
+                    tag,
+                    node.attrib.get("id", "") if tag else "",
+                    node.attrib.get("identifier", "") if tag else "",
+                    normalize_text(node.text),
+                    normalize_text(node.tail) if node is not section else "",
+                ]
+            ).encode()
+        )
+        digest.update(b"\x1e")
+    return digest.hexdigest()
+
+
+def in_release(model, version_id):
+    """
+    Filter for USCSection/USCContent rows that are in effect for a release, its own
+    rows plus the rows of the sections it carried forward. A row of a carried section is
+    only matched together with the release that owns it, so rows the action engine adds
+    for bills under the same usc_section_id are not picked up.
+    """
+    carried = select(
+        USCSectionVersion.usc_section_id, USCSectionVersion.source_version_id
+    ).where(USCSectionVersion.version_id == version_id)
+    return or_(
+        model.version_id == version_id,
+        tuple_(model.usc_section_id, model.version_id).in_(carried),
+    )
+
+
+def previous_release_version(session, release: dict) -> Optional[int]:
+    """
+    The version_id of the latest release before this one that recorded section hashes
+    """
+    current = session.get(USCRelease, release["usc_release_id"])
+    effective_date = (current.effective_date if current else None) or date.max
+    result = session.execute(
+        select(USCRelease.version_id)
+        .where(
+            USCRelease.usc_release_id != release["usc_release_id"],
+            or_(
+                USCRelease.effective_date < effective_date,
+                and_(
+                    USCRelease.effective_date == effective_date,
+                    USCRelease.usc_release_id < release["usc_release_id"],
+                ),
+            ),
+            select(USCSectionVersion.usc_section_version_id)
+            .where(USCSectionVersion.version_id == USCRelease.version_id)
+            .exists(),
+        )
+        .order_by(USCRelease.effective_date.desc(), USCRelease.usc_release_id.desc())
+        .limit(1)
+    ).first()
+    return result[0] if result else None
+
+
+def load_previous_sections(
+    session, version_id: int, title_ident: str
+) -> Dict[str, Optional[PreviousSection]]:
+    """
+    The leaf sections of a title in the given release, keyed on usc_ident. Identifiers
+    that appear more than once map to None and are always written again.
+    """
+    rows = session.execute(
+        select(
+            USCSectionVersion.usc_ident,
+            USCSectionVersion.usc_section_id,
+            USCSectionVersion.source_version_id,
+            USCSectionVersion.section_hash,
+        ).where(
+            USCSectionVersion.version_id == version_id,
+            USCSectionVersion.usc_ident.like(f"{title_ident}/%"),
+        )
+    ).all()
+    previous: Dict[str, Optional[PreviousSection]] = {}
+    for usc_ident, usc_section_id, source_version_id, digest in rows:
+        if usc_ident in previous:
+            previous[usc_ident] = None
+            continue
+        previous[usc_ident] = {
+            "usc_section_id": usc_section_id,
+            "source_version_id": source_version_id,
+            "section_hash": digest,
+        }
+    return previous
+
+
+def carried_section(
+    previous: Dict[str, Optional[PreviousSection]],
+    seen: Dict[str, int],
+    usc_ident: str,
+    digest: str,
+) -> Optional[PreviousSection]:
+    """
+    The previous release's section to carry forward, or None if it has to be written.
+    seen counts the identifiers met so far in the new release, a repeated identifier is
+    written since it cannot be told apart from its twin.
+    """
+    seen[usc_ident] = seen.get(usc_ident, 0) + 1
+    if seen[usc_ident] > 1:
+        return None
+    match = previous.get(usc_ident)
+    if match is None or match["section_hash"] != digest:
+        return None
+    return match
+
+
+def section_version_row(
+    version_id: int,
+    usc_section_id: int,
+    source_version_id: int,
+    usc_ident: str,
+    digest: str,
+    usc_chapter_id: Optional[int] = None,
+    parent_id: Optional[int] = None,
+    sort_order: Optional[int] = None,
+) -> dict:
+    return {
+        "version_id": version_id,
+        "usc_section_id": usc_section_id,
+        "source_version_id": source_version_id,
+        "usc_ident": usc_ident,
+        "section_hash": digest,
+        "usc_chapter_id": usc_chapter_id,
+        "parent_id": parent_id,
+        "sort_order": sort_order,
+    }
+
+
+def write_section_versions(session, rows: List[dict]):
+    if rows:
+        session.execute(USCSectionVersion.__table__.insert(), rows)
@@ -0,0 +1,95 @@
+"""
+Scheduling for the per-title import of a US Code release point.
+
+Workers are handed the path of the release ZIP and a member name, and read the title
+themselves, so no title bytes are pickled across the process boundary. Titles are
+dispatched largest first (by uncompressed size from the ZIP central directory), which
+keeps one of the big titles (26, 42, 10, ...) from starting last and running alone.
+
+Parsing and flattening a title is CPU bound and runs on every worker, while the write
+is bounded separately by a semaphore shared through a multiprocessing Manager, so the
+number of concurrent COPYs into Postgres does not grow with PARSE_THREADS.
+"""
+
+import os
+import zipfile
+from typing import List, Optional, TypedDict
+
+# How many workers may write a title to the database at the same time
+WRITERS = int(os.environ.get("PARSE_USC_WRITERS", 4))
+
+
+class TitleJob(TypedDict):
+    member: str
+    chapter_number: str
+    file_size: int
+
+
+class TitleTiming(TypedDict):
+    member: str
+    chapter_number: str
+    file_size: int
+    pid: int
+    # Reading the member, parsing and flattening the title
+    parse_seconds: float
+    # Waiting for a writer slot
+    wait_seconds: float
+    # Holding the writer slot, up to and including the commit
+    write_seconds: float
+    written: int
+    carried: int
+
+
+def title_number(member: str) -> str:
+    """
+    "usc42.xml" -> "42", "usc05A.xml" -> "05A"
+    """
+    return os.path.basename(member).split(".")[0].replace("usc", "")
+
+
+def plan_titles(infos: List[zipfile.ZipInfo]) -> List[TitleJob]:
+    """
+    The title members of a release ZIP, largest first
+    """
+    jobs: List[TitleJob] = [
+        {
+            "member": x.filename,
+            "chapter_number": title_number(x.filename),
+            "file_size": x.file_size,
+        }
+        for x in infos
+        if x.filename.lower().endswith(".xml") and not x.is_dir()
+    ]
+    jobs.sort(key=lambda x: (-x["file_size"], x["member"]))
+    return jobs
+
+
+def print_timings(timings: List[Optional[TitleTiming]], wall_seconds: float):
+    """
+    Per title timings, slowest first, and how much of the wall time the slowest title
+    accounts for
+    """
+    done = [x for x in timings if x is not None]
+    done.sort(
+        key=lambda x: -(x["parse_seconds"] + x["wait_seconds"] + x["write_seconds"])
+    )
+    print(
+        f"{'title':>6} {'MB':>8} {'pid':>8} {'parse s':>8} {'wait s':>8} "
+        f"{'write s':>8} {'written':>8} {'carried':>8}"
+    )
+    for timing in done:
+        print(
+            f"{timing['chapter_number']:>6} {timing['file_size'] / 1e6:>8.1f} "
+            f"{timing['pid']:>8} {timing['parse_seconds']:>8.1f} "
+            f"{timing['wait_seconds']:>8.1f} {timing['write_seconds']:>8.1f} "
+            f"{timing['written']:>8} {timing['carried']:>8}"
+        )
+    if done:
+        slowest = done[0]
+        total = (
+            slowest["parse_seconds"] + slowest["wait_seconds"] + slowest["write_seconds"]
+        )
+        print(
+            f"{len(done)} titles in {wall_seconds:.1f}s, "
+            f"slowest title {slowest['chapter_number']} took {total:.1f}s"
+        )
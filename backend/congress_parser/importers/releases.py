@@ -36,24 +36,69 @@ Pipeline:
 """
 
 import argparse
-import html
-import string
+import re
+import time
 import os
-from unidecode import unidecode  # GPLV2
+from lxml import etree, html
 import zipfile
+from contextlib import nullcontext
 from datetime import datetime
+from multiprocessing import Manager
+from typing import Optional
 from congress_parser.importers.bills import download_path
+from congress_parser.importers.release_delta import (
+    carried_section,
+    load_previous_sections,
+    previous_release_version,
+    section_hash,
+    section_version_row,
+    write_section_versions,
+)
+from congress_parser.importers.release_scheduler import (
+    WRITERS,
+    TitleJob,
+    TitleTiming,
+    plan_titles,
+    print_timings,
+)
+from congress_parser.importers.usc_title import (
+    ORGANIZATIONAL_TAGS,
+    TitleStats,
+    backfill_sort_order,
+    content_fields,
+    flatten_title,
+    is_leaf_section,
+    local_tag,
+    section_fields,
+    section_sort_orders,
+    stream_title,
+    write_title_chunks,
+    write_title_records,
+)
 from joblib import Parallel, delayed
 import requests
 from sqlalchemy import func
-from congress_db.session import import_title, get_number, Session
-from congress_db.models import USCRelease, Version
+from congress_db.session import Session
+from congress_parser.utils.cache_version import bump_cache_version
+from congress_db.models import (
+    USCChapter,
+    USCContent,
+    USCRelease,
+    USCSection,
+    USCSectionVersion,
+    Version,
+)
 
 THREADS = int(os.environ.get("PARSE_THREADS", -1))
+# Only write the sections that changed since the previous release point
+DELTA_IMPORT = os.environ.get("PARSE_USC_DELTA", "1") == "1"
+# Store each title with reserved ids and COPY instead of a flush per row
+BULK_TITLE = os.environ.get("PARSE_BULK_USC", "1") == "1"
+# Read titles with iterparse, freeing each section once flattened (bulk mode only)
+STREAM_TITLE = os.environ.get("PARSE_STREAM_USC", "1") == "1"
 DOWNLOAD_BASE = "https://uscode.house.gov/download/{}"
 RELEASE_POINTS = "https://uscode.house.gov/download/priorreleasepoints.htm"
 
-ribber = string.ascii_letters + string.digits
 
 def main():
     parser = argparse.ArgumentParser(description="Process release points.")
@@ -62,9 +107,16 @@ def main():
         type=str,
         help="URL of the zip file to process a single release point",
     )
+    parser.add_argument(
+        "--backfill-sort-order",
+        action="store_true",
+        help="Compute sort_order for titles and delta releases imported without it",
+    )
     args = parser.parse_args()
 
-    if args.release_point:
+    if args.backfill_sort_order:
+        backfill_all_sort_orders()
+    elif args.release_point:
         process_single_release_point(args.release_point)
     else:
         process_all_release_points()
@@ -89,133 +141,51 @@ def open_usc(file_str):
     return lookup, ids
 
 
-def unidecode_str(input_str: str) -> str:
-    return unidecode(input_str or "").replace("--", "-")
-
-def get_number(ident: str) -> float:
+def write_title_orm(
+    session,
+    elements,
+    chapter_number,
+    usc_chapter_id,
+    version_id,
+    previous=None,
+) -> TitleStats:
     """
-    Converts a usc_ident into a number that is supposed to impart some implicit order
+    Stores a title one row at a time, flushing after every USCSection and USCContent
+    so that children can see their parent's primary key. This is the fallback for
+    write_title_bulk (PARSE_BULK_USC=0) and stores the same rows. Does not commit.
 
     Args:
-        ident (str): The usc ident
-
-    Returns:
-        float: The supposed order
-    """
-    ident = unidecode_str(ident)
-    if "..." in ident:
-        ident = ident.split("...")[0]
-    result = re.search(
-        r"^(\d*)([a-z]*)\s?(?:\-?t?o?(?:\.\.\.)?\.?)\s?(\d*)([a-z]*)$",
-        ident,
-        re.IGNORECASE,
-    )
-    grps = None
-    try:
-        grps = result.groups()
-        tot = float(grps[0])
-        subtot = 0
-        if grps[1] != "":
-            for i in grps[1]:
-                subtot += ribber.index(i) / len(ribber)
-        if grps[2] != "":
-            subtot += float(grps[2]) / 100
-        if grps[3] != "":
-            subtot += (ribber.index(grps[3]) / len(ribber)) / 1000
-        return tot
-    except Exception as e:
-        print(e)
-        print("failed on ", ident, grps)
-        return 0
-
-
-def import_title(chapter_file, chapter_number, version_string, release: USCRelease):
-    """
-    Parses a single US Code title XML file and stores its hierarchical content.
-
-    The USLM XML uses a nested structure where organizational elements (chapter,
-    subchapter, part, etc.) contain sections, which in turn contain subsections,
-    paragraphs, and subparagraphs. This function:
-
-    1. Creates a USCChapter record for the title
-    2. Iterates over all elements with 'identifier' attributes
-    3. Creates USCSection records for organizational levels (chapter, subchapter, etc.)
-    4. For leaf sections (identifier depth = 5, e.g. /us/usc/tXX/sYYY), recursively
-       creates USCContent records for all nested content
-
-    Args:
-        chapter_file: Raw bytes of the XML file
+        session: Active session
+        elements: The identified elements of the title, in document order
         chapter_number: Title number string (e.g. "42")
-        version_string: Version label (unused, kept for compatibility)
-        release: Dict with usc_release_id and version_id for DB foreign keys
+        usc_chapter_id: The USCChapter the sections belong to
+        version_id: Version of the release being imported
+        previous: Leaf sections of the previous release, see load_previous_sections
     """
-    session = Session()
-    release_id = release["usc_release_id"]
-
-    version_id = release["version_id"]
+    previous = previous or {}
+    seen = {}
+    section_versions = []
+    carried = 0
+    # Every section in effect for the release, written or carried, in document
+    # order for section_sort_orders: (parent position, number, USCSection written,
+    # usc_section_version row)
+    ranked = []
+    position_by_id = {}
 
     def recursive_content(section_id, content_id, search_element, order):
         """
         Recursively stores section content (subsections, paragraphs, etc.)
         as USCContent records. Each USLM element with both 'id' and 'identifier'
-        attributes is a content node. Child layout mirrors bill XML:
-            [0] = <num> (display number)
-            [1] = <heading> (or <content>/<chapeau> if no heading)
-            [2] = <content>/<chapeau>/<notes> (body text, if heading present)
+        attributes is a content node.
         """
         if "id" in search_element.attrib and "identifier" in search_element.attrib:
-            enum = search_element[0]
-            heading = search_element[1]
-            content_str = None
-            if len(search_element) > 2:
-                content_elem = search_element[2]
-                if (
-                    "content" in content_elem.tag
-                    or "chapeau" in content_elem.tag
-                    or "notes" in content_elem.tag
-                ):
-                    content_str = resolve_citations(
-                        " ".join(content_elem.itertext()).strip().replace("\n", " "),
-                        chapter_number,
-                    )
-            if "heading" in heading.tag:
-                content = USCContent(
-                    content_type=search_element.tag,
-                    usc_guid=search_element.attrib["id"],
-                    usc_ident=unidecode_str(search_element.attrib["identifier"]),
-                    number=unidecode_str(enum.attrib["value"]),
-                    section_display=enum.text,
-                    usc_section_id=section_id,
-                    parent_id=content_id,
-                    content_str=unidecode_str(content_str),
-                    order_number=order,
-                    heading=unidecode_str(heading.text),
-                    version_id=version_id,
-                )
-            else:
-                content_elem = heading
-                if (
-                    "content" in content_elem.tag
-                    or "chapeau" in content_elem.tag
-                    or "notes" in content_elem.tag
-                ):
-                    content_str = resolve_citations(
-                        " ".join(content_elem.itertext()).strip().replace("\n", " "),
-                        chapter_number,
-                    )
-                content = USCContent(
-                    content_type=search_element.tag,
-                    usc_guid=search_element.attrib["id"],
-                    usc_ident=unidecode_str(search_element.attrib["identifier"]),
-                    number=enum.attrib["value"],
-                    section_display=enum.text,
-                    usc_section_id=section_id,
-                    parent_id=content_id,
-                    content_str=unidecode_str(content_str),
-                    order_number=order,
-                    heading=None,
-                    version_id=version_id,
-                )
+            content = USCContent(
+                usc_section_id=section_id,
+                parent_id=content_id,
+                order_number=order,
+                version_id=version_id,
+                **content_fields(search_element, chapter_number),
+            )
             session.add(content)
             session.flush()
             order = 0
@@ -224,42 +194,16 @@ def import_title(chapter_file, chapter_number, version_string, release: USCRelea
                     recursive_content(section_id, content.usc_content_id, elem, order)
                     order = order + 1
 
-    chapter_root, elements = open_usc(chapter_file)
-    for boi in chapter_root["root"].iter():
-        if "heading" in boi.tag:
-            title = boi.text
-            break
-    print(title)
-    existing = (
-        session.query(USCChapter)
-        .filter(USCChapter.version_id == version_id)
-        .filter(USCChapter.short_title == chapter_number)
-        .first()
-    )
-    if existing:
-        print(f"Chapter {chapter_number} alread imported for {version_id}")
-        return None
-    chap = USCChapter(
-        short_title=chapter_number,
-        long_title=title,
-        document="usc",
-        version_id=version_id,
-        usc_release_id=release_id,
-    )
-    session.add(chap)
-    session.flush()
-    sections = []
     parents = {}
     # Track elements whose children should be handled by recursive_content
     # rather than top-level iteration. None is pre-seeded so root-level
     # elements pass through.
     is_handled = {None: True}
     current_parent = None
-    current_depth = 0
     for elem in elements:
         # Elements use namespaced tags like "{http://xml.house.gov/...}section"
         # Strip the namespace to get the plain tag name
-        split_tag = elem.tag.split("}")[-1]
+        split_tag = local_tag(elem)
         if split_tag in ["uscDoc", "title"]:
             # Top-level container elements — skip, we process their children
             continue
@@ -271,99 +215,292 @@ def import_title(chapter_file, chapter_number, version_string, release: USCRelea
 
         # Organizational levels per the USLM schema — these become USCSection
         # records that serve as containers in the hierarchy above individual sections
-        if split_tag in [
-            "chapter",
-            "subchapter",
-            "part",
-            "subpart",
-            "division",
-            "subdivision",
-            "article",
-            "subarticle",
-        ]:
-            if parent_identifier in parents:
-                current_depth = parents.get(parent_identifier).get("depth", 0) + 1
-            else:
-                current_depth = 0
-            enum = elem[0]
+        if split_tag in ORGANIZATIONAL_TAGS:
             par_obj = USCSection(
-                usc_guid=elem.attrib["id"],
-                usc_ident=identifier,
-                number=unidecode_str(enum.attrib["value"]),
-                section_display=unidecode_str(enum.text),
-                heading=unidecode_str(elem[1].text),
                 version_id=version_id,
-                usc_chapter_id=chap.usc_chapter_id,
-                content_type=split_tag,
+                usc_chapter_id=usc_chapter_id,
+                **section_fields(elem, split_tag),
             )
             if parents.get(parent_identifier) is not None:
-                par_obj.parent_id = parents.get(parent_identifier)[
-                    "section"
-                ].usc_section_id
-
-            parents[identifier] = {
-                "elem": elem,
-                "depth": current_depth,
-                "section": par_obj,
-            }
+                par_obj.parent_id = parents.get(parent_identifier).usc_section_id
+            parents[identifier] = par_obj
             session.add(par_obj)
             session.flush()
+            position_by_id[par_obj.usc_section_id] = len(ranked)
+            ranked.append(
+                (position_by_id.get(par_obj.parent_id), par_obj.number, par_obj, None)
+            )
             current_parent = identifier
-            current_depth += 1
-        else:
-            # Check if this is a leaf section (depth 5 = /us/usc/tXX/sYYY).
-            # These are the actual statute sections that contain subsections/text.
-            # Identifier starts with "s" but not "st" (to exclude subtitles).
-            chunks = identifier.split("/")
-            if len(chunks) == 5:
-                if chunks[-1][0] == "s" and chunks[-1][1] != "t":
-                    is_handled[identifier] = True
-                    enum = elem[0]
-                    sect_obj = USCSection(
-                        usc_guid=elem.attrib["id"],
-                        usc_ident=identifier,
-                        number=unidecode_str(enum.attrib["value"]),
-                        section_display=unidecode_str(enum.text),
-                        heading=unidecode_str(elem[1].text),
-                        version_id=version_id,
-                        usc_chapter_id=chap.usc_chapter_id,
-                        parent_id=parents.get(current_parent)["section"].usc_section_id,
-                        content_type=split_tag,
+        elif is_leaf_section(identifier):
+            # The actual statute sections that contain subsections/text
+            is_handled[identifier] = True
+            digest = section_hash(elem)
+            parent_id = (
+                parents[current_parent].usc_section_id
+                if current_parent in parents
+                else None
+            )
+            match = carried_section(previous, seen, identifier, digest)
+            if match is not None:
+                row = section_version_row(
+                    version_id,
+                    match["usc_section_id"],
+                    match["source_version_id"],
+                    identifier,
+                    digest,
+                    usc_chapter_id,
+                    parent_id,
+                )
+                section_versions.append(row)
+                ranked.append(
+                    (
+                        position_by_id.get(parent_id),
+                        section_fields(elem, split_tag)["number"],
+                        None,
+                        row,
                     )
-                    session.add(sect_obj)
-                    session.flush()
-                    recursive_content(sect_obj.usc_section_id, None, elem, 0)
-    session.commit()
-
-def process_single_release_point(url, release=None):
-    zip_file_path = download_path(url)
-    with zipfile.ZipFile(zip_file_path) as zip_file:
-        if release is None:
-            session = Session()
-            new_version = Version(base_id=None)
-            session.add(new_version)
+                )
+                carried += 1
+                continue
+            sect_obj = USCSection(
+                version_id=version_id,
+                usc_chapter_id=usc_chapter_id,
+                parent_id=parent_id,
+                **section_fields(elem, split_tag),
+            )
+            session.add(sect_obj)
             session.flush()
-            release = USCRelease(
-                short_title=zip_file_path.split("/")[-1].split(".")[0],
-                effective_date=datetime.now(),
-                long_title="",
-                version_id=new_version.version_id,
+            recursive_content(sect_obj.usc_section_id, None, elem, 0)
+            row = section_version_row(
+                version_id,
+                sect_obj.usc_section_id,
+                version_id,
+                identifier,
+                digest,
+                usc_chapter_id,
+                parent_id,
             )
-            session.add(release)
-            session.commit()
-        files = zip_file.namelist()
-        files = sorted(
-            files, key=lambda x: get_number(x.split(".")[0].replace("usc", ""))
+            section_versions.append(row)
+            ranked.append((position_by_id.get(parent_id), sect_obj.number, sect_obj, row))
+    sort_orders = section_sort_orders([(x[0], x[1]) for x in ranked])
+    for (_, _, section, row), sort_order in zip(ranked, sort_orders):
+        if section is not None:
+            section.sort_order = sort_order
+        if row is not None:
+            row["sort_order"] = sort_order
+    write_section_versions(session, section_versions)
+    return {"written": len(section_versions) - carried, "carried": carried}
+
+
+def import_title(
+    chapter_file,
+    chapter_number,
+    version_string,
+    release: USCRelease,
+    session=None,
+    writer_slots=None,
+):
+    """
+    Parses a single US Code title XML file and stores its hierarchical content.
+
+    The USLM XML uses a nested structure where organizational elements (chapter,
+    subchapter, part, etc.) contain sections, which in turn contain subsections,
+    paragraphs, and subparagraphs. This function:
+
+    1. Creates a USCChapter record for the title
+    2. Iterates over all elements with 'identifier' attributes
+    3. Creates USCSection records for organizational levels (chapter, subchapter, etc.)
+    4. For leaf sections (identifier depth = 5, e.g. /us/usc/tXX/sYYY), creates
+       USCContent records for all nested content
+    5. Records a usc_section_version row with the subtree hash of every leaf section.
+       With PARSE_USC_DELTA, a leaf section whose hash matches the previous release is
+       not written again, its row points at the previous release's section instead
+
+    Steps 3-5 are done by write_title_bulk, or by write_title_orm with PARSE_BULK_USC=0.
+    In bulk mode the title is flattened before a writer slot is taken, so only the
+    database writes are bounded by writer_slots. With PARSE_STREAM_USC the bulk path
+    never builds the whole tree or holds all of its records: the title is written a
+    chunk at a time while it is read, taking a writer slot for each chunk, see
+    usc_title.write_title_chunks.
+
+    Args:
+        chapter_file: Raw bytes of the XML file, or a binary file object
+        chapter_number: Title number string (e.g. "42")
+        version_string: Version label (unused, kept for compatibility)
+        release: Dict with usc_release_id and version_id for DB foreign keys, and
+            previous_version_id of the release to carry unchanged sections from
+        session: Session to use, defaults to the scoped Session
+        writer_slots: Semaphore held while writing, see release_scheduler
+
+    Returns:
+        The written/carried counts and the parse/wait/write seconds, None if the title
+        was already imported
+    """
+    session = session or Session()
+    release_id = release["usc_release_id"]
+
+    version_id = release["version_id"]
+
+    start = time.perf_counter()
+    existing = (
+        session.query(USCChapter)
+        .filter(USCChapter.version_id == version_id)
+        .filter(USCChapter.short_title == chapter_number)
+        .first()
+    )
+    if existing:
+        print(f"Chapter {chapter_number} alread imported for {version_id}")
+        return None
+    previous_version_id = release.get("previous_version_id")
+
+    def load_previous(title_ident):
+        if DELTA_IMPORT and previous_version_id is not None:
+            return load_previous_sections(session, previous_version_id, title_ident)
+        return {}
+
+    def add_chapter():
+        chap = USCChapter(
+            short_title=chapter_number,
+            long_title=title,
+            document="usc",
+            version_id=version_id,
+            usc_release_id=release_id,
+        )
+        session.add(chap)
+        session.flush()
+        return chap
+
+    if BULK_TITLE and STREAM_TITLE:
+        # The first chunk has been read by now, and the title's heading with it
+        document = stream_title(chapter_file, chapter_number, load_previous)
+        title = document["long_title"]
+        print(title)
+        stats = write_title_chunks(
+            session,
+            document["chunks"],
+            add_chapter().usc_chapter_id,
+            version_id,
+            writer_slots,
+            commit=True,
+        )
+        wait_seconds = stats.pop("wait_seconds")
+        write_seconds = stats.pop("write_seconds")
+        # The title is read in between the chunk writes
+        parse_seconds = time.perf_counter() - start - wait_seconds - write_seconds
+    else:
+        records = None
+        previous = {}
+        if hasattr(chapter_file, "read"):
+            chapter_file = chapter_file.read()
+        chapter_root, elements = open_usc(chapter_file)
+        for boi in chapter_root["root"].iter():
+            if "heading" in boi.tag:
+                title = boi.text
+                break
+        title_ident = next(
+            (x.attrib["identifier"] for x in elements if local_tag(x) == "title"),
+            None,
         )
-        Parallel(n_jobs=THREADS, verbose=5, backend="loky")(
-            delayed(import_title)(
-                zip_file.open(file).read(),
-                file.split(".")[0].replace("usc", ""),
-                None,  # Assuming title is not needed for single release point
-                release.to_dict(),  # Assuming release_point.to_dict() is not needed for single release point
+        if title_ident is not None:
+            previous = load_previous(title_ident)
+        if BULK_TITLE:
+            records = flatten_title(elements, chapter_number, previous)
+        print(title)
+        # Do not sit on a connection while waiting for a writer slot
+        session.commit()
+        parsed = time.perf_counter()
+        with writer_slots or nullcontext():
+            acquired = time.perf_counter()
+            chap = add_chapter()
+            if records is not None:
+                stats = write_title_records(
+                    session, records, chap.usc_chapter_id, version_id
+                )
+            else:
+                stats = write_title_orm(
+                    session,
+                    elements,
+                    chapter_number,
+                    chap.usc_chapter_id,
+                    version_id,
+                    previous,
+                )
+            session.commit()
+        parse_seconds = parsed - start
+        wait_seconds = acquired - parsed
+        write_seconds = time.perf_counter() - acquired
+    print(
+        f"Title {chapter_number}: wrote {stats['written']} sections, "
+        f"carried {stats['carried']} forward from version {previous_version_id}"
+    )
+    return {
+        **stats,
+        "parse_seconds": parse_seconds,
+        "wait_seconds": wait_seconds,
+        "write_seconds": write_seconds,
+    }
+
+
+def import_title_member(
+    zip_file_path: str, job: TitleJob, release: dict, writer_slots=None
+) -> Optional[TitleTiming]:
+    """
+    Worker entry point, imports one title straight out of the release ZIP member so
+    the decompressed title is never held in memory as a whole
+    """
+    with zipfile.ZipFile(zip_file_path) as zip_file:
+        with zip_file.open(job["member"]) as chapter_file:
+            result = import_title(
+                chapter_file,
+                job["chapter_number"],
+                None,
+                release,
+                writer_slots=writer_slots,
             )
-            for file in files
+    if result is None:
+        return None
+    return {**job, "pid": os.getpid(), **result}
+
+
+def import_release(zip_file_path: str, release: dict):
+    """
+    Imports every title of a release ZIP, largest first, with at most WRITERS
+    titles writing to the database at a time
+    """
+    with zipfile.ZipFile(zip_file_path) as zip_file:
+        jobs = plan_titles(zip_file.infolist())
+    start = time.perf_counter()
+    with Manager() as manager:
+        writer_slots = manager.Semaphore(WRITERS)
+        timings = Parallel(n_jobs=THREADS, verbose=5, backend="loky", batch_size=1)(
+            delayed(import_title_member)(zip_file_path, job, release, writer_slots)
+            for job in jobs
         )
+    print_timings(timings, time.perf_counter() - start)
+    bump_cache_version(Session())
+
+
+def process_single_release_point(url, release=None):
+    zip_file_path = download_path(url, dir_name="usc")
+    if release is None:
+        session = Session()
+        new_version = Version(base_id=None)
+        session.add(new_version)
+        session.flush()
+        release = USCRelease(
+            short_title=zip_file_path.split("/")[-1].split(".")[0],
+            effective_date=datetime.now(),
+            long_title="",
+            version_id=new_version.version_id,
+        )
+        session.add(release)
+        session.commit()
+    release_dict = release.to_dict()
+    if DELTA_IMPORT:
+        release_dict["previous_version_id"] = previous_release_version(
+            Session(), release_dict
+        )
+    import_release(zip_file_path, release_dict)
 
 
 def process_all_release_points():
@@ -422,22 +559,44 @@ def process_all_release_points():
         )
         session.add(release_point)
         session.commit()
-        zip_file_path = download_path(rp.get("url"))
-        with zipfile.ZipFile(f"usc/{zip_file_path}") as zip_file:
-            files = zip_file.namelist()
-
-            files = sorted(
-                files, key=lambda x: get_number(x.split(".")[0].replace("usc", ""))
+        release_dict = release_point.to_dict()
+        if DELTA_IMPORT:
+            release_dict["previous_version_id"] = previous_release_version(
+                session, release_dict
             )
-            Parallel(n_jobs=THREADS, verbose=5, backend="multiprocessing")(
-                delayed(import_title)(
-                    zip_file.open(file).read(),
-                    file.split(".")[0].replace("usc", ""),
-                    rp.get("title"),
-                    release_point.to_dict(),
-                )
-                for file in files  # if "09" in file
+        zip_file_path = download_path(rp.get("url"), dir_name="usc")
+        import_release(zip_file_path, release_dict)
+
+
+def backfill_all_sort_orders():
+    """
+    Fills in sort_order for every title that has sections or usc_section_version rows
+    without one
+    """
+    session = Session()
+    chapter_ids = sorted(
+        {
+            x[0]
+            for x in session.query(USCSection.usc_chapter_id)
+            .filter(USCSection.sort_order == None)
+            .distinct()
+            .all()
+        }
+        | {
+            x[0]
+            for x in session.query(USCSectionVersion.usc_chapter_id)
+            .filter(
+                USCSectionVersion.sort_order == None,
+                USCSectionVersion.usc_chapter_id != None,
             )
+            .distinct()
+            .all()
+        }
+    )
+    for usc_chapter_id in chapter_ids:
+        count = backfill_sort_order(session, usc_chapter_id)
+        session.commit()
+        print(f"Chapter {usc_chapter_id}: ordered {count} sections")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,174 @@
+"""
+Maintains the search projections read by /legislation/search.
+
+legislation_latest_version holds the highest legislation_version_id of each bill,
+so the search page and its enrichment queries join one row instead of grouping
+legislation_version.
+
+legislation_search holds one document per bill with what a search should match:
+the title, its legislative subjects and policy area, the tags and summaries of its
+latest version and its sponsor's name. search_vector weights those A (title), B
+(subjects and policy area), C (tags and sponsor) and D (summaries) for ts_rank_cd,
+and document, everything but the summaries, carries a trigram index for substring
+matches.
+
+The migrations fill both tables for the bills already loaded, and the importers
+call record_latest_versions and refresh_search_documents with the bills they just
+wrote. Running this module rebuilds both for every bill:
+
+    python -m congress_parser.importers.search_documents
+"""
+
+import os
+from typing import Iterable, List
+
+from sqlalchemy import select, text
+
+from congress_db.models import Legislation, LegislationVersion
+from congress_db.session import Session, init_session
+
+SEARCH_DOCUMENTS = os.environ.get("PARSE_SEARCH_DOCUMENTS", "1") == "1"
+SEARCH_BATCH = int(os.environ.get("PARSE_SEARCH_BATCH", "1000"))
+
+REFRESH_SQL = text(
+    """
+    WITH target AS (
+        SELECT l.legislation_id,
+               coalesce(l.title, '') AS title,
+               llv.legislation_version_id AS latest_version_id
+          FROM legislation l
+          LEFT JOIN legislation_latest_version llv
+            ON llv.legislation_id = l.legislation_id
+         WHERE l.legislation_id = ANY(:legislation_ids)
+    ), parts AS (
+        SELECT t.legislation_id,
+               t.title,
+               coalesce((
+                   SELECT string_agg(s.subject, ' ')
+                     FROM legislative_subject_association a
+                     JOIN legislative_subject s
+                       ON s.legislative_subject_id = a.legislative_subject_id
+                    WHERE a.legislation_id = t.legislation_id
+               ), '') AS subjects,
+               coalesce((
+                   SELECT string_agg(p.name, ' ')
+                     FROM legislative_policy_area_association a
+                     JOIN legislative_policy_area p
+                       ON p.legislative_policy_area_id = a.legislative_policy_area_id
+                    WHERE a.legislation_id = t.legislation_id
+               ), '') AS policy_areas,
+               coalesce((
+                   SELECT string_agg(DISTINCT replace(tag, '_', ' '), ' ')
+                     FROM legislation_version_tag vt, unnest(vt.tags) AS tag
+                    WHERE vt.legislation_version_id = t.latest_version_id
+               ), '') AS tags,
+               coalesce((
+                   SELECT string_agg(concat_ws(' ', lg.first_name, lg.last_name), ' ')
+                     FROM legislation_sponsorship sp
+                     JOIN legislator lg ON lg.bioguide_id = sp.legislator_bioguide_id
+                    WHERE sp.legislation_id = t.legislation_id
+                      AND sp.cosponsor = false
+               ), '') AS sponsors,
+               coalesce((
+                   SELECT string_agg(cs.summary, ' ')
+                     FROM legislation_content c
+                     JOIN legislation_content_summary cs
+                       ON cs.legislation_content_id = c.legislation_content_id
+                    WHERE c.legislation_version_id = t.latest_version_id
+               ), '') AS summaries
+          FROM target t
+    )
+    INSERT INTO legislation_search (legislation_id, document, search_vector, updated_at)
+    SELECT legislation_id,
+           concat_ws(' ', title, subjects, policy_areas, tags, sponsors),
+           setweight(to_tsvector('english', title), 'A')
+           || setweight(to_tsvector('english', subjects || ' ' || policy_areas), 'B')
+           || setweight(to_tsvector('english', tags || ' ' || sponsors), 'C')
+           || setweight(to_tsvector('english', summaries), 'D'),
+           now()
+      FROM parts
+    ON CONFLICT (legislation_id) DO UPDATE
+       SET document = excluded.document,
+           search_vector = excluded.search_vector,
+           updated_at = excluded.updated_at
+    """
+)
+
+LATEST_VERSION_SQL = text(
+    """
+    INSERT INTO legislation_latest_version (legislation_id, legislation_version_id)
+    SELECT legislation_id, max(legislation_version_id)
+      FROM legislation_version
+     WHERE legislation_id = ANY(:legislation_ids)
+     GROUP BY legislation_id
+    ON CONFLICT (legislation_id) DO UPDATE
+       SET legislation_version_id = excluded.legislation_version_id
+     WHERE legislation_latest_version.legislation_version_id
+           IS DISTINCT FROM excluded.legislation_version_id
+    """
+)
+
+
+def record_latest_versions(
+    session, legislation_ids: Iterable[int], commit: bool = True
+) -> int:
+    """
+    Points legislation_latest_version at the newest version of the given bills
+    """
+    ids: List[int] = sorted(set(x for x in legislation_ids if x is not None))
+    if not ids:
+        return 0
+    session.execute(LATEST_VERSION_SQL, {"legislation_ids": ids})
+    if commit:
+        session.commit()
+    return len(ids)
+
+
+def refresh_search_documents(
+    session, legislation_ids: Iterable[int], commit: bool = True
+) -> int:
+    """
+    Rebuilds the search documents of the given bills in one statement, returns how
+    many bills were asked for. Pass commit=False to leave it to the caller's commit.
+    """
+    ids: List[int] = sorted(set(x for x in legislation_ids if x is not None))
+    if not SEARCH_DOCUMENTS or not ids:
+        return 0
+    session.execute(REFRESH_SQL, {"legislation_ids": ids})
+    if commit:
+        session.commit()
+    return len(ids)
+
+
+def refresh_version_documents(session, legislation_version_ids: Iterable[int]) -> int:
+    """
+    refresh_search_documents for the bills the given versions belong to, for the
+    prompt runners that write tags and summaries per version
+    """
+    legislation_ids = session.execute(
+        select(LegislationVersion.legislation_id).where(
+            LegislationVersion.legislation_version_id.in_(list(legislation_version_ids))
+        )
+    ).scalars().all()
+    return refresh_search_documents(session, legislation_ids)
+
+
+def refresh_all(session) -> int:
+    """
+    Rebuilds every latest version and search document, SEARCH_BATCH bills per
+    statement
+    """
+    legislation_ids = session.execute(
+        select(Legislation.legislation_id).order_by(Legislation.legislation_id)
+    ).scalars().all()
+    for start in range(0, len(legislation_ids), SEARCH_BATCH):
+        batch = legislation_ids[start : start + SEARCH_BATCH]
+        record_latest_versions(session, batch, commit=False)
+        refresh_search_documents(session, batch)
+        print(f"Refreshed {min(start + SEARCH_BATCH, len(legislation_ids))} / {len(legislation_ids)}")
+    return len(legislation_ids)
+
+
+if __name__ == "__main__":
+    init_session()
+    refresh_all(Session())
@@ -3,6 +3,7 @@ from time import sleep
 from congress_db.session import Session, init_session
 from congress_db.models import Legislation, LegislationSponsorship
 from congress_parser.metadata.sponsors import extract_sponsors_from_api
+from congress_parser.importers.search_documents import refresh_search_documents
 
 MIN_TIME_BETWEEN_REQUESTS = 3600 / 5000
 
@@ -31,6 +32,7 @@ if __name__ == "__main__":
             'chamber': legislation.chamber,
             'bill_number': legislation.number
         }, legislation.legislation_id, session)
+        refresh_search_documents(session, [legislation.legislation_id])
 
         if i < result_count - 1:
             sleep(MIN_TIME_BETWEEN_REQUESTS)
\ No newline at end of file
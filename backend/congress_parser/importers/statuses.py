@@ -1,17 +1,13 @@
-import os
 from congress_parser.status_parser import parse_archive
+from congress_parser.utils.download import fetch
 
 url_format = "https://www.govinfo.gov/bulkdata/BILLSTATUS/{congress}/{prefix}/BILLSTATUS-{congress}-{prefix}.zip"
 
 congresses = [118]
 
 def download_path(url: str):
-    os.makedirs("statuses", exist_ok=True)
-    output_name = url.split("/")[-1]
-    if os.path.exists(f"statuses/{output_name}"):
-        return output_name
-    os.system(f"wget {url} --output-document statuses/{output_name}")
-    return output_name
+    fetch(url, "statuses")
+    return url.split("/")[-1]
 
 if __name__ == "__main__":
     for congress in congresses:
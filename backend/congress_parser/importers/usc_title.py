@@ -0,0 +1,964 @@
+"""
+Set-based loader for a single US Code title.
+
+The ORM path in releases.import_title flushes after every USCSection and USCContent so
+that children can see their parent's primary key, which for title 42 is hundreds of
+thousands of round trips. This loader walks the title once, in the same order, and
+builds the section and content trees in memory with parents referenced by their
+position. Ids are then taken from reserved sequence ranges and both tables are written
+with a COPY each, so a title costs a handful of statements regardless of its size.
+
+The streaming path (stream_title and write_title_chunks) hands the records over in
+chunks of CONTENT_CHUNK rows, with an id reservation and a COPY per chunk, so a worker
+only holds one chunk of the title's text at a time.
+
+Kept free of the releases.py import chain so it can be tested on its own.
+"""
+
+import io
+import itertools
+import os
+import re
+import time
+from contextlib import nullcontext
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+from typing import Tuple, TypedDict, Union
+
+from lxml import etree
+from sqlalchemy import bindparam, select, text, update
+from unidecode import unidecode
+
+from congress_db.models import USCContent, USCSection, USCSectionVersion
+from congress_parser.importers.release_delta import (
+    PreviousSection,
+    carried_section,
+    section_hash,
+    section_version_row,
+    write_section_versions,
+)
+from congress_parser.utils.bulk import copy_rows, reserve_ids
+from congress_parser.utils.citation import resolve_citations
+
+# Section and content records per id reservation and COPY when streaming a title
+CONTENT_CHUNK = int(os.environ.get("PARSE_USC_CONTENT_CHUNK", 5000))
+
+# Organizational levels per the USLM schema, stored as USCSection containers above
+# the individual statute sections
+ORGANIZATIONAL_TAGS = [
+    "chapter",
+    "subchapter",
+    "part",
+    "subpart",
+    "division",
+    "subdivision",
+    "article",
+    "subarticle",
+]
+
+SECTION_COLUMNS = [
+    "usc_section_id",
+    "parent_id",
+    "usc_ident",
+    "usc_guid",
+    "number",
+    "section_display",
+    "heading",
+    "content_type",
+    "usc_chapter_id",
+    "version_id",
+    "sort_order",
+]
+
+CONTENT_COLUMNS = [
+    "usc_content_id",
+    "parent_id",
+    "usc_ident",
+    "usc_guid",
+    "order_number",
+    "number",
+    "section_display",
+    "heading",
+    "content_str",
+    "content_type",
+    "usc_section_id",
+    "version_id",
+]
+
+
+class TitleRecords(TypedDict):
+    # Pre-order section records, "parent_index" points into this list
+    sections: List[Dict[str, Any]]
+    # Pre-order content records, "parent_index" points into this list and
+    # "section_index" into sections
+    contents: List[Dict[str, Any]]
+    # One per leaf section, either "section_index" of a written section or the
+    # previous release's section that was carried forward, with the "parent_index"
+    # and "number" it has in this release and its "position", the number of sections
+    # written before it
+    section_versions: List[Dict[str, Any]]
+
+
+class TitleStats(TypedDict):
+    written: int
+    carried: int
+
+
+class ChunkedTitleStats(TitleStats):
+    # Waiting for and holding the writer slot, summed over the chunks
+    wait_seconds: float
+    write_seconds: float
+
+
+class TitleDocument(TypedDict):
+    # Text of the first <heading> in the document, stored as the chapter's long_title
+    long_title: Optional[str]
+    # identifier of the <title> element, e.g. "/us/usc/t42"
+    title_ident: Optional[str]
+    # Chunks of the title's records, indexes count from the start of the title.
+    # Readable once while the source is open.
+    chunks: Iterator[TitleRecords]
+
+
+# Raw XML, or a binary file object such as an open ZIP member
+TitleSource = Union[bytes, IO[bytes]]
+
+
+_NUMBER_TOKENS = re.compile(r"\d+|[a-z]+")
+_ROMAN = re.compile(r"^m{0,3}(cm|cd|d?c{0,3})(xc|xl|l?x{0,3})(ix|iv|v?i{0,3})$")
+_ROMAN_VALUES = {"i": 1, "v": 5, "x": 10, "l": 50, "c": 100, "d": 500, "m": 1000}
+
+# A token of a natural sort key, (0, value, "") for digits, (1, length, letters)
+# for letters, so that 1395 < 1395a < 1395z < 1395aa < 1395w-4 < 1395w-101
+NumberKey = Tuple[Tuple[int, int, str], ...]
+
+
+def unidecode_str(input_str: str) -> str:
+    return unidecode(input_str or "").replace("--", "-")
+
+
+def roman_value(number: str) -> Optional[int]:
+    """
+    "XVIII" -> 18, None if it is not a roman numeral
+    """
+    number = number.lower()
+    if not number or _ROMAN.match(number) is None:
+        return None
+    total = 0
+    for i, char in enumerate(number):
+        value = _ROMAN_VALUES[char]
+        if i + 1 < len(number) and _ROMAN_VALUES[number[i + 1]] > value:
+            total -= value
+        else:
+            total += value
+    return total
+
+
+def section_sort_key(number: Optional[str], roman: bool = False) -> NumberKey:
+    """
+    Natural sort key for a USC number. Runs of digits compare as integers and runs of
+    letters compare shorter first, which is how the Code orders 1395z before 1395aa.
+    With roman, the whole number is read as a roman numeral (subchapter XVIII).
+    """
+    number = unidecode_str(number).lower()
+    if roman:
+        value = roman_value(number)
+        if value is not None:
+            return ((0, value, ""),)
+    return tuple(
+        (0, int(x), "") if x.isdigit() else (1, len(x), x)
+        for x in _NUMBER_TOKENS.findall(number)
+    )
+
+
+def section_sort_orders(
+    sections: Sequence[Tuple[Optional[int], Optional[str]]]
+) -> List[int]:
+    """
+    Ranks the sections of a title into a total order, given (parent_index, number) in
+    document order with parents before their children.
+
+    A section's key is the path of natural sort keys from the top of the title down to
+    it, so the ranks order siblings naturally and every section of a chapter before
+    the next chapter. A group of siblings is read as roman numerals only if all of
+    them are roman numerals, since subchapters A, B, C... are letters. Ties keep
+    document order.
+    """
+    siblings: Dict[Optional[int], List[str]] = {}
+    for parent_index, number in sections:
+        siblings.setdefault(parent_index, []).append(unidecode_str(number))
+    roman_groups = {
+        parent_index
+        for parent_index, numbers in siblings.items()
+        if all(roman_value(x) is not None for x in numbers)
+    }
+    paths: List[Tuple[NumberKey, ...]] = []
+    for parent_index, number in sections:
+        key = section_sort_key(number, parent_index in roman_groups)
+        parent_path = paths[parent_index] if parent_index is not None else ()
+        paths.append(parent_path + (key,))
+    order = sorted(range(len(sections)), key=lambda i: (paths[i], i))
+    ranks = [0] * len(sections)
+    for rank, i in enumerate(order):
+        ranks[i] = rank
+    return ranks
+
+
+def local_tag(element) -> str:
+    """
+    "{http://xml.house.gov/schemas/uslm/1.0}section" -> "section"
+    """
+    return element.tag.split("}")[-1]
+
+
+def is_leaf_section(identifier: Optional[str]) -> bool:
+    """
+    Leaf sections sit at depth 5 (/us/usc/tXX/sYYY) and contain the actual statute
+    text. They start with "s" but not "st", which would be a subtitle.
+    """
+    if identifier is None:
+        return False
+    chunks = identifier.split("/")
+    return len(chunks) == 5 and chunks[-1][0] == "s" and chunks[-1][1:2] != "t"
+
+
+def _content_text(content_elem, chapter_number: str) -> Optional[str]:
+    if (
+        "content" in content_elem.tag
+        or "chapeau" in content_elem.tag
+        or "notes" in content_elem.tag
+    ):
+        return resolve_citations(
+            " ".join(content_elem.itertext()).strip().replace("\n", " "),
+            chapter_number,
+        )
+    return None
+
+
+def content_fields(search_element, chapter_number: str) -> Dict[str, Any]:
+    """
+    The USCContent columns of a content node. Child layout mirrors bill XML:
+        [0] = <num> (display number)
+        [1] = <heading> (or <content>/<chapeau> if no heading)
+        [2] = <content>/<chapeau>/<notes> (body text, if heading present)
+    """
+    enum = search_element[0]
+    heading = search_element[1]
+    fields = {
+        "content_type": search_element.tag,
+        "usc_guid": search_element.attrib["id"],
+        "usc_ident": unidecode_str(search_element.attrib["identifier"]),
+        "section_display": enum.text,
+    }
+    if "heading" in heading.tag:
+        content_str = None
+        if len(search_element) > 2:
+            content_str = _content_text(search_element[2], chapter_number)
+        fields["number"] = unidecode_str(enum.attrib["value"])
+        fields["heading"] = unidecode_str(heading.text)
+    else:
+        content_str = _content_text(heading, chapter_number)
+        fields["number"] = enum.attrib["value"]
+        fields["heading"] = None
+    fields["content_str"] = unidecode_str(content_str)
+    return fields
+
+
+def section_fields(elem, content_type: str) -> Dict[str, Any]:
+    enum = elem[0]
+    return {
+        "usc_guid": elem.attrib["id"],
+        "usc_ident": elem.attrib.get("identifier"),
+        "number": unidecode_str(enum.attrib["value"]),
+        "section_display": unidecode_str(enum.text),
+        "heading": unidecode_str(elem[1].text),
+        "content_type": content_type,
+    }
+
+
+def flatten_content(
+    section_elem,
+    section_index: int,
+    chapter_number: str,
+    contents: List[Dict[str, Any]],
+    first_index: int = 0,
+):
+    """
+    Appends the content tree of a leaf section in the same pre-order as the ORM
+    path's recursive_content. Only elements with both an id and an identifier are
+    stored, and the children of an element that is not stored are not visited.
+    Indexes start at first_index plus the records already in contents.
+    """
+    # (element, parent_index, order)
+    stack = [(section_elem, None, 0)]
+    while stack:
+        search_element, parent_index, order = stack.pop()
+        if not (
+            "id" in search_element.attrib and "identifier" in search_element.attrib
+        ):
+            continue
+        my_index = first_index + len(contents)
+        contents.append(
+            {
+                "index": my_index,
+                "parent_index": parent_index,
+                "section_index": section_index,
+                "order_number": order,
+                **content_fields(search_element, chapter_number),
+            }
+        )
+        children = [x for x in search_element if "id" in x.attrib]
+        # Reversed so that the pops come back out in document order
+        for child_order in range(len(children) - 1, -1, -1):
+            stack.append((children[child_order], my_index, child_order))
+
+
+def flatten_title(
+    elements: List[Any],
+    chapter_number: str,
+    previous: Optional[Dict[str, Optional[PreviousSection]]] = None,
+) -> TitleRecords:
+    """
+    Walks the identified elements of a title like import_title does and returns the
+    section and content records. Leaf sections that are unchanged against `previous`
+    only get a section_versions entry.
+    """
+    previous = previous or {}
+    records: TitleRecords = {"sections": [], "contents": [], "section_versions": []}
+    seen: Dict[str, int] = {}
+    # identifier -> index of the organizational section
+    parents: Dict[str, int] = {}
+    # Identifiers whose children are covered by flatten_content
+    is_handled = {None: True}
+    current_parent = None
+    for elem in elements:
+        split_tag = local_tag(elem)
+        if split_tag in ["uscDoc", "title"]:
+            continue
+        identifier = elem.attrib.get("identifier")
+        parent_identifier = elem.getparent().attrib.get("identifier")
+        if parent_identifier in is_handled:
+            is_handled[identifier] = True
+            continue
+        if split_tag in ORGANIZATIONAL_TAGS:
+            parents[identifier] = len(records["sections"])
+            records["sections"].append(
+                {
+                    "index": parents[identifier],
+                    "parent_index": parents.get(parent_identifier),
+                    **section_fields(elem, split_tag),
+                }
+            )
+            current_parent = identifier
+        elif is_leaf_section(identifier):
+            is_handled[identifier] = True
+            digest = section_hash(elem)
+            match = carried_section(previous, seen, identifier, digest)
+            if match is not None:
+                records["section_versions"].append(
+                    {
+                        "section_index": None,
+                        "parent_index": parents.get(current_parent),
+                        "number": section_fields(elem, split_tag)["number"],
+                        "position": len(records["sections"]),
+                        "usc_ident": identifier,
+                        "section_hash": digest,
+                        **match,
+                    }
+                )
+                continue
+            section_index = len(records["sections"])
+            records["sections"].append(
+                {
+                    "index": section_index,
+                    "parent_index": parents.get(current_parent),
+                    **section_fields(elem, split_tag),
+                }
+            )
+            flatten_content(elem, section_index, chapter_number, records["contents"])
+            records["section_versions"].append(
+                {
+                    "section_index": section_index,
+                    "usc_ident": identifier,
+                    "section_hash": digest,
+                }
+            )
+    return records
+
+
+def _release_finished(elem):
+    """
+    Frees an element that has been emitted along with the siblings before it, so
+    only the open parent chain stays in the tree
+    """
+    elem.clear()
+    parent = elem.getparent()
+    if parent is not None:
+        while elem.getprevious() is not None:
+            del parent[0]
+
+
+def _new_records() -> TitleRecords:
+    return {"sections": [], "contents": [], "section_versions": []}
+
+
+def iter_title_chunks(
+    source: TitleSource,
+    chapter_number: str,
+    document: dict,
+    load_previous: Optional[
+        Callable[[str], Dict[str, Optional[PreviousSection]]]
+    ] = None,
+    chunk_size: Optional[int] = None,
+) -> Iterator[TitleRecords]:
+    """
+    Streaming equivalent of open_usc + flatten_title. The title is read with
+    iterparse and every leaf section is flattened and freed as soon as its end tag
+    is read, so the tree never holds more than the open organizational elements and
+    the section being read.
+
+    Organizational sections are recorded when their first identified child starts
+    (or at their end tag), by which point their <num> and <heading> have been read.
+    Records are yielded once a leaf section brings the chunk to chunk_size sections
+    and contents, with their indexes counted from the start of the title, so joined
+    together the chunks are the records flatten_title returns. Only a leaf section's
+    end closes a chunk, so a chunk's contents and its sections' parents are complete.
+
+    Args:
+        source: The title XML
+        chapter_number: Title number string (e.g. "42")
+        document: Gets the "long_title" and "title_ident" as they are read
+        load_previous: Called with the title identifier once it is seen, returns the
+            previous release's sections to carry forward
+        chunk_size: Defaults to CONTENT_CHUNK
+    """
+    if not hasattr(source, "read"):
+        source = io.BytesIO(source)
+    chunk_size = chunk_size or CONTENT_CHUNK
+    records = _new_records()
+    # Sections and contents yielded in earlier chunks
+    sections_before = 0
+    contents_before = 0
+    previous: Dict[str, Optional[PreviousSection]] = {}
+    seen: Dict[str, int] = {}
+    parents: Dict[str, int] = {}
+    # Organizational elements whose fields have not been read yet
+    pending: List[Tuple[Any, int]] = []
+    current_parent = None
+    # The leaf section being read, everything inside it is left to flatten_content
+    leaf = None
+    found_heading = False
+
+    def fill_pending():
+        while pending:
+            elem, index = pending.pop()
+            record = records["sections"][index - sections_before]
+            record.update(section_fields(elem, record["content_type"]))
+
+    for event, elem in etree.iterparse(source, events=("start", "end")):
+        if not isinstance(elem.tag, str):
+            continue
+        if event == "end":
+            if not found_heading and "heading" in elem.tag:
+                found_heading = True
+                document["long_title"] = elem.text
+            if elem is leaf:
+                leaf = None
+                identifier = elem.attrib["identifier"]
+                digest = section_hash(elem)
+                match = carried_section(previous, seen, identifier, digest)
+                if match is not None:
+                    records["section_versions"].append(
+                        {
+                            "section_index": None,
+                            "parent_index": parents.get(current_parent),
+                            "number": section_fields(elem, local_tag(elem))["number"],
+                            "position": sections_before + len(records["sections"]),
+                            "usc_ident": identifier,
+                            "section_hash": digest,
+                            **match,
+                        }
+                    )
+                else:
+                    section_index = sections_before + len(records["sections"])
+                    records["sections"].append(
+                        {
+                            "index": section_index,
+                            "parent_index": parents.get(current_parent),
+                            **section_fields(elem, local_tag(elem)),
+                        }
+                    )
+                    flatten_content(
+                        elem,
+                        section_index,
+                        chapter_number,
+                        records["contents"],
+                        contents_before,
+                    )
+                    records["section_versions"].append(
+                        {
+                            "section_index": section_index,
+                            "usc_ident": identifier,
+                            "section_hash": digest,
+                        }
+                    )
+                _release_finished(elem)
+                if len(records["sections"]) + len(records["contents"]) >= chunk_size:
+                    yield records
+                    sections_before += len(records["sections"])
+                    contents_before += len(records["contents"])
+                    records = _new_records()
+            elif leaf is None and local_tag(elem) in ORGANIZATIONAL_TAGS:
+                fill_pending()
+                _release_finished(elem)
+            continue
+
+        identifier = elem.attrib.get("identifier")
+        if identifier is None or leaf is not None:
+            continue
+        split_tag = local_tag(elem)
+        if split_tag == "title" and document["title_ident"] is None:
+            document["title_ident"] = identifier
+            if load_previous is not None:
+                previous = load_previous(identifier)
+        if split_tag in ["uscDoc", "title"]:
+            continue
+        parent = elem.getparent()
+        parent_identifier = parent.attrib.get("identifier") if parent is not None else None
+        if parent_identifier is None:
+            continue
+        fill_pending()
+        if split_tag in ORGANIZATIONAL_TAGS:
+            parents[identifier] = sections_before + len(records["sections"])
+            records["sections"].append(
+                {
+                    "index": parents[identifier],
+                    "parent_index": parents.get(parent_identifier),
+                    "content_type": split_tag,
+                }
+            )
+            pending.append((elem, parents[identifier]))
+            current_parent = identifier
+        elif is_leaf_section(identifier):
+            leaf = elem
+    fill_pending()
+    if any(records.values()):
+        yield records
+
+
+def stream_title(
+    source: TitleSource,
+    chapter_number: str,
+    load_previous: Optional[
+        Callable[[str], Dict[str, Optional[PreviousSection]]]
+    ] = None,
+    chunk_size: Optional[int] = None,
+) -> TitleDocument:
+    """
+    Reads the title up to its first chunk of records, by which point the title's
+    <heading> has been read, and "chunks" picks it up from there, see
+    iter_title_chunks and write_title_chunks.
+    """
+    document: dict = {"long_title": None, "title_ident": None}
+    chunks = iter_title_chunks(
+        source, chapter_number, document, load_previous, chunk_size
+    )
+    first = next(chunks, None)
+    document["chunks"] = chunks if first is None else itertools.chain([first], chunks)
+    return document
+
+
+def title_sort_orders(records: TitleRecords) -> Tuple[List[int], List[int]]:
+    """
+    section_sort_orders over every section in effect for the release, the ones written
+    and the ones carried forward together, so that a carried section ranks among the
+    sections around it. Returns the ranks of records["sections"] and of
+    records["section_versions"].
+    """
+    # (parent position, number) in document order, and where each record landed
+    ranked: List[Tuple[Optional[int], Optional[str]]] = []
+    section_positions: List[int] = []
+    carried_positions: Dict[int, int] = {}
+    carried = [
+        (i, x)
+        for i, x in enumerate(records["section_versions"])
+        if x["section_index"] is None
+    ]
+    next_carried = 0
+
+    def add_carried(before: int):
+        nonlocal next_carried
+        while next_carried < len(carried) and carried[next_carried][1]["position"] <= before:
+            i, record = carried[next_carried]
+            parent_index = record["parent_index"]
+            carried_positions[i] = len(ranked)
+            ranked.append(
+                (
+                    section_positions[parent_index] if parent_index is not None else None,
+                    record["number"],
+                )
+            )
+            next_carried += 1
+
+    for record in records["sections"]:
+        add_carried(record["index"])
+        parent_index = record["parent_index"]
+        section_positions.append(len(ranked))
+        ranked.append(
+            (
+                section_positions[parent_index] if parent_index is not None else None,
+                record["number"],
+            )
+        )
+    add_carried(len(records["sections"]))
+    ranks = section_sort_orders(ranked)
+    section_ranks = [ranks[x] for x in section_positions]
+    version_ranks = [
+        ranks[carried_positions[i]]
+        if record["section_index"] is None
+        else section_ranks[record["section_index"]]
+        for i, record in enumerate(records["section_versions"])
+    ]
+    return section_ranks, version_ranks
+
+
+def section_rows(
+    sections: List[Dict[str, Any]],
+    section_ids: Sequence[int],
+    usc_chapter_id: int,
+    version_id: int,
+    sort_orders: Optional[Sequence[int]] = None,
+) -> List[tuple]:
+    """
+    COPY rows in SECTION_COLUMNS order, section_ids and sort_orders are looked up by
+    record index. Without sort_orders the column is left NULL.
+    """
+    rows = []
+    for record in sections:
+        parent_index = record["parent_index"]
+        rows.append(
+            (
+                section_ids[record["index"]],
+                section_ids[parent_index] if parent_index is not None else None,
+                record["usc_ident"],
+                record["usc_guid"],
+                record["number"],
+                record["section_display"],
+                record["heading"],
+                record["content_type"],
+                usc_chapter_id,
+                version_id,
+                sort_orders[record["index"]] if sort_orders is not None else None,
+            )
+        )
+    return rows
+
+
+def content_rows(
+    contents: List[Dict[str, Any]],
+    content_ids: Union[Sequence[int], Dict[int, int]],
+    section_ids: Sequence[int],
+    version_id: int,
+) -> List[tuple]:
+    """
+    COPY rows in CONTENT_COLUMNS order, content_ids and section_ids are looked up by
+    record index
+    """
+    rows = []
+    for record in contents:
+        parent_index = record["parent_index"]
+        rows.append(
+            (
+                content_ids[record["index"]],
+                content_ids[parent_index] if parent_index is not None else None,
+                record["usc_ident"],
+                record["usc_guid"],
+                record["order_number"],
+                record["number"],
+                record["section_display"],
+                record["heading"],
+                record["content_str"],
+                record["content_type"],
+                section_ids[record["section_index"]],
+                version_id,
+            )
+        )
+    return rows
+
+
+def version_rows(
+    records: TitleRecords,
+    section_ids: Sequence[int],
+    usc_chapter_id: int,
+    version_id: int,
+    version_sort_orders: Sequence[int],
+) -> List[dict]:
+    """
+    usc_section_version rows of the title's leaf sections, written and carried. Of
+    records["sections"] only the index and parent_index of each are read.
+    """
+    rows = []
+    for record, sort_order in zip(records["section_versions"], version_sort_orders):
+        if record["section_index"] is None:
+            parent_index = record["parent_index"]
+            rows.append(
+                section_version_row(
+                    version_id,
+                    record["usc_section_id"],
+                    record["source_version_id"],
+                    record["usc_ident"],
+                    record["section_hash"],
+                    usc_chapter_id,
+                    section_ids[parent_index] if parent_index is not None else None,
+                    sort_order,
+                )
+            )
+        else:
+            parent_index = records["sections"][record["section_index"]]["parent_index"]
+            rows.append(
+                section_version_row(
+                    version_id,
+                    section_ids[record["section_index"]],
+                    version_id,
+                    record["usc_ident"],
+                    record["section_hash"],
+                    usc_chapter_id,
+                    section_ids[parent_index] if parent_index is not None else None,
+                    sort_order,
+                )
+            )
+    return rows
+
+
+def title_rows(
+    records: TitleRecords,
+    section_ids: List[int],
+    content_ids: List[int],
+    usc_chapter_id: int,
+    version_id: int,
+) -> Tuple[List[tuple], List[tuple], List[dict]]:
+    """
+    Zips the records with their reserved ids into COPY rows (in SECTION_COLUMNS and
+    CONTENT_COLUMNS order) and usc_section_version rows
+    """
+    sort_orders, version_sort_orders = title_sort_orders(records)
+    return (
+        section_rows(
+            records["sections"], section_ids, usc_chapter_id, version_id, sort_orders
+        ),
+        content_rows(records["contents"], content_ids, section_ids, version_id),
+        version_rows(
+            records, section_ids, usc_chapter_id, version_id, version_sort_orders
+        ),
+    )
+
+
+def _title_stats(records: TitleRecords) -> TitleStats:
+    carried = sum(1 for x in records["section_versions"] if x["section_index"] is None)
+    return {"written": len(records["section_versions"]) - carried, "carried": carried}
+
+
+def write_title_records(
+    session, records: TitleRecords, usc_chapter_id: int, version_id: int
+) -> TitleStats:
+    """
+    Stores flattened title records with two id reservations, a COPY into usc_section
+    and usc_content each, and one insert of the usc_section_version rows. Does not
+    commit.
+    """
+    section_ids = reserve_ids(
+        session, USCSection.__tablename__, "usc_section_id", len(records["sections"])
+    )
+    content_ids = reserve_ids(
+        session, USCContent.__tablename__, "usc_content_id", len(records["contents"])
+    )
+    sections, contents, versions = title_rows(
+        records, section_ids, content_ids, usc_chapter_id, version_id
+    )
+    copy_rows(session, USCSection.__tablename__, SECTION_COLUMNS, sections)
+    copy_rows(session, USCContent.__tablename__, CONTENT_COLUMNS, contents)
+    write_section_versions(session, versions)
+    return _title_stats(records)
+
+
+SORT_ORDER_SQL = text(
+    """
+    UPDATE usc_section s
+       SET sort_order = r.sort_order
+      FROM unnest(CAST(:section_ids AS integer[]), CAST(:sort_orders AS integer[]))
+           AS r(usc_section_id, sort_order)
+     WHERE s.usc_section_id = r.usc_section_id
+    """
+)
+
+
+def write_title_chunks(
+    session,
+    chunks: Iterable[TitleRecords],
+    usc_chapter_id: int,
+    version_id: int,
+    writer_slots=None,
+    commit: bool = False,
+) -> ChunkedTitleStats:
+    """
+    Stores the chunks of iter_title_chunks as they are read, with an id reservation
+    and a COPY into usc_section and usc_content per chunk. writer_slots is only held
+    while a chunk is written.
+
+    sort_order ranks the whole title, so the sections are written without it and
+    only their index, parent and number are kept. Once the last chunk is in, one
+    UPDATE sets it and the usc_section_version rows are inserted. The title is one
+    transaction, pass commit=True to commit it while still holding the slot.
+    """
+    # Every section id of the title by index, what title_sort_orders and version_rows
+    # read of the sections, and the section_versions records
+    section_ids: List[int] = []
+    ranked = _new_records()
+    wait_seconds = 0.0
+    write_seconds = 0.0
+    for chunk in chunks:
+        start = time.perf_counter()
+        with writer_slots or nullcontext():
+            acquired = time.perf_counter()
+            section_ids += reserve_ids(
+                session,
+                USCSection.__tablename__,
+                "usc_section_id",
+                len(chunk["sections"]),
+            )
+            content_ids = reserve_ids(
+                session,
+                USCContent.__tablename__,
+                "usc_content_id",
+                len(chunk["contents"]),
+            )
+            copy_rows(
+                session,
+                USCSection.__tablename__,
+                SECTION_COLUMNS,
+                section_rows(
+                    chunk["sections"], section_ids, usc_chapter_id, version_id
+                ),
+            )
+            copy_rows(
+                session,
+                USCContent.__tablename__,
+                CONTENT_COLUMNS,
+                content_rows(
+                    chunk["contents"],
+                    dict(zip((x["index"] for x in chunk["contents"]), content_ids)),
+                    section_ids,
+                    version_id,
+                ),
+            )
+        wait_seconds += acquired - start
+        write_seconds += time.perf_counter() - acquired
+        ranked["sections"] += [
+            {
+                "index": x["index"],
+                "parent_index": x["parent_index"],
+                "number": x["number"],
+            }
+            for x in chunk["sections"]
+        ]
+        ranked["section_versions"] += chunk["section_versions"]
+
+    sort_orders, version_sort_orders = title_sort_orders(ranked)
+    start = time.perf_counter()
+    with writer_slots or nullcontext():
+        acquired = time.perf_counter()
+        if section_ids:
+            session.execute(
+                SORT_ORDER_SQL,
+                {"section_ids": section_ids, "sort_orders": sort_orders},
+            )
+        write_section_versions(
+            session,
+            version_rows(
+                ranked, section_ids, usc_chapter_id, version_id, version_sort_orders
+            ),
+        )
+        if commit:
+            session.commit()
+    return {
+        **_title_stats(ranked),
+        "wait_seconds": wait_seconds + acquired - start,
+        "write_seconds": write_seconds + time.perf_counter() - acquired,
+    }
+
+
+def write_title_bulk(
+    session,
+    elements: List[Any],
+    chapter_number: str,
+    usc_chapter_id: int,
+    version_id: int,
+    previous: Optional[Dict[str, Optional[PreviousSection]]] = None,
+) -> TitleStats:
+    """
+    Flattens and stores a title, see write_title_records. Does not commit.
+    """
+    records = flatten_title(elements, chapter_number, previous)
+    return write_title_records(session, records, usc_chapter_id, version_id)
+
+
+def backfill_sort_order(session, usc_chapter_id: int) -> int:
+    """
+    Computes sort_order for a title imported before the column existed, on its
+    sections and on its usc_section_version rows. Parents are always inserted before
+    their children, so id order stands in for document order. The sections a delta
+    import carried into the title are ranked along with them, after the title's own
+    sections in document order. Does not commit.
+    """
+    rows = session.execute(
+        select(USCSection.usc_section_id, USCSection.parent_id, USCSection.number)
+        .where(USCSection.usc_chapter_id == usc_chapter_id)
+        .order_by(USCSection.usc_section_id)
+    ).all()
+    carried = session.execute(
+        select(
+            USCSectionVersion.usc_section_version_id,
+            USCSectionVersion.parent_id,
+            USCSection.number,
+        )
+        .join(USCSection, USCSection.usc_section_id == USCSectionVersion.usc_section_id)
+        .where(
+            USCSectionVersion.usc_chapter_id == usc_chapter_id,
+            USCSectionVersion.source_version_id != USCSectionVersion.version_id,
+        )
+        .order_by(USCSectionVersion.usc_section_version_id)
+    ).all()
+    index_by_id = {row[0]: i for i, row in enumerate(rows)}
+    ranks = section_sort_orders(
+        [(index_by_id.get(row[1]), row[2]) for row in [*rows, *carried]]
+    )
+    if rows:
+        session.execute(
+            update(USCSection)
+            .where(USCSection.usc_section_id == bindparam("section_id"))
+            .values(sort_order=bindparam("rank")),
+            [{"section_id": row[0], "rank": rank} for row, rank in zip(rows, ranks)],
+        )
+        session.execute(
+            text(
+                """
+                UPDATE usc_section_version v
+                   SET sort_order = s.sort_order
+                  FROM usc_section s
+                 WHERE s.usc_section_id = v.usc_section_id
+                   AND s.usc_chapter_id = :usc_chapter_id
+                   AND v.source_version_id = v.version_id
+                """
+            ),
+            {"usc_chapter_id": usc_chapter_id},
+        )
+    if carried:
+        session.execute(
+            update(USCSectionVersion)
+            .where(USCSectionVersion.usc_section_version_id == bindparam("version_row_id"))
+            .values(sort_order=bindparam("rank")),
+            [
+                {"version_row_id": row[0], "rank": rank}
+                for row, rank in zip(carried, ranks[len(rows) :])
+            ],
+        )
+    return len(rows) + len(carried)
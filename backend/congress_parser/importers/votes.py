@@ -12,12 +12,18 @@ Fetches and parses roll-call vote XML from both chambers:
         - Uses <count> for totals and <members><member> for individual votes
         - Legislators identified by lis_member_id (LIS ID, mapped to bioguide)
 
-Both scrapers iterate sequentially from the last known vote number until they
-hit a 404 (House) or non-XML response (Senate), then stop.
+Both scrapers walk forward from the last known vote number until they hit a 404
+(House) or non-XML response (Senate), then stop. The next PARSE_VOTE_FETCH_AHEAD
+roll calls are requested concurrently while the current one is parsed, and the
+legislators are resolved from maps loaded once per run.
 """
 
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import Dict, Iterator, List, Tuple
 import requests
+from requests.adapters import HTTPAdapter
 from lxml import etree
 from lxml.etree import Element
 import json
@@ -27,10 +33,13 @@ import time
 import os
 
 from congress_db.session import Session
+from congress_parser.utils.cache_version import bump_cache_version
 from congress_db.models import LegislationVote, LegislatorVote, LegislatorVoteType, Legislation, LegislationChamber, Legislator, Congress
 from congress_parser.bioguide.manager import BioGuideImporter
 
 webhook_url = os.environ.get("DISCORD_WEBHOOK", None)
+# How many roll calls to have in flight ahead of the one being parsed
+FETCH_AHEAD = int(os.environ.get("PARSE_VOTE_FETCH_AHEAD", 8))
 
 def calculate_congress_from_year() -> int:
     current_year = datetime.now().year
@@ -73,24 +82,103 @@ def get_latest_senate_rollcall(session) -> int:
     else:
         return legislation_vote.number
 
-def download_house_rollcall(session, formatted, congress):
+def probe_rollcalls(
+    url_template: str, formatted: dict, index_key: str, http=None, ahead: int = FETCH_AHEAD
+) -> Iterator[Tuple[int, requests.Response]]:
+    """
+    Yields (index, response) for the roll calls after formatted[index_key], in order,
+    keeping up to `ahead` requests in flight. The caller breaks out at the first gap,
+    the requests still queued then are cancelled.
+    """
+    if http is None:
+        http = requests.Session()
+        http.mount("https://", HTTPAdapter(pool_maxsize=ahead))
+
+    def fetch(index):
+        url = url_template.format(**{**formatted, index_key: index})
+        logging.info(f"Fetching rollcall vote from {url}")
+        return http.get(url, timeout=60)
+
+    next_index = formatted[index_key] + 1
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=ahead) as pool:
+        try:
+            while True:
+                while len(pending) < ahead:
+                    pending.append((next_index, pool.submit(fetch, next_index)))
+                    next_index += 1
+                index, future = pending.popleft()
+                yield index, future.result()
+        finally:
+            for _, queued in pending:
+                queued.cancel()
+
+
+def load_member_lookups(session) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """
+    The bioguide ids of every known legislator, keyed by bioguide id (House votes)
+    and by LIS id (Senate votes)
+    """
+    by_bioguide = {}
+    by_lis = {}
+    for bioguide_id, lis_id in session.query(Legislator.bioguide_id, Legislator.lis_id):
+        by_bioguide[bioguide_id] = bioguide_id
+        if lis_id is not None:
+            by_lis[lis_id] = bioguide_id
+    return by_bioguide, by_lis
+
+
+def legislator_vote_rows(
+    legislation_vote_id: int, by_legislator: dict, bioguide_for: Dict[str, str]
+) -> List[dict]:
+    """
+    LegislatorVote rows for one roll call, members we do not know are logged and skipped
+    """
+    rows = []
+    for member_id, vote_info in by_legislator.items():
+        bioguide_id = bioguide_for.get(member_id)
+        if bioguide_id is None:
+            logging.info(f"Missing legislator information for {member_id}")
+            continue
+        rows.append(
+            {
+                'legislation_vote_id': legislation_vote_id,
+                'legislator_bioguide_id': bioguide_id,
+                **vote_info
+            }
+        )
+    return rows
+
+
+def write_legislator_votes(session, rows: List[dict]):
+    """
+    One multi-row insert per roll call
+    """
+    try:
+        if rows:
+            session.execute(LegislatorVote.__table__.insert(), rows)
+        session.commit()
+    except:
+        session.rollback()
+        logging.error(f"Could not commit LegislatorVote to database")
+
+
+def download_house_rollcall(session, formatted, congress, by_bioguide=None):
     """
     Fetches House roll-call votes starting from the last known index.
     Parses each XML response to extract vote totals by party, individual
     legislator votes, and links them to existing Legislation records.
     Stops when a 404 response indicates no more votes exist.
     """
+    if by_bioguide is None:
+        by_bioguide, _ = load_member_lookups(session)
     HOUSE_ROLL_TEMPLATE = "https://clerk.house.gov/evs/{year}/roll{h_index:03}.xml" # Index 3 digits
 
     rec = []
 
-    while True:
+    for index, resp in probe_rollcalls(HOUSE_ROLL_TEMPLATE, formatted, 'h_index'):
         print("-"*50)
-        formatted['h_index'] = formatted['h_index'] + 1
-
-        url = HOUSE_ROLL_TEMPLATE.format(**formatted)
-        logging.info(f"Fetching House rollcall vote from {url}")
-        resp = requests.get(url)
+        formatted['h_index'] = index
 
         if resp.status_code == 404:
             logging.info(f"Completed fetch at {formatted['h_index']} with 404 error")
@@ -197,31 +285,10 @@ def download_house_rollcall(session, formatted, congress):
                         logging.error(f"Could not commit LegislationVote to database")
                         continue
 
-                    legislator_votes = []
-                    for bioguide_id, vote_info in by_legislator.items():
-                        legislator = (session
-                            .query(Legislator)
-                            .filter(Legislator.bioguide_id == bioguide_id)
-                            .first())
-
-                        if legislator is None:
-                            logging.info(f"Missing legislator information for {bioguide_id}")
-                            continue
-
-                        legislator_vote_data = {
-                            'legislation_vote_id': legislation_vote.id,
-                            'legislator_bioguide_id': bioguide_id,
-                            **vote_info
-                        }
-
-                        legislator_vote = LegislatorVote(**legislator_vote_data)
-                        legislator_votes.append(legislator_vote)
-
-                    try:
-                        session.add_all(legislator_votes)
-                        session.commit()
-                    except:
-                        logging.error(f"Could not commit LegislatorVote to database")
+                    write_legislator_votes(
+                        session,
+                        legislator_vote_rows(legislation_vote.id, by_legislator, by_bioguide),
+                    )
 
                     logging.info(f"Finished parsing rollcall {formatted['h_index']}")
                 else:
@@ -229,24 +296,22 @@ def download_house_rollcall(session, formatted, congress):
 
     return rec
 
-def download_senate_rollcall(session, formatted, congress):
+def download_senate_rollcall(session, formatted, congress, by_lis=None):
     """
     Fetches Senate roll-call votes starting from the last known index.
     Senate XML uses a different structure than House — vote totals are in
     <count> and individual votes are in <members><member> with LIS IDs.
     Stops when the response Content-Type is not text/xml (no more votes).
     """
+    if by_lis is None:
+        _, by_lis = load_member_lookups(session)
     SENATE_ROLL_TEMPLATE = "https://www.senate.gov/legislative/LIS/roll_call_votes/vote{congress}{session}/vote_{congress}_{session}_{s_index:05}.xml" #Index 5 digits
 
     rec = []
 
-    while True:
+    for index, resp in probe_rollcalls(SENATE_ROLL_TEMPLATE, formatted, 's_index'):
         print("-"*50)
-        formatted['s_index'] = formatted['s_index'] + 1
-
-        url = SENATE_ROLL_TEMPLATE.format(**formatted)
-        logging.info(f"Fetching Senate rollcall vote from {url}")
-        resp = requests.get(url)
+        formatted['s_index'] = index
 
         if resp.headers.get('Content-Type') != 'text/xml':
             logging.info(f"Completed fetch at {formatted['s_index']} with 404 error")
@@ -345,31 +410,10 @@ def download_senate_rollcall(session, formatted, congress):
                         logging.error(f"Could not commit LegislationVote to database")
                         continue
 
-                    legislator_votes = []
-                    for lis_id, vote_info in by_legislator.items():
-                        legislator = (session
-                            .query(Legislator)
-                            .filter(Legislator.lis_id == lis_id)
-                            .first())
-
-                        if legislator is None:
-                            logging.info(f"Missing legislator information for {lis_id}")
-                            continue
-
-                        legislator_vote_data = {
-                            'legislation_vote_id': legislation_vote.id,
-                            'legislator_bioguide_id': legislator.bioguide_id,
-                            **vote_info
-                        }
-
-                        legislator_vote = LegislatorVote(**legislator_vote_data)
-                        legislator_votes.append(legislator_vote)
-
-                    try:
-                        session.add_all(legislator_votes)
-                        session.commit()
-                    except:
-                        logging.error(f"Could not commit LegislatorVote to database")
+                    write_legislator_votes(
+                        session,
+                        legislator_vote_rows(legislation_vote.id, by_legislator, by_lis),
+                    )
 
                     logging.info(f"Finished parsing rollcall {formatted['s_index']}")
                 else:
@@ -407,8 +451,11 @@ def download_to_database():
         's_index': get_latest_senate_rollcall(session),
     }
 
-    house_rec = download_house_rollcall(session, formatted, CURRENT_CONGRESS)
-    senate_rec = download_senate_rollcall(session, formatted, CURRENT_CONGRESS)
+    by_bioguide, by_lis = load_member_lookups(session)
+    house_rec = download_house_rollcall(session, formatted, CURRENT_CONGRESS, by_bioguide)
+    senate_rec = download_senate_rollcall(session, formatted, CURRENT_CONGRESS, by_lis)
+    if house_rec or senate_rec:
+        bump_cache_version(session)
 
     send_message(
         f"Added {len(house_rec)} House and {len(senate_rec)} Senate rollcall votes today"
@@ -7,6 +7,8 @@ from congress_db.models import (
 from congress_db.session import Session
 import json
 from congress_parser.utils.logger import LogContext
+from congress_parser.importers.search_documents import refresh_version_documents
+from congress_parser.utils.cache_version import bump_cache_version
 import jsonschema
 
 from datetime import datetime
@@ -109,3 +111,6 @@ def bill_tagger(legis_version_id: int, prompt_id: int):
         # Store the prompt batch
         session.add(prompt_batch)
         session.commit()
+        if prompt_batch.successful:
+            refresh_version_documents(session, [legis_version_id])
+            bump_cache_version(session)
@@ -7,6 +7,7 @@ from congress_db.models import (
 from congress_db.session import Session
 import json
 from congress_parser.utils.logger import LogContext
+from congress_parser.utils.cache_version import bump_cache_version
 import jsonschema
 from collections import defaultdict
 
@@ -116,3 +117,5 @@ def clause_tagger(legis_version_id: int, prompt_id: int):
         # Store the prompt batch
         session.add(prompt_batch)
         session.commit()
+        if prompt_batch.successful:
+            bump_cache_version(session)
@@ -4,6 +4,8 @@ from congress_db.models import LegislationContent, PromptBatch
 from congress_db.session import Session
 import json
 from congress_parser.utils.logger import LogContext
+from congress_parser.importers.search_documents import refresh_version_documents
+from congress_parser.utils.cache_version import bump_cache_version
 import jsonschema
 from typing import List
 from congress_db.models import LegislationContentSummary
@@ -130,3 +132,6 @@ def section_summarizer(
                 prompt_batch.failed += 1
             prompt_batch.completed_at = datetime.now()
             session.commit()
+            if prompt_batch.successful:
+                refresh_version_documents(session, [legislation_version_id])
+                bump_cache_version(session)
@@ -32,7 +32,8 @@ ZIP filename convention: BILLS-{congress}{chamber}{number}{version}.xml
     e.g. BILLS-118hr1234ih.xml = 118th Congress, House, bill 1234, Introduced in House
 """
 
-from collections import defaultdict
+import io
+import itertools
 import os
 import re
 import sys
@@ -41,6 +42,7 @@ import logging
 import traceback
 from zipfile import ZipFile
 import hashlib
+from collections import deque
 import datetime
 import dateutil.parser as parser
 
@@ -52,6 +54,7 @@ from unidecode import unidecode  # GPLV2
 import sqlalchemy
 
 from sqlalchemy import desc
+from sqlalchemy.dialects.postgresql import insert
 
 from congress_parser.actions import ActionObject
 from congress_parser.actions import determine_action as determine_action2
@@ -63,6 +66,7 @@ from congress_db.models import (
     LegislationVersion,
     LegislationVersionEnum,
     LegislationChamber,
+    LegislationSourceFile,
     LegislationType,
     USCContentDiff,
     USCContent,
@@ -76,13 +80,19 @@ from congress_parser.metadata.sponsors import (
     extract_sponsors_from_api,
 )
 
+from congress_parser.importers.search_documents import (
+    record_latest_versions,
+    refresh_search_documents,
+)
 from congress_parser.utils.logger import LogContext
+from congress_parser.utils.bulk import copy_rows, reserve_ids
+from congress_parser.utils.cache_version import bump_cache_version
 from congress_parser.utils.cite_parser import parse_action_for_cite, ActionObject
 from congress_db.session import Session, init_session
 from congress_parser.translater import translate_paragraph
 
 from joblib import Parallel, delayed
-from typing import Any, Dict, List, Optional
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypedDict, Union
 from functools import lru_cache
 
 text_paths = ["legis-body/section/subsection/text", "legis-body/section/text"]
@@ -98,6 +108,14 @@ EXISTING_CONGRESS = {}
 CURRENT_CONGRESS = None
 # -1 tells joblib to use all available CPU cores
 THREADS = int(os.environ.get("PARSE_THREADS", -1))
+# Write each bill's content tree with a single COPY rather than a commit per node
+BULK_CONTENT = os.environ.get("PARSE_BULK_CONTENT", "1") == "1"
+# Stream bills through iterparse instead of building the whole tree, always writes with COPY
+STREAMING = os.environ.get("PARSE_STREAMING", "1") == "1"
+# Records per id reservation and COPY when writing a bill's content
+CONTENT_CHUNK = int(os.environ.get("PARSE_CONTENT_CHUNK", 500))
+# Also decompress and sha256 members whose CRC32/size match before skipping them
+VERIFY_SHA256 = os.environ.get("PARSE_VERIFY_SHA256", "0") == "1"
 
 
 def strip_arr(arr: List[str]) -> List[str]:
@@ -190,10 +208,70 @@ def find_or_create_bill(bill_obj: dict, title: str, session: "SQLAlchemy.session
         created_at=datetime.datetime.now(),
     )
     session.add(new_bill_version)
-    session.commit()
+    session.flush()
+    record_latest_versions(session, [new_bill.legislation_id])
     return (new_bill, new_bill_version)
 
 
+def _is_content_tag(tag: str) -> bool:
+    return "content" in tag or "chapeau" in tag or "notes" in tag or "text" in tag
+
+
+def extract_content_fields(search_element: Element) -> Optional[Dict[str, Any]]:
+    """
+    Pulls the LegislationContent column values out of a single bill XML element.
+
+    Bill XML elements follow a consistent child layout:
+        [0] = <enum> (e.g. "(a)", "1.", "SEC. 2.")
+        [1] = <header>/<heading> (section title) OR <text>/<content> if no heading
+        [2] = <text>/<content>/<chapeau>/<notes> (body text, if heading exists)
+
+    Returns:
+        Optional[Dict[str, Any]]: The column values, or None if the element is not
+        a structural node we store
+    """
+    if search_element.tag == "legis-body":
+        # Root node of the bill body — container for all sections
+        return {
+            "content_type": search_element.tag,
+            "section_display": None,
+            "heading": None,
+            "content_str": None,
+            "lc_ident": None,
+        }
+    if ("id" in search_element.attrib) and len(search_element) > 1:
+        # Structural element with children: extract enum, heading, and content text.
+        # Child layout: [0]=enum, [1]=heading (or content if no heading), [2]=content text
+        enum = search_element[0]
+        heading = search_element[1]
+        content_str = None
+        if len(search_element) > 2:
+            content_elem = search_element[2]
+            if _is_content_tag(content_elem.tag):
+                content_str = convert_to_text(content_elem)
+        if "head" in heading.tag:
+            # Standard case: [1] is a heading element (e.g. <header>, <heading>)
+            return {
+                "content_type": search_element.tag,
+                "section_display": enum.text,
+                "heading": heading.text if heading is not None else None,
+                "content_str": content_str,
+                "lc_ident": search_element.attrib.get("id", None),
+            }
+        # No heading — [1] is actually content/text, not a heading
+        if _is_content_tag(heading.tag):
+            content_str = convert_to_text(heading)
+        return {
+            "content_type": search_element.tag,
+            "section_display": enum.text,
+            "heading": None,
+            "content_str": content_str,
+            "lc_ident": None,
+        }
+    logging.debug(f"Items look like: {search_element.tag} and {len(search_element)}")
+    return None
+
+
 def recursive_bill_content(
     content_id: int,
     search_element: Element,
@@ -209,90 +287,26 @@ def recursive_bill_content(
     Recursively traverses the bill XML tree starting from <legis-body>,
     creating LegislationContent records for each structural element.
 
-    Bill XML elements follow a consistent child layout:
-        [0] = <enum> (e.g. "(a)", "1.", "SEC. 2.")
-        [1] = <header>/<heading> (section title) OR <text>/<content> if no heading
-        [2] = <text>/<content>/<chapeau>/<notes> (body text, if heading exists)
-
     Only elements with an "id" attribute are considered structural (sections,
     subsections, paragraphs, etc.). Elements without "id" are skipped during
     recursion.
+
+    This commits once per node so the children can see their parent's id, see
+    write_bill_content_bulk for the batched equivalent.
     """
     extracted_action = []
     res: List[LegislationContent] = []
     content = None
 
-    if search_element.tag == "legis-body":
-        # Root node of the bill body — container for all sections
+    fields = extract_content_fields(search_element)
+    if fields is not None:
         content = LegislationContent(
-            content_type=search_element.tag,
             parent_id=content_id,
             order_number=order,
             legislation_version_id=legis_version_id,
-            section_display=None,
-            content_str=None,
-        )
-    elif ("id" in search_element.attrib) and len(search_element) > 1:
-        # Structural element with children: extract enum, heading, and content text.
-        # Child layout: [0]=enum, [1]=heading (or content if no heading), [2]=content text
-        enum = search_element[0]
-        heading = search_element[1]
-        content_str = None
-        if len(search_element) > 2:
-            content_elem = search_element[2]
-            if (
-                "content" in content_elem.tag
-                or "chapeau" in content_elem.tag
-                or "notes" in content_elem.tag
-                or "text" in content_elem.tag
-            ):
-                content_str = convert_to_text(content_elem)
-        if "head" in heading.tag:
-            # Standard case: [1] is a heading element (e.g. <header>, <heading>)
-            content = LegislationContent(
-                content_type=search_element.tag,
-                parent_id=content_id,
-                order_number=order,
-                legislation_version_id=legis_version_id,
-                section_display=enum.text,
-                content_str=content_str,
-                heading=heading.text if heading is not None else None,
-                lc_ident=search_element.attrib.get("id", None),
-            )
-        else:
-            # No heading — [1] is actually content/text, not a heading
-            content_elem = heading
-            if (
-                "content" in content_elem.tag
-                or "chapeau" in content_elem.tag
-                or "notes" in content_elem.tag
-                or "text" in content_elem.tag
-            ):
-                content_str = convert_to_text(content_elem)
-            content = LegislationContent(
-                content_type=search_element.tag,
-                parent_id=content_id,
-                order_number=order,
-                legislation_version_id=legis_version_id,
-                section_display=enum.text,
-                content_str=content_str,
-                # heading=heading.text if heading is not None else None,
-            )
-    else:
-        logging.debug(
-            f"Items look like: {search_element.tag} and {len(search_element)}"
+            **fields,
         )
-    if content is not None:
-        # print(content.content_type, content.content_str)
         session.add(content)
-    if True:
-        root_path = search_element.getroottree().getpath(search_element)
-        sections = root_path.split("/section")
-        if len(sections) > 2 and search_element.tag != "legis-body":
-            pass
-        elif "quote" in root_path:
-            # print("Within quote")
-            pass
     if (search_element.tag == "legis-body" or "id" in search_element.attrib) and len(
         search_element
     ) > 0:
@@ -320,6 +334,372 @@ def recursive_bill_content(
     return res
 
 
+# Column order used by the COPY in write_bill_content_bulk
+BILL_CONTENT_COLUMNS = [
+    "legislation_content_id",
+    "parent_id",
+    "order_number",
+    "legislation_version_id",
+    "content_type",
+    "section_display",
+    "heading",
+    "content_str",
+    "lc_ident",
+]
+
+
+def flatten_bill_content(legis: Element) -> List[Dict[str, Any]]:
+    """
+    Walks the <legis-body> tree in the same order as recursive_bill_content and returns
+    one record per stored node. Parents are referenced by their pre-order "index"
+    ("parent_index"), so ids can be assigned afterwards in a single pass.
+
+    Args:
+        legis (Element): The <legis-body> element
+
+    Returns:
+        List[Dict[str, Any]]: Pre-order list of node records
+    """
+    records: List[Dict[str, Any]] = []
+    # (element, parent_index, order)
+    stack = [(legis, None, 0)]
+    while stack:
+        search_element, parent_index, order = stack.pop()
+        fields = extract_content_fields(search_element)
+        my_index = None
+        if fields is not None:
+            my_index = len(records)
+            records.append(
+                {
+                    "index": my_index,
+                    "parent_index": parent_index,
+                    "order_number": order,
+                    **fields,
+                }
+            )
+        if (
+            search_element.tag == "legis-body" or "id" in search_element.attrib
+        ) and len(search_element) > 0:
+            if my_index is None:
+                # The ORM path cannot attach children to a node it did not store either
+                continue
+            children = [x for x in search_element if "id" in x.attrib]
+            # Reversed so that the pops come back out in document order
+            for child_order in range(len(children) - 1, -1, -1):
+                stack.append((children[child_order], my_index, child_order))
+    return records
+
+
+def bill_content_rows(
+    records: List[Dict[str, Any]],
+    ids: List[int],
+    legis_version_id: int,
+    ancestors: Optional[List[Tuple[int, int]]] = None,
+) -> List[tuple]:
+    """
+    Zips the content records with their reserved ids into COPY rows, in
+    BILL_CONTENT_COLUMNS order. Ids are handed out in pre-order of the record "index".
+
+    A record whose parent was not stored is dropped along with its descendants,
+    the ORM path cannot attach those either.
+
+    Parents are looked up on `ancestors`, the (index, id) path down to the last stored
+    record. In pre-order a stored parent is always on it, so only the current depth is
+    kept. Pass the same list to every chunk of one bill.
+    """
+    rows = []
+    if ancestors is None:
+        ancestors = []
+    for record, content_id in zip(sorted(records, key=lambda x: x["index"]), ids):
+        parent_index = record["parent_index"]
+        parent_id = None
+        if parent_index is None:
+            ancestors.clear()
+        else:
+            depth = len(ancestors) - 1
+            while depth >= 0 and ancestors[depth][0] != parent_index:
+                depth -= 1
+            if depth < 0:
+                continue
+            del ancestors[depth + 1 :]
+            parent_id = ancestors[depth][1]
+        ancestors.append((record["index"], content_id))
+        rows.append(
+            (
+                content_id,
+                parent_id,
+                record["order_number"],
+                legis_version_id,
+                record["content_type"],
+                record["section_display"],
+                record["heading"],
+                record["content_str"],
+                record["lc_ident"],
+            )
+        )
+    return rows
+
+
+def write_bill_records(
+    records: Iterable[Dict[str, Any]],
+    legis_version_id: int,
+    session: "SQLAlchemy.session",
+) -> int:
+    """
+    Stores already extracted content records, in pre-order, with one id reservation
+    and one COPY per CONTENT_CHUNK records. Records are pulled as they are written, so
+    a streamed bill goes to the database while it is being read.
+
+    Returns:
+        int: Number of LegislationContent rows written
+    """
+    records = iter(records)
+    ancestors: List[Tuple[int, int]] = []
+    written = 0
+    while True:
+        chunk = list(itertools.islice(records, CONTENT_CHUNK))
+        if not chunk:
+            return written
+        ids = reserve_ids(
+            session, LegislationContent.__tablename__, "legislation_content_id", len(chunk)
+        )
+        rows = bill_content_rows(chunk, ids, legis_version_id, ancestors)
+        copy_rows(session, LegislationContent.__tablename__, BILL_CONTENT_COLUMNS, rows)
+        written += len(rows)
+
+
+def write_bill_content_bulk(
+    legis: Element, legis_version_id: int, session: "SQLAlchemy.session"
+) -> int:
+    """
+    Stores the whole <legis-body> tree for a bill version with a COPY per
+    CONTENT_CHUNK nodes, instead of a commit per node. Produces the same parent_id/order_number
+    graph as recursive_bill_content, and ids follow the same pre-order.
+
+    Returns:
+        int: Number of LegislationContent rows written
+    """
+    return write_bill_records(flatten_bill_content(legis), legis_version_id, session)
+
+
+class BillDocument(TypedDict):
+    # Raw <dublinCore> title text, None if it is missing
+    title: Optional[str]
+    # (date attribute, text) of the last <form><action> date element
+    form_date: Optional[Tuple[Optional[str], Optional[str]]]
+    has_legis_body: bool
+    # Tree mode keeps the <legis-body> element around
+    legis: Optional[Element]
+    # Streaming mode only keeps the extracted content records, readable once while
+    # the source is open
+    records: Optional[Iterator[Dict[str, Any]]]
+
+
+# Raw XML, or a binary file object such as an open ZIP member
+BillSource = Union[str, bytes, IO[bytes]]
+
+
+def _as_xml_file(f: BillSource) -> IO[bytes]:
+    if hasattr(f, "read"):
+        return f
+    # lxml refuses str input that carries an encoding declaration
+    if isinstance(f, str):
+        f = f.encode("utf-8")
+    return io.BytesIO(f)
+
+
+def read_bill_document(f: BillSource) -> BillDocument:
+    """
+    Parses the whole bill into an element tree and pulls out what parse_bill needs.
+    """
+    root: Element = etree.parse(_as_xml_file(f)).getroot()
+    dublin_core = root.xpath("//dublinCore")
+    title = None
+    if len(dublin_core) > 0 and len(dublin_core[0]) > 0:
+        title = dublin_core[0][0].text
+    # Certain bill versions use <action-date date="..."> while
+    # others use <date>text</date> — try both XPath patterns
+    form_dates = root.xpath("//form/action/action-date") + root.xpath(
+        "//form/action/date"
+    )
+    form_date = None
+    if len(form_dates) > 0:
+        form_date = (form_dates[-1].get("date"), form_dates[-1].text)
+    legis = root.xpath("//legis-body")
+    return {
+        "title": title,
+        "form_date": form_date,
+        "has_legis_body": len(legis) > 0,
+        "legis": legis[0] if len(legis) > 0 else None,
+        "records": None,
+    }
+
+
+def _release_element(elem: Element) -> None:
+    """
+    Frees a closed structural element while iterparse is still building its parent.
+
+    The parent's own fields are read from its first three children (enum, heading and
+    text), and content elements are flattened as a whole by convert_to_text, so those
+    are left alone. Everything else is cleared, and siblings we already released are
+    dropped, so len(parent) stays above the thresholds extract_content_fields checks.
+    """
+    parent = elem.getparent()
+    if parent is None or _is_content_tag(parent.tag):
+        return
+    head = parent[:3]
+    if any(elem is x for x in head):
+        return
+    elem.clear(keep_tail=True)
+    previous = elem.getprevious()
+    while previous is not None and not any(previous is x for x in head):
+        parent.remove(previous)
+        previous = elem.getprevious()
+
+
+def iter_bill_content(
+    source: BillSource, document: Optional[dict] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Streams a bill with lxml's iterparse and yields the content records of the first
+    <legis-body>, the same records in the same pre-order as flatten_bill_content, so
+    they can go straight to write_bill_records.
+
+    A record is known once its enum, heading and text (its first three children) have
+    closed, or the element itself has, and goes out as soon as every record before it
+    has. Elements are released as soon as they are done with, so memory is bounded by
+    the nesting depth of the bill rather than its size. The title and form date are
+    collected into `document` as they stream past.
+    """
+    if document is None:
+        document = {}
+    document.setdefault("title", None)
+    document.setdefault("form_date", None)
+    document.setdefault("has_legis_body", False)
+    action_date = None
+    date = None
+    seen_dublin_core = False
+
+    # Structural elements in document order, until their record goes out:
+    # {"parent", "order", "fields", "known", "index"}, index is set once it is stored
+    pending = deque()
+    next_index = 0
+
+    def known(node: dict, elem: Element):
+        node["fields"] = extract_content_fields(elem)
+        node["known"] = True
+
+    def ready() -> Iterator[Dict[str, Any]]:
+        nonlocal next_index
+        while pending and pending[0]["known"]:
+            node = pending.popleft()
+            parent = node["parent"]
+            if node["fields"] is None or (parent is not None and parent["index"] is None):
+                # Not stored, and neither are its descendants
+                continue
+            node["index"] = next_index
+            next_index += 1
+            yield {
+                "index": node["index"],
+                "parent_index": parent["index"] if parent is not None else None,
+                "order_number": node["order"],
+                **node["fields"],
+            }
+
+    # One frame per open element: [structural node or None, next child order]
+    stack: List[list] = []
+    in_body = False
+    for event, elem in etree.iterparse(
+        _as_xml_file(source), events=("start", "end")
+    ):
+        if not isinstance(elem.tag, str):
+            continue
+        if event == "start":
+            node = None
+            if elem.tag == "legis-body" and not document["has_legis_body"]:
+                document["has_legis_body"] = True
+                in_body = True
+                node = {"parent": None, "order": 0, "index": None}
+                # Nothing under <legis-body> changes its record
+                known(node, elem)
+            elif in_body and stack and stack[-1][0] is not None and "id" in elem.attrib:
+                node = {"parent": stack[-1][0], "order": stack[-1][1], "index": None}
+                node["known"] = False
+                stack[-1][1] += 1
+            if node is not None:
+                pending.append(node)
+                yield from ready()
+            stack.append([node, 0])
+            continue
+
+        node, _ = stack.pop()
+        parent = stack[-1][0] if stack else None
+        if parent is not None and not parent["known"]:
+            parent_elem = elem.getparent()
+            if len(parent_elem) > 2 and not any(elem is x for x in parent_elem[:2]):
+                # The parent's first three children are complete
+                known(parent, parent_elem)
+        if node is not None:
+            if not node["known"]:
+                known(node, elem)
+            if node["parent"] is None:
+                in_body = False
+        yield from ready()
+        if node is not None:
+            if node["parent"] is None:
+                elem.clear()
+            else:
+                _release_element(elem)
+        elif elem.tag == "dublinCore" and not seen_dublin_core:
+            seen_dublin_core = True
+            if len(elem) > 0:
+                document["title"] = elem[0].text
+        elif elem.tag in ("action-date", "date"):
+            parent_elem = elem.getparent()
+            if (
+                parent_elem is not None
+                and parent_elem.tag == "action"
+                and parent_elem.getparent() is not None
+                and parent_elem.getparent().tag == "form"
+            ):
+                if elem.tag == "date":
+                    date = (elem.get("date"), elem.text)
+                else:
+                    action_date = (elem.get("date"), elem.text)
+                document["form_date"] = date if date is not None else action_date
+        if len(stack) == 1 and not in_body:
+            # Direct children of the root are done once they close
+            elem.clear()
+
+
+def stream_bill_document(f: BillSource) -> BillDocument:
+    """
+    Streaming counterpart of read_bill_document. The parse stops at the first content
+    record, by which point the <dublinCore> and <form> ahead of the body have been
+    read, and "records" picks it up from there, so the content is written while the
+    rest of the bill is read and never collected.
+    """
+    document: dict = {"legis": None}
+    records = iter_bill_content(f, document)
+    first = next(records, None)
+    document["records"] = (
+        records if first is None else itertools.chain([first], records)
+    )
+    return document
+
+
+def _parse_form_date(form_date: Optional[Tuple[Optional[str], Optional[str]]]):
+    date_attr, date_text = form_date
+    try:
+        return parser.parse(date_attr)
+    except:
+        try:
+            return parser.parse(date_text)
+        except:
+            logging.error("Unable to parse date")
+    return None
+
+
 def check_for_existing_legislation_version(bill_obj: object) -> Optional[LegislationVersion]:
     session = Session()
     # Check to see if we've already ingested this bill
@@ -379,19 +759,132 @@ def retrieve_existing_legislations(session) -> List[dict]:
     ]
 
 
+class _HashingReader:
+    """
+    Wraps a binary file object and hashes everything read through it, so the sha256
+    of a ZIP member is available once the parser has consumed it.
+    """
+
+    def __init__(self, raw: IO[bytes]):
+        self.raw = raw
+        self.hash = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.raw.read(size)
+        self.hash.update(data)
+        return data
+
+    def hexdigest(self) -> str:
+        """
+        The sha256 of the whole member, reading whatever the parser left unread
+        """
+        while self.read(1 << 20):
+            pass
+        return self.hash.hexdigest()
+
+
+def load_source_fingerprints(session) -> Dict[str, Tuple[int, int, Optional[str]]]:
+    """
+    Returns the stored (crc32, file_size, sha256) fingerprint for every archive member
+    we have ingested before, keyed by member name.
+    """
+    results = session.query(
+        LegislationSourceFile.member_name,
+        LegislationSourceFile.crc32,
+        LegislationSourceFile.file_size,
+        LegislationSourceFile.sha256,
+    ).all()
+    return {x[0]: (x[1], x[2], x[3]) for x in results}
+
+
+def partition_by_fingerprint(
+    names: List[Dict[str, Any]],
+    fingerprints: Dict[str, Tuple[int, int, Optional[str]]],
+    verify: Optional[Callable[[Dict[str, Any]], str]] = None,
+) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """
+    Splits the archive members into the ones that need parsing and the ones that are
+    unchanged since the last run, using the CRC32/size from the ZIP central directory.
+
+    Args:
+        names (List[Dict[str, Any]]): Member records from parse_archives
+        fingerprints (Dict): Output of load_source_fingerprints
+        verify (Callable, optional): Returns the sha256 of a member, when given, members
+            whose CRC32/size match are only skipped if their stored sha256 matches too
+
+    Returns:
+        Tuple[List[Dict[str, Any]], Dict[str, int]]: The members to parse, each tagged with
+        "changed", and the parsed/skipped/changed counts
+    """
+    to_parse = []
+    counts = {"parsed": 0, "skipped": 0, "changed": 0}
+    for name in names:
+        stored = fingerprints.get(name["path"].split("/")[-1])
+        unchanged = stored is not None and (stored[0], stored[1]) == (
+            name["crc32"],
+            name["file_size"],
+        )
+        if unchanged and verify is not None and stored[2] is not None:
+            unchanged = verify(name) == stored[2]
+        if unchanged:
+            counts["skipped"] += 1
+            continue
+        name["changed"] = stored is not None
+        if name["changed"]:
+            counts["changed"] += 1
+        counts["parsed"] += 1
+        to_parse.append(name)
+    return to_parse, counts
+
+
+def record_source_fingerprint(
+    session, archive_obj: dict, legislation_version_id: Optional[int]
+) -> None:
+    """
+    Upserts the fingerprint of the archive member parse_bill was handed, so the next run
+    can skip it. Does nothing when the bill did not come from an archive member.
+    """
+    fingerprint = archive_obj.get("fingerprint")
+    if fingerprint is None:
+        return
+    reader = archive_obj.get("reader")
+    values = {
+        "member_name": archive_obj["file"],
+        "archive_name": archive_obj["archive"],
+        "crc32": fingerprint["crc32"],
+        "file_size": fingerprint["file_size"],
+        "sha256": reader.hexdigest() if reader is not None else None,
+        "legislation_version_id": legislation_version_id,
+    }
+    query = insert(LegislationSourceFile).values(**values)
+    query = query.on_conflict_do_update(
+        index_elements=[LegislationSourceFile.member_name],
+        set_={
+            "archive_name": query.excluded.archive_name,
+            "crc32": query.excluded.crc32,
+            "file_size": query.excluded.file_size,
+            "sha256": query.excluded.sha256,
+            "legislation_version_id": query.excluded.legislation_version_id,
+            "updated_at": datetime.datetime.now(),
+        },
+    )
+    session.execute(query)
+
+
 def parse_bill(
-    f: str, path: str, bill_obj: object, archive_obj: object
+    f: BillSource, path: str, bill_obj: object, archive_obj: object
 ) -> LegislationVersion:
     """
     Parses a single bill's XML content and stores it in the database.
 
     Steps:
-    1. Parse the raw XML string into an lxml Element tree
+    1. Parse the raw XML, either streamed with iterparse (PARSE_STREAMING, the default)
+       or loaded into a full lxml Element tree
     2. Skip if this bill version was already ingested (idempotency check)
     3. Extract the bill title from <dublinCore> metadata
     4. Extract the effective date from <form><action><action-date>
     5. Extract sponsor information via the congress.gov API
-    6. Recursively traverse <legis-body> to store all content in LegislationContent
+    6. Traverse <legis-body> to store all content in LegislationContent
     """
     init_session()
     with LogContext(
@@ -409,34 +902,29 @@ def parse_bill(
             int(bill_obj["congress_session"]), session
         )
         try:
-            # Parse the raw XML string into an element tree
-            root: Element = etree.fromstring(f)
+            if STREAMING:
+                document = stream_bill_document(f)
+            else:
+                document = read_bill_document(f)
             found = check_for_existing_legislation_version(bill_obj)
             if found:
                 logging.info(f"Skipping {archive_obj.get('file')}")
                 if found.effective_date is None:
                     logging.info("Missing effective date, re-parsing")
-                    # Certain bill versions use <action-date date="..."> while
-                    # others use <date>text</date> — try both XPath patterns
-                    form_dates = root.xpath("//form/action/action-date") + root.xpath("//form/action/date")
-                    if len(form_dates) > 0:
-                        last_date = form_dates[-1]
-                        try:
-                            found.effective_date = parser.parse(
-                                last_date.get("date")
-                            )
-                        except:
-                            try:
-                                found.effective_date = parser.parse(last_date.text)
-                            except:
-                                logging.error("Unable to parse date")
+                    if document["form_date"] is not None:
+                        effective_date = _parse_form_date(document["form_date"])
+                        if effective_date is not None:
+                            found.effective_date = effective_date
                     session.commit()
                     session.flush()
+                record_source_fingerprint(
+                    session, archive_obj, found.legislation_version_id
+                )
+                session.commit()
                 return []
 
-            
             try:
-                title = root.xpath("//dublinCore")[0][0].text
+                title = document["title"]
                 if ":" in title:
                     title = title.split(":")[-1].strip()
             except:
@@ -460,21 +948,10 @@ def parse_bill(
 
             new_vers_id = new_bill_version.version_id
             logging.debug(f"New bill has id {new_vers_id}")
-            form_dates = root.xpath("//form/action/action-date") + root.xpath("//form/action/date")
-            if len(form_dates) > 0:
-                last_date = form_dates[-1]
-                try:
-                    new_bill_version.effective_date = parser.parse(
-                        last_date.get("date")
-                    )
-                except:
-                    try:
-                        new_bill_version.effective_date = parser.parse(last_date.text)
-                    except:
-                        logging.error("Unable to parse date")
-            form_element = root.xpath("//form")
-            if len(form_element) > 0:
-                form_element = form_element[0]
+            if document["form_date"] is not None:
+                effective_date = _parse_form_date(document["form_date"])
+                if effective_date is not None:
+                    new_bill_version.effective_date = effective_date
             # extract_sponsors_from_form(form_element, new_bill.legislation_id, session)
             extract_sponsors_from_api(
                 congress_id,
@@ -482,24 +959,57 @@ def parse_bill(
                 new_bill.legislation_id,
                 session,
             )
-            legis = root.xpath("//legis-body")
-            if len(legis) > 0:
-                legis = legis[0]
-            else:
-                logging.warning(f"Bill has {len(legis)} legis-bodies")
+            refresh_search_documents(session, [new_bill.legislation_id], commit=False)
+            if not document["has_legis_body"]:
+                logging.warning("Bill has 0 legis-bodies")
+                record_source_fingerprint(
+                    session, archive_obj, new_bill_version.legislation_version_id
+                )
+                session.commit()
                 return
             session.commit()
-            res = recursive_bill_content(
-                None,
-                legis,
-                0,
-                new_bill_version.legislation_version_id,
-                {},
-                path,
-                new_vers_id,
-                session=session,
-            )
+            if document["records"] is not None:
+                try:
+                    write_bill_records(
+                        document["records"],
+                        new_bill_version.legislation_version_id,
+                        session,
+                    )
+                except etree.XMLSyntaxError:
+                    # The body is read while it is written, so a malformed bill only
+                    # shows up now. Drop the version or the next run would skip it.
+                    session.rollback()
+                    session.delete(new_bill_version)
+                    session.commit()
+                    # The delete cascaded to legislation_latest_version, point it
+                    # back at the bill's previous version
+                    record_latest_versions(
+                        session, [new_bill.legislation_id], commit=False
+                    )
+                    refresh_search_documents(
+                        session, [new_bill.legislation_id], commit=False
+                    )
+                    session.commit()
+                    raise
+            elif BULK_CONTENT:
+                write_bill_content_bulk(
+                    document["legis"], new_bill_version.legislation_version_id, session
+                )
+            else:
+                res = recursive_bill_content(
+                    None,
+                    document["legis"],
+                    0,
+                    new_bill_version.legislation_version_id,
+                    {},
+                    path,
+                    new_vers_id,
+                    session=session,
+                )
             new_bill_version.completed_at = datetime.datetime.now()
+            record_source_fingerprint(
+                session, archive_obj, new_bill_version.legislation_version_id
+            )
             session.commit()
             end_time = time.time()
             logging.info(
@@ -522,6 +1032,41 @@ def parse_bill(
         return new_bill_version, res
 
 
+@lru_cache(maxsize=8)
+def _open_worker_archive(archive_path: str) -> ZipFile:
+    # One handle per archive per worker process, reused across the bills it is handed
+    return ZipFile(archive_path)
+
+
+def parse_bill_member(
+    archive_path: str, member_name: str, path: str, bill_obj: object
+) -> LegislationVersion:
+    """
+    Worker entry point for parse_archives. Only the archive path and member name cross
+    the process boundary; the worker opens the ZIP itself and the decompressed member
+    is streamed straight into lxml without ever becoming a Python str.
+
+    The member is hashed on the way through, and its fingerprint is recorded once the
+    bill has been stored.
+    """
+    archive_obj = {
+        "archive": archive_path.split("/")[-1],
+        "file": member_name.split("/")[-1],
+        "fingerprint": {
+            "crc32": bill_obj["crc32"],
+            "file_size": bill_obj["file_size"],
+        },
+    }
+    with _open_worker_archive(archive_path).open(member_name, "r") as member:
+        archive_obj["reader"] = _HashingReader(member)
+        return parse_bill(archive_obj["reader"], path, bill_obj, archive_obj)
+
+
+def _member_sha256(archive_path: str, member_name: str) -> str:
+    reader = _HashingReader(_open_worker_archive(archive_path).open(member_name, "r"))
+    return reader.hexdigest()
+
+
 def open_usc(title):
     """
     Opens a US Code XML file for the given title number and builds a lookup
@@ -703,12 +1248,12 @@ def parse_archives(
     # TODO: Move these around to select the correct release point given the bill
     names: List[Dict[str, Any]] = []
     rec = []
-    open_archives = []
     arch_ind = 0
     for path in paths:
-        archive = ZipFile(path)
-        open_archives.append(archive)
-        for file in archive.namelist():
+        with ZipFile(path) as archive:
+            members = archive.infolist()
+        for member in members:
+            file = member.filename
             try:
                 parsed = filename_regex.search(file)
                 if parsed is None:
@@ -732,6 +1277,8 @@ def parse_archives(
                         "chamber": LegislationChamber.from_string(chamb[house]),
                         "archive_index": arch_ind,
                         "congress_session": congress_session,
+                        "crc32": member.CRC,
+                        "file_size": member.file_size,
                     }
                 )
             except Exception as e:
@@ -755,44 +1302,37 @@ def parse_archives(
 
         return True
 
-    existing_legislation = retrieve_existing_legislations(session)
-    print("Existing legislation", len(existing_legislation))
-    legis_lookup: Dict[LegislationChamber, List[LegislationVersionEnum]] = defaultdict(
-        lambda: defaultdict(lambda: defaultdict(list))
-    )
-    for leg in existing_legislation:
-        legis_lookup[LegislationChamber(leg["chamber"])][leg["bill_number"]][
-            leg["congress_session"]
-        ].append(LegislationVersionEnum(leg["bill_version"]))
-
-    def filter_existing_legislation(x):
-        return True
-        if x["chamber"] in legis_lookup:
-            if (
-                LegislationVersionEnum(x["bill_version"])
-                in legis_lookup[x["chamber"]][x["bill_number"]][x["congress_session"]]
-            ):
-                return False
-        return True
+    names = [x for x in names if filter_logic(x)]
 
-    # names = [x for x in names if filter_logic(x) and filter_existing_legislation(x)]
-    print("New legislation hmm", len(names))
+    verify = None
+    if VERIFY_SHA256:
+        verify = lambda x: _member_sha256(paths[x["archive_index"]], x["path"])
+    names, counts = partition_by_fingerprint(
+        names, load_source_fingerprints(session), verify
+    )
+    session.close()
+    logging.info("Fingerprint check", extra=counts)
+    print(
+        f"Parsing {counts['parsed']} members ({counts['changed']} changed), "
+        f"skipping {counts['skipped']} unchanged"
+    )
 
+    # The parent only reads the ZIP central directories, each worker opens the
+    # archive itself so the bill text never passes through here
     frec = Parallel(n_jobs=THREADS, backend="loky", verbose=5)(
-        delayed(parse_bill)(
-            open_archives[name["archive_index"]]
-            .open(name["path"], "r")
-            .read()
-            .decode(),
+        delayed(parse_bill_member)(
+            paths[name["archive_index"]],
+            name["path"],
             str(name["bill_number"]),
             name,
-            {"archive": path.split("/")[-1], "file": name["path"].split("/")[-1]},
         )
         for name in names
     )
     for r in frec:
         if r is not None:
             rec.extend(r)
+    if names:
+        bump_cache_version(Session())
 
     return rec
 
@@ -32,14 +32,24 @@ Status XML structure (simplified):
             <legislativeSubjects><item><name>Criminal law</name></item></legislativeSubjects>
         </bill>
     </billStatus>
+
+An archive is imported in batches of PARSE_STATUS_BATCH members. Workers parse the
+members into plain StatusRecord dicts, and the main process writes each batch with a
+handful of multi-row INSERT ... ON CONFLICT statements. The legislation, committee,
+subject and policy area ids are looked up in maps loaded once per archive
+(StatusLookups) instead of being queried per bill.
 """
 
+import os
 from zipfile import ZipFile
-from typing import List
+from typing import Dict, List, Optional, Tuple, TypedDict
 from lxml import etree
 from lxml.etree import Element
 
 from dateutil.parser import parse
+from joblib import Parallel, cpu_count, delayed
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
 
 from congress_db.models import (
     LegislationAction,
@@ -47,6 +57,7 @@ from congress_db.models import (
     Legislation,
     LegislationCommitteeAssociation,
     LegislationChamber,
+    LegislationType,
     Congress,
     LegislativePolicyArea,
     LegislativePolicyAreaAssociation,
@@ -54,30 +65,48 @@ from congress_db.models import (
     LegislativeSubjectAssociation,
 )
 from congress_db.session import Session
+from congress_parser.importers.search_documents import refresh_search_documents
+from congress_parser.utils.cache_version import bump_cache_version
 
+THREADS = int(os.environ.get("PARSE_THREADS", -1))
+# Members handed to a worker at a time, and written per commit
+STATUS_BATCH = int(os.environ.get("PARSE_STATUS_BATCH", 500))
 
-def _ensure_committee_link(committee_id, legislation_id, referred_date, discharge_date):
-    session = Session()
-    existing_obj: LegislationCommitteeAssociation = (
-        session.query(LegislationCommitteeAssociation)
-        .filter(
-            LegislationCommitteeAssociation.legislation_committee_id == committee_id,
-            LegislationCommitteeAssociation.legislation_id == legislation_id,
-        )
-        .first()
-    )
-    if existing_obj is None:
-        new_obj = LegislationCommitteeAssociation(
-            legislation_committee_id=committee_id,
-            legislation_id=legislation_id,
-            referred_date=parse(referred_date),
-            discharge_date=parse(discharge_date),
-            congress_id=None,
-        )
-        session.add(new_obj)
-    else:
-        existing_obj.discharge_date = parse(discharge_date)
-    session.commit()
+# <type> of the status bill -> Legislation.legislation_type
+STATUS_TYPES = {
+    "HR": LegislationType.Bill,
+    "S": LegislationType.Bill,
+    "HRES": LegislationType.Res,
+    "SRES": LegislationType.Res,
+    "HJRES": LegislationType.JRes,
+    "SJRES": LegislationType.JRes,
+    "HCONRES": LegislationType.CRes,
+    "SCONRES": LegislationType.CRes,
+}
+
+
+class StatusCommittee(TypedDict):
+    system_code: str
+    chamber: str
+    name: str
+    committee_type: Optional[str]
+    # Set on subcommittees, the system code of the committee above it
+    parent_system_code: Optional[str]
+    referred_date: Optional[str]
+    discharge_date: Optional[str]
+
+
+class StatusRecord(TypedDict):
+    congress: int
+    chamber: str
+    bill_type: Optional[str]
+    number: int
+    # _nested_dict of each <actions><item>
+    actions: List[dict]
+    # Committees come before their subcommittees
+    committees: List[StatusCommittee]
+    policy_area: Optional[str]
+    subjects: List[str]
 
 
 def _nested_dict(element: Element):
@@ -90,276 +119,367 @@ def _nested_dict(element: Element):
     return {e.tag: e.text if len(e) == 0 else _nested_dict(e) for e in element}
 
 
-def parse_status_actions(actions: List[Element], bill_object: Legislation):
+def _activity_dates(element: Element) -> Tuple[Optional[str], Optional[str]]:
     """
-        Parses xml elements
-        <item>
-    <actionDate>2025-01-20</actionDate>
-    <sourceSystem>
-    <name>Senate</name>
-    </sourceSystem>
-    <text>Passed Senate with an amendment by Yea-Nay Vote. 64 - 35. Record Vote Number: 7. (text: CR S250-251)</text>
-    <type>Floor</type>
-    <recordedVotes>
-    <recordedVote>
-    <rollNumber>7</rollNumber>
-    <url>https://www.senate.gov/legislative/LIS/roll_call_votes/vote1191/vote_119_1_00007.xml</url>
-    <chamber>Senate</chamber>
-    <congress>119</congress>
-    <date>2025-01-20T23:30:58Z</date>
-    <sessionNumber>1</sessionNumber>
-    </recordedVote>
-    </recordedVotes>
-    </item>
+    The referral and discharge dates out of a committee's <activities>
     """
+    referred_date = None
+    discharge_date = None
+    for activity in element.xpath("./activities/item"):
+        a_obj = {e.tag: e.text for e in activity}
+        if a_obj["name"].lower() == "referred to":
+            referred_date = a_obj["date"]
+        elif a_obj["name"].lower() == "discharged from":
+            discharge_date = a_obj["date"]
+    return referred_date, discharge_date
 
-    # Convert the element to a nested dictionary
-    session = Session()
-    existing_actions = (
-        session.query(LegislationAction)
-        .filter(LegislationAction.legislation_id == bill_object.legislation_id)
-        .all()
-    )
 
-    for action in actions:
-        action_dict = _nested_dict(action)
-        try:
-            # Don't insert duplicates
-            if any(action_dict == a.raw for a in existing_actions):
-                continue
-            session.add(
-                LegislationAction(
-                    legislation_id=bill_object.legislation_id,
-                    action_date=parse(action_dict.get("actionDate")),
-                    text=action_dict.get("text"),
-                    action_type=action_dict.get("type"),
-                    action_code=action_dict.get("actionCode"),
-                    source_code=action_dict.get("sourceSystem", {}).get("code"),
-                    source_name=action_dict.get("sourceSystem", {}).get("name"),
-                    raw=action_dict,
-                )
+def parse_status_record(input_str) -> StatusRecord:
+    """
+    Extracts everything we store from a bill status XML document, without touching
+    the database
+    """
+    root = etree.fromstring(input_str)
+    bill_element = root.xpath("//bill")[0]
+    bill_info = {
+        e.tag: e.text
+        for e in bill_element
+        if e.tag in ["billNumber", "originChamber", "type", "congress", "number"]
+    }
+    committees: List[StatusCommittee] = []
+    for committee in root.xpath("//billCommittees/item"):
+        obj = {e.tag: e.text for e in committee}
+        referred_date, discharge_date = _activity_dates(committee)
+        committees.append(
+            {
+                "system_code": obj["systemCode"],
+                "chamber": obj["chamber"],
+                "name": obj["name"],
+                "committee_type": obj.get("type"),
+                "parent_system_code": None,
+                "referred_date": referred_date,
+                "discharge_date": discharge_date,
+            }
+        )
+        for subcommittee in committee.xpath(".//subcommittees/item"):
+            s_obj = {e.tag: e.text for e in subcommittee}
+            referred_date, discharge_date = _activity_dates(subcommittee)
+            committees.append(
+                {
+                    "system_code": s_obj["systemCode"],
+                    "chamber": obj["chamber"],
+                    "name": s_obj["name"],
+                    "committee_type": None,
+                    "parent_system_code": obj["systemCode"],
+                    "referred_date": referred_date,
+                    "discharge_date": discharge_date,
+                }
             )
-        except Exception as e:
-            print(e)
-            print(action_dict)
-    session.commit()
-    pass
+    policy_area = root.xpath("//policyArea/name")
+    return {
+        "congress": int(bill_info["congress"]),
+        "chamber": bill_info["originChamber"],
+        "bill_type": bill_info.get("type"),
+        "number": int(bill_info["number"]),
+        "actions": [_nested_dict(x) for x in root.xpath("//actions/item")],
+        "committees": committees,
+        "policy_area": policy_area[0].text if policy_area else None,
+        "subjects": [x.text for x in root.xpath("//legislativeSubjects/item/name")],
+    }
 
 
-def handle_committees(committee_elements: List[Element], bill_object: Legislation):
+def parse_members(f_path: str, members: List[str]) -> List[StatusRecord]:
     """
-    Creates or updates LegislationCommittee records and their association to
-    the bill, including subcommittee relationships. Extracts referral and
-    discharge dates from <activities> child elements.
+    Worker entry point, parses a slice of the archive's members
     """
-    # TODO: Create Committee records using https://github.com/unitedstates/congress-legislators/tree/master/scripts
+    records = []
+    with ZipFile(f_path) as archive:
+        for member in members:
+            try:
+                records.append(parse_status_record(archive.read(member)))
+            except Exception as e:
+                print(member, e)
+    return records
 
-    session = Session()
-    for committee in committee_elements:
-        obj = {e.tag: e.text for e in committee}
-        existing_obj: LegislationCommittee = (
-            session.query(LegislationCommittee)
-            .filter(
-                LegislationCommittee.system_code == obj["systemCode"],
-                LegislationCommittee.chamber == obj["chamber"],
+
+def _date(value: Optional[str]):
+    return parse(value) if value else None
+
+
+class StatusLookups:
+    """
+    The ids the status import resolves names to. Loaded once per archive and kept
+    current as the batches insert new committees, subjects and policy areas.
+    """
+
+    def __init__(self, session):
+        self.session = session
+        # congress number -> (chamber, number) -> [(legislation_type, legislation_id)]
+        self.legislation: Dict[int, Dict[tuple, List[tuple]]] = {}
+        self.congress_ids: Dict[int, Optional[int]] = {}
+        self.committees: Dict[Tuple[str, LegislationChamber], int] = {}
+        for committee_id, system_code, chamber in session.query(
+            LegislationCommittee.legislation_committee_id,
+            LegislationCommittee.system_code,
+            LegislationCommittee.chamber,
+        ).order_by(LegislationCommittee.legislation_committee_id.desc()):
+            self.committees[(system_code, chamber)] = committee_id
+        self.subjects = self._names(
+            LegislativeSubject.subject, LegislativeSubject.legislative_subject_id
+        )
+        self.policy_areas = self._names(
+            LegislativePolicyArea.name, LegislativePolicyArea.legislative_policy_area_id
+        )
+
+    def _names(self, name_column, id_column) -> Dict[str, int]:
+        # Lowest id wins where a name exists for more than one congress
+        return {
+            name: name_id
+            for name, name_id in self.session.query(name_column, id_column).order_by(
+                id_column.desc()
             )
+        }
+
+    def _load_congress(self, congress: int):
+        congress_obj = (
+            self.session.query(Congress)
+            .filter(Congress.session_number == congress)
             .first()
         )
-        if existing_obj is None:
-            new_obj = LegislationCommittee(
-                system_code=obj["systemCode"],
-                chamber=LegislationChamber(obj["chamber"]),
-                name=obj["name"],
-                committee_type=obj["type"],
-            )
-            session.add(new_obj)
-            session.commit()
-            committee_id = new_obj.legislation_committee_id
-        else:
-            committee_id = existing_obj.legislation_committee_id
-        committee_activities = committee.xpath(".//activities/item")
-        com_referred_date = None
-        com_discharge_date = None
-        for activity in committee_activities:
-            a_obj = {e.tag: e.text for e in activity}
-            if a_obj["name"].lower() == "referred to":
-                com_referred_date = a_obj["date"]
-            elif a_obj["name"].lower() == "discharged from":
-                com_discharge_date = a_obj["date"]
-        _ensure_committee_link(
-            committee_id,
-            bill_object.legislation_id,
-            com_referred_date,
-            com_discharge_date,
+        self.congress_ids[congress] = (
+            congress_obj.congress_id if congress_obj is not None else None
         )
-
-        for subcommitte in committee.xpath(".//subcommittees/item"):
-            s_obj = {e.tag: e.text for e in subcommitte}
-            existing_obj = (
-                session.query(LegislationCommittee)
-                .filter(
-                    LegislationCommittee.system_code == s_obj["systemCode"],
-                    LegislationCommittee.chamber == obj["chamber"],
+        bills: Dict[tuple, List[tuple]] = {}
+        if congress_obj is not None:
+            for legislation_id, chamber, number, legislation_type in (
+                self.session.query(
+                    Legislation.legislation_id,
+                    Legislation.chamber,
+                    Legislation.number,
+                    Legislation.legislation_type,
                 )
-                .first()
+                .filter(Legislation.congress_id == congress_obj.congress_id)
+                .order_by(Legislation.legislation_id)
+            ):
+                bills.setdefault((chamber, number), []).append(
+                    (legislation_type, legislation_id)
+                )
+        self.legislation[congress] = bills
+
+    def legislation_id(self, record: StatusRecord) -> Optional[int]:
+        """
+        The bill a status record belongs to, preferring the one of the same type
+        """
+        if record["congress"] not in self.legislation:
+            self._load_congress(record["congress"])
+        candidates = self.legislation[record["congress"]].get(
+            (LegislationChamber(record["chamber"]), record["number"])
+        )
+        if not candidates:
+            return None
+        wanted = STATUS_TYPES.get((record["bill_type"] or "").upper())
+        return next((x[1] for x in candidates if x[0] == wanted), candidates[0][1])
+
+    def committee_id(self, committee: StatusCommittee) -> int:
+        chamber = LegislationChamber(committee["chamber"])
+        key = (committee["system_code"], chamber)
+        if key not in self.committees:
+            parent_id = None
+            if committee["parent_system_code"] is not None:
+                parent_id = self.committees[(committee["parent_system_code"], chamber)]
+            new_obj = LegislationCommittee(
+                system_code=committee["system_code"],
+                chamber=chamber,
+                name=committee["name"],
+                committee_type=committee["committee_type"],
+                parent_id=parent_id,
             )
-            if existing_obj is None:
-                new_obj = LegislationCommittee(
-                    system_code=s_obj["systemCode"],
-                    chamber=LegislationChamber(obj["chamber"]),
-                    name=s_obj["name"],
-                    subcommittee=committee_id,
+            self.session.add(new_obj)
+            self.session.flush()
+            self.committees[key] = new_obj.legislation_committee_id
+        return self.committees[key]
+
+    def ensure_names(
+        self, model, name_column: str, known: Dict[str, int], wanted: Dict[str, int]
+    ):
+        """
+        Inserts the names in wanted ({name: congress_id}) that are not known yet
+        """
+        missing = {k: v for k, v in wanted.items() if k not in known}
+        if not missing:
+            return
+        id_column = model.__table__.primary_key.columns[0]
+        name_attr = model.__table__.c[name_column]
+        query = (
+            insert(model)
+            .values([{name_column: k, "congress_id": v} for k, v in missing.items()])
+            .on_conflict_do_nothing()
+            .returning(name_attr, id_column)
+        )
+        known.update(dict(self.session.execute(query).all()))
+        # Lost a race with another importer
+        still_missing = [k for k in missing if k not in known]
+        if still_missing:
+            known.update(
+                dict(
+                    self.session.execute(
+                        select(name_attr, id_column).where(
+                            name_attr.in_(still_missing)
+                        )
+                    ).all()
                 )
-                session.add(new_obj)
-                session.commit()
-                subcommitte_id = new_obj.legislation_committee_id
-            else:
-                subcommitte_id = existing_obj.legislation_committee_id
-            subcommittee_activities = subcommitte.xpath(".//activities/item")
-            scom_referred_date = None
-            scom_discharge_date = None
-            for activity in subcommittee_activities:
-                a_obj = {e.tag: e.text for e in activity}
-                if a_obj["name"].lower() == "referred to":
-                    scom_referred_date = a_obj["date"]
-                elif a_obj["name"].lower() == "discharged from":
-                    scom_discharge_date = a_obj["date"]
-            _ensure_committee_link(
-                subcommitte_id,
-                bill_object.legislation_id,
-                scom_referred_date,
-                scom_discharge_date,
             )
-    pass
 
 
-def handle_subject(subject: Element, bill_object: Legislation):
-    session = Session()
-    existing_obj: LegislativeSubject = (
-        session.query(LegislativeSubject)
-        .filter(LegislativeSubject.subject == subject.text)
-        .first()
-    )
-    if existing_obj is None:
-        new_obj = LegislativeSubject(
-            subject=subject.text, congress_id=bill_object.congress_id
-        )
-        session.add(new_obj)
-        session.commit()
-        subject_id = new_obj.legislative_subject_id
-    else:
-        subject_id = existing_obj.legislative_subject_id
-
-    existing_obj: LegislativeSubjectAssociation = (
-        session.query(LegislativeSubjectAssociation)
-        .filter(
-            LegislativeSubjectAssociation.legislation_id == bill_object.legislation_id,
-            LegislativeSubjectAssociation.legislative_subject_id == subject_id,
-        )
-        .first()
-    )
-    if existing_obj is None:
-        new_obj = LegislativeSubjectAssociation(
-            legislation_id=bill_object.legislation_id,
-            legislative_subject_id=subject_id,
-        )
-        session.add(new_obj)
-        session.commit()
+def _action_row(legislation_id: int, action_dict: dict) -> dict:
+    return {
+        "legislation_id": legislation_id,
+        "action_date": parse(action_dict.get("actionDate")),
+        "text": action_dict.get("text"),
+        "action_type": action_dict.get("type"),
+        "action_code": action_dict.get("actionCode"),
+        "source_code": action_dict.get("sourceSystem", {}).get("code"),
+        "source_name": action_dict.get("sourceSystem", {}).get("name"),
+        "raw": action_dict,
+    }
 
 
-def handle_policy_area(policy_area: Element, bill_object: Legislation):
-    session = Session()
-    existing_obj: LegislativePolicyArea = (
-        session.query(LegislativePolicyArea)
-        .filter(LegislativePolicyArea.name == policy_area.text)
-        .first()
+def write_status_batch(session, records: List[StatusRecord], lookups: StatusLookups) -> int:
+    """
+    Stores a batch of parsed status records, returns how many matched a bill.
+
+    Actions already stored for the bill (same raw dict) and existing subject/policy
+    area links are skipped, an existing committee link gets the new discharge date.
+    """
+    matched = []
+    for record in records:
+        legislation_id = lookups.legislation_id(record)
+        if legislation_id is None:
+            print(f"Did not find bill {record['chamber']} {record['number']}")
+            continue
+        matched.append((legislation_id, record))
+
+    subjects = {}
+    policy_areas = {}
+    for legislation_id, record in matched:
+        congress_id = lookups.congress_ids[record["congress"]]
+        for subject in record["subjects"]:
+            subjects.setdefault(subject, congress_id)
+        if record["policy_area"] is not None:
+            policy_areas.setdefault(record["policy_area"], congress_id)
+    lookups.ensure_names(LegislativeSubject, "subject", lookups.subjects, subjects)
+    lookups.ensure_names(
+        LegislativePolicyArea, "name", lookups.policy_areas, policy_areas
     )
-    if existing_obj is None:
-        new_obj = LegislativePolicyArea(
-            name=policy_area.text, congress_id=bill_object.congress_id
+
+    action_rows = []
+    committee_rows = {}
+    subject_rows = []
+    policy_area_rows = []
+    for legislation_id, record in matched:
+        for action_dict in record["actions"]:
+            try:
+                action_rows.append(_action_row(legislation_id, action_dict))
+            except Exception as e:
+                print(e)
+                print(action_dict)
+        for committee in record["committees"]:
+            try:
+                committee_id = lookups.committee_id(committee)
+            except (KeyError, ValueError) as e:
+                print(f"Skipping committee {committee['system_code']}: {e}")
+                continue
+            committee_rows[(committee_id, legislation_id)] = {
+                "legislation_committee_id": committee_id,
+                "legislation_id": legislation_id,
+                "referred_date": _date(committee["referred_date"]),
+                "discharge_date": _date(committee["discharge_date"]),
+                "congress_id": None,
+            }
+        for subject in record["subjects"]:
+            subject_rows.append(
+                {
+                    "legislation_id": legislation_id,
+                    "legislative_subject_id": lookups.subjects[subject],
+                }
+            )
+        if record["policy_area"] is not None:
+            policy_area_rows.append(
+                {
+                    "legislation_id": legislation_id,
+                    "legislative_policy_area_id": lookups.policy_areas[
+                        record["policy_area"]
+                    ],
+                }
+            )
+
+    if action_rows:
+        session.execute(
+            insert(LegislationAction).values(action_rows).on_conflict_do_nothing()
         )
-        session.add(new_obj)
-        session.commit()
-        policy_area_id = new_obj.legislative_policy_area_id
-    else:
-        policy_area_id = existing_obj.legislative_policy_area_id
-    existing_obj: LegislativePolicyAreaAssociation = (
-        session.query(LegislativePolicyAreaAssociation)
-        .filter(
-            LegislativePolicyAreaAssociation.legislation_id
-            == bill_object.legislation_id,
-            LegislativePolicyAreaAssociation.legislative_policy_area_id
-            == policy_area_id,
+    if committee_rows:
+        query = insert(LegislationCommitteeAssociation).values(
+            list(committee_rows.values())
         )
-        .first()
-    )
-    if existing_obj is None:
-        new_obj = LegislativePolicyAreaAssociation(
-            legislation_id=bill_object.legislation_id,
-            legislative_policy_area_id=policy_area_id,
+        session.execute(
+            query.on_conflict_do_update(
+                index_elements=[
+                    LegislationCommitteeAssociation.legislation_committee_id,
+                    LegislationCommitteeAssociation.legislation_id,
+                ],
+                set_={"discharge_date": query.excluded.discharge_date},
+            )
+        )
+    if subject_rows:
+        session.execute(
+            insert(LegislativeSubjectAssociation)
+            .values(subject_rows)
+            .on_conflict_do_nothing()
         )
-        session.add(new_obj)
-        session.commit()
+    if policy_area_rows:
+        session.execute(
+            insert(LegislativePolicyAreaAssociation)
+            .values(policy_area_rows)
+            .on_conflict_do_nothing()
+        )
+    refresh_search_documents(session, [x[0] for x in matched], commit=False)
+    session.commit()
+    if matched:
+        # After the commit, so a cache refilled on the new version sees the batch
+        bump_cache_version(session)
+    return len(matched)
 
 
 def parse_status(input_str: str):
     """
-    Main entry point for parsing a bill status XML document. Extracts bill
-    metadata via XPath, matches it to an existing Legislation record in the
-    database, then delegates to specialized handlers for each data category:
-    committees, actions, policy areas, and legislative subjects.
+    Parses a single bill status XML document and stores it against the matching
+    Legislation: committees, actions, policy area and legislative subjects.
     """
-    try:
-        root = etree.fromstring(input_str)
-        # Extract top-level data using XPath queries against the status XML
-        bill_element = root.xpath("//bill")[0]
-        actions = root.xpath("//actions/item")
-        committees = root.xpath("//billCommittees/item")
-        policy_area = root.xpath("//policyArea/name")
-        subjects = root.xpath("//legislativeSubjects/item/name")
-        bill_info = {
-            e.tag: e.text
-            for e in bill_element
-            if e.tag in ["billNumber", "originChamber", "type", "congress", "number"]
-        }
-        # print(bill_info)
-        session = Session()
-        congress: Congress = (
-            session.query(Congress)
-            .filter(Congress.session_number == int(bill_info["congress"]))
-            .first()
-        )
-        # print(congress)
-        # TODO: Filter on Legislation type, congress
-        matching_bill: Legislation = (
-            session.query(Legislation)
-            .filter(
-                Legislation.chamber == LegislationChamber(bill_info["originChamber"]),
-                Legislation.number == bill_info["number"],
-                Legislation.congress_id == congress.congress_id,
-            )
-            .first()
-        )
-        if matching_bill is None:
-            print("Did not find bill")
-            return
-            # matching_bill = Legislation(legislation_id=1)
-        handle_committees(committees, matching_bill)
-
-        parse_status_actions(actions, matching_bill)
-
-        if policy_area:
-            handle_policy_area(policy_area[0], matching_bill)
-        for subject in subjects:
-            handle_subject(subject, matching_bill)
-    except Exception as e:
-        print(e)
-        print(bill_info)
-        raise e
+    session = Session()
+    write_status_batch(
+        session, [parse_status_record(input_str)], StatusLookups(session)
+    )
 
 
 def parse_archive(f_path: str):
-    archive = ZipFile(f_path)
-    for file in archive.namelist():
-        r = archive.open(file, "r").read()
-        parse_status(r)
+    """
+    Imports every status document in a BILLSTATUS archive. Workers parse
+    STATUS_BATCH members at a time, the main process writes one batch per commit.
+    """
+    with ZipFile(f_path) as archive:
+        members = [x for x in archive.namelist() if x.lower().endswith(".xml")]
+    batches = [
+        members[i : i + STATUS_BATCH] for i in range(0, len(members), STATUS_BATCH)
+    ]
+    session = Session()
+    lookups = StatusLookups(session)
+    # Parse a few batches per worker ahead of the writes, not the whole archive
+    wave = max(1, cpu_count() if THREADS < 0 else THREADS) * 2
+    matched = 0
+    with Parallel(n_jobs=THREADS, backend="loky") as parallel:
+        for i in range(0, len(batches), wave):
+            for records in parallel(
+                delayed(parse_members)(f_path, batch) for batch in batches[i : i + wave]
+            ):
+                matched += write_status_batch(session, records, lookups)
+    print(f"Stored {matched} of {len(members)} bill statuses from {f_path}")
@@ -0,0 +1,56 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from congress_parser.importers.actions import (
+    plan_chunks,
+    read_checkpoint,
+    summarize,
+    write_checkpoint,
+)
+
+
+class TestPlanChunks(TestCase):
+    def test_groups_by_base_largest_first(self):
+        pending = [(5, 1), (3, 2), (4, 2), (1, 2), (2, 1), (9, 3)]
+        chunks = plan_chunks(pending, chunk_size=2)
+        self.assertEqual(chunks, [(2, [1, 3]), (2, [4]), (1, [2, 5]), (3, [9])])
+
+    def test_chunks_never_mix_bases(self):
+        pending = [(i, i % 3) for i in range(100)]
+        for base_id, version_ids in plan_chunks(pending, chunk_size=7):
+            self.assertLessEqual(len(version_ids), 7)
+            self.assertTrue(all(x % 3 == base_id for x in version_ids))
+
+
+class TestCheckpoint(TestCase):
+    def test_roundtrip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "checkpoint.txt")
+            self.assertEqual(read_checkpoint(path), set())
+            write_checkpoint(12, path)
+            write_checkpoint(40, path)
+            self.assertEqual(read_checkpoint(path), {12, 40})
+
+
+class TestSummarize(TestCase):
+    def test_totals_per_worker(self):
+        def chunk(pid, clauses, seconds):
+            return {
+                "pid": pid,
+                "base_id": 1,
+                "versions": 1,
+                "failed": 0,
+                "clauses": clauses,
+                "diffs": 1,
+                "reused": 0,
+                "flushes": 2,
+                "seconds": seconds,
+            }
+
+        per_worker = summarize([chunk(1, 10, 1.0), chunk(1, 5, 0.5), chunk(2, 3, 1.0)])
+        self.assertEqual(per_worker[1]["clauses"], 15)
+        self.assertEqual(per_worker[1]["versions"], 2)
+        self.assertEqual(per_worker[1]["seconds"], 1.5)
+        self.assertEqual(per_worker[2]["diffs"], 1)
+        self.assertEqual(per_worker[1]["flushes"], 4)
@@ -1,5 +1,15 @@
 from unittest import TestCase, skip
-from congress_parser.actions import determine_action, ActionType
+from unidecode import unidecode
+
+from congress_parser.actions import (
+    _match_actions,
+    action_keywords,
+    candidate_actions,
+    determine_action,
+    regex_holder,
+    ActionType,
+)
+from congress_parser.benchmarks.determine_action import load_clause_corpus
 
 
 class TestDetermineAction(TestCase):
@@ -288,3 +298,38 @@ class TestSunset(TestCase):
         self.assertEqual(result["amount"], "90")
         self.assertEqual(result["unit"], "days")
         self.assertEqual(result["trigger_date"], "the President declares the emergency over")
+
+
+class TestActionPrefilter(TestCase):
+    def test_every_regex_has_a_keyword(self):
+        for action, regexes in regex_holder.items():
+            for regex in regexes:
+                with self.subTest(action=action, regex=regex.pattern):
+                    self.assertTrue(
+                        any(x in regex.pattern.lower() for x in action_keywords[action])
+                    )
+
+    def test_same_result_as_all_regexes(self):
+        for text in load_clause_corpus():
+            with self.subTest(text=text[:60]):
+                full = _match_actions(unidecode(text).replace("--", "-"), regex_holder)
+                self.assertEqual(determine_action(text), full)
+
+    def test_overlapping_keywords(self):
+        candidates = candidate_actions(
+            'by striking the period at the end and inserting the following:'
+        )
+        self.assertIn(ActionType.STRIKE_END, candidates)
+        self.assertIn(ActionType.STRIKE_INSERT_SECTION, candidates)
+        self.assertIn(ActionType.STRIKE_TEXT, candidates)
+
+    def test_prefix_keywords(self):
+        candidates = candidate_actions("by striking paragraphs (3) and (4);")
+        self.assertIn(ActionType.STRIKE_PARAGRAPHS_MULTIPLE, candidates)
+        self.assertIn(ActionType.STRIKE_SUBSECTION, candidates)
+
+    def test_plain_clause_has_no_candidates(self):
+        self.assertEqual(
+            candidate_actions("Each State shall establish procedures to register voters."),
+            set(),
+        )
@@ -0,0 +1,54 @@
+from unittest import TestCase
+
+from congress_db.models import LegislationActionParse, USCContentDiff
+from congress_parser.actions import parser
+
+
+class _RecordingSession:
+    def __init__(self):
+        self.executed = []
+
+    def execute(self, statement, rows):
+        self.executed.append((statement.table.name, rows))
+
+
+class TestBatchedWrites(TestCase):
+    def tearDown(self):
+        parser.clear_pending()
+
+    def test_two_inserts_per_bill(self):
+        parser.store_action_parse(
+            LegislationActionParse(
+                legislation_content_id=1,
+                legislation_version_id=2,
+                actions=[{"STRIKE-TEXT": {}}],
+                citations=[],
+            )
+        )
+        parser.store_action_parse(
+            LegislationActionParse(legislation_content_id=3, legislation_version_id=2)
+        )
+        parser.store_diffs(
+            [
+                USCContentDiff(usc_content_id=10, usc_section_id=11, usc_chapter_id=12),
+                USCContentDiff(usc_content_id=13, usc_section_id=11, usc_chapter_id=12),
+            ]
+        )
+        session = _RecordingSession()
+        parser.write_pending(session)
+        self.assertEqual(
+            [(x[0], len(x[1])) for x in session.executed],
+            [("legislation_action_parse", 2), ("usc_content_diff", 2)],
+        )
+        parse_rows = session.executed[0][1]
+        self.assertNotIn("legislation_action_parse_id", parse_rows[0])
+        self.assertEqual(parse_rows[0]["actions"], [{"STRIKE-TEXT": {}}])
+        # Every row carries every column, as executemany requires
+        self.assertEqual(set(parse_rows[0]), set(parse_rows[1]))
+        self.assertEqual(parser.PENDING_PARSES, [])
+        self.assertEqual(parser.PENDING_DIFFS, [])
+
+    def test_nothing_pending_writes_nothing(self):
+        session = _RecordingSession()
+        parser.write_pending(session)
+        self.assertEqual(session.executed, [])
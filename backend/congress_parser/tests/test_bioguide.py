@@ -0,0 +1,117 @@
+import io
+import json
+import zipfile
+from unittest import TestCase
+
+from sqlalchemy.dialects import postgresql
+
+from congress_parser.bioguide.manager import (
+    iter_profiles,
+    legislator_row,
+    row_hash,
+    upsert_legislators,
+)
+
+
+def _profile(**overrides):
+    profile = {
+        "usCongressBioId": "W000817",
+        "familyName": "Warren",
+        "givenName": "Elizabeth",
+        "unaccentedFamilyName": "Warren",
+        "unaccentedGivenName": "Elizabeth",
+        "profileText": "WARREN, Elizabeth, a Senator from Massachusetts",
+        "jobPositions": [
+            {
+                "job": {"name": "Senator", "jobType": "CongressMemberJob"},
+                "congressAffiliation": {
+                    "congress": {"name": "The 113th", "congressNumber": 113, "congressType": "USCongress"},
+                    "partyAffiliation": [{"party": {"name": "Democrat"}}],
+                    "represents": {"regionType": "StateRegion", "regionCode": "MA"},
+                },
+            },
+            {
+                "job": {"name": "Senator", "jobType": "CongressMemberJob"},
+                "congressAffiliation": {
+                    "congress": {"name": "The 114th", "congressNumber": 114, "congressType": "USCongress"},
+                    "partyAffiliation": [{"party": {"name": "Democrat"}}],
+                    "represents": {"regionType": "StateRegion", "regionCode": "MA"},
+                },
+            },
+        ],
+        "asset": [{"contentUrl": "https://bioguide.congress.gov/photo/abc.jpg", "creditLine": "Senate"}],
+    }
+    profile.update(overrides)
+    return profile
+
+
+class TestLegislatorRow(TestCase):
+    def test_flat_row_with_lookups(self):
+        row = legislator_row(
+            _profile(), {"W000817": "S366"}, {"W000817": {"twitter": "senwarren"}}
+        )
+        self.assertEqual(row["bioguide_id"], "W000817")
+        self.assertEqual(row["lis_id"], "S366")
+        self.assertEqual(row["first_name"], "Elizabeth")
+        self.assertEqual((row["party"], row["state"], row["job"]), ("Democrat", "MA", "Senator"))
+        self.assertEqual(row["congress_id"], [113, 114])
+        self.assertEqual(row["image_url"], "https://bioguide.congress.gov/photo/abc.jpg")
+        self.assertEqual(row["twitter"], "senwarren")
+        self.assertIsNone(row["facebook"])
+        self.assertIsNone(row["middle_name"])
+
+    def test_missing_values_are_none(self):
+        profile = _profile(asset=None)
+        del profile["jobPositions"][-1]["congressAffiliation"]["partyAffiliation"]
+        profile["jobPositions"][0]["congressAffiliation"]["congress"] = None
+        row = legislator_row(profile, {}, {})
+        self.assertIsNone(row["party"])
+        self.assertIsNone(row["congress_id"])
+        self.assertIsNone(row["image_url"])
+        self.assertIsNone(row["lis_id"])
+
+    def test_other_jobs_are_skipped(self):
+        profile = _profile()
+        profile["jobPositions"][-1]["job"]["name"] = "Delegate"
+        self.assertIsNone(legislator_row(profile, {}, {}))
+
+    def test_hash_follows_the_row(self):
+        first = legislator_row(_profile(), {}, {})
+        self.assertEqual(row_hash(first), row_hash(legislator_row(_profile(), {}, {})))
+        self.assertNotEqual(
+            row_hash(first), row_hash(legislator_row(_profile(nickName="Liz"), {}, {}))
+        )
+
+
+class TestIterProfiles(TestCase):
+    def test_wrapped_and_bare_profiles(self):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as z:
+            z.writestr("W000817.json", json.dumps({"data": _profile()}))
+            z.writestr("S000148.json", json.dumps(_profile(usCongressBioId="S000148")))
+        with zipfile.ZipFile(buffer) as z:
+            self.assertEqual(
+                [x["usCongressBioId"] for x in iter_profiles(z)], ["W000817", "S000148"]
+            )
+
+
+class _RecordingSession:
+    def __init__(self):
+        self.executed = []
+
+    def execute(self, statement):
+        self.executed.append(str(statement.compile(dialect=postgresql.dialect())))
+
+
+class TestUpsertLegislators(TestCase):
+    def test_single_upsert(self):
+        row = legislator_row(_profile(), {}, {})
+        row["source_hash"] = row_hash(row)
+        session = _RecordingSession()
+        upsert_legislators(session, [row, {**row, "bioguide_id": "S000148"}])
+        upsert_legislators(session, [])
+        self.assertEqual(len(session.executed), 1)
+        sql = session.executed[0]
+        self.assertIn("ON CONFLICT (bioguide_id) DO UPDATE", sql)
+        self.assertIn("coalesce(excluded.party, legislator.party)", sql)
+        self.assertIn("legislator.source_hash IS DISTINCT FROM excluded.source_hash", sql)
@@ -0,0 +1,210 @@
+"""
+Tests for the COPY based bill content writer and the streaming bill reader in
+run_through.py.
+
+The bulk and streaming paths have to produce the same parent_id/order_number
+graph as the per-node commit path, so they are run over the bill fixtures and
+compared.
+"""
+
+import os
+import tempfile
+import zipfile
+from unittest import TestCase
+
+from lxml import etree
+
+from congress_parser.run_through import (
+    bill_content_rows,
+    flatten_bill_content,
+    read_bill_document,
+    recursive_bill_content,
+    stream_bill_document,
+)
+from congress_parser.utils.bulk import rows_to_copy_buffer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+BILL_FIXTURES = [
+    "bill_simple.xml",
+    "bill_amendments.xml",
+    "bill_nested_quotes.xml",
+    "bill_no_heading.xml",
+    "bill_date_formats.xml",
+    "bill_with_date_element.xml",
+]
+
+
+def _legis_body(filename):
+    with open(os.path.join(FIXTURES_DIR, filename), "rb") as f:
+        root = etree.fromstring(f.read())
+    return root.xpath("//legis-body")[0]
+
+
+class _IdAssigningSession:
+    """Stands in for the session, handing out ids in insertion order on commit."""
+
+    def __init__(self):
+        self.objects = []
+
+    def add(self, obj):
+        self.objects.append(obj)
+
+    def commit(self):
+        for i, obj in enumerate(self.objects):
+            if obj.legislation_content_id is None:
+                obj.legislation_content_id = i + 1
+
+
+class TestBulkBillContent(TestCase):
+    def _orm_rows(self, legis):
+        session = _IdAssigningSession()
+        recursive_bill_content(None, legis, 0, 7, {}, "", None, session=session)
+        session.commit()
+        return [
+            (
+                x.legislation_content_id,
+                x.parent_id,
+                x.order_number,
+                x.legislation_version_id,
+                x.content_type,
+                x.section_display,
+                x.heading,
+                x.content_str,
+                x.lc_ident,
+            )
+            for x in session.objects
+        ]
+
+    def _bulk_rows(self, legis):
+        records = flatten_bill_content(legis)
+        ids = list(range(1, len(records) + 1))
+        return bill_content_rows(records, ids, 7)
+
+    def test_same_graph_as_orm_path(self):
+        for fixture in BILL_FIXTURES:
+            with self.subTest(fixture=fixture):
+                legis = _legis_body(fixture)
+                self.assertEqual(self._bulk_rows(legis), self._orm_rows(legis))
+
+    def test_preorder_parent_before_child(self):
+        rows = self._bulk_rows(_legis_body("bill_simple.xml"))
+        seen = set()
+        for row in rows:
+            if row[1] is not None:
+                self.assertIn(row[1], seen)
+            seen.add(row[0])
+
+    def test_chunks_match_single_pass(self):
+        records = flatten_bill_content(_legis_body("bill_amendments.xml"))
+        ids = list(range(1, len(records) + 1))
+        ancestors = []
+        chunked = []
+        for start in range(0, len(records), 3):
+            chunked += bill_content_rows(
+                records[start : start + 3], ids[start : start + 3], 7, ancestors
+            )
+        self.assertEqual(chunked, bill_content_rows(records, ids, 7))
+
+    def test_orphans_dropped(self):
+        def record(index, parent_index):
+            return {
+                "index": index,
+                "parent_index": parent_index,
+                "order_number": 0,
+                "content_type": "section",
+                "section_display": None,
+                "heading": None,
+                "content_str": None,
+                "lc_ident": None,
+            }
+
+        # 2 is missing, so 3 (its child) and 4 (its grandchild) go too, 5 stays
+        records = [record(0, None), record(1, 0), record(3, 2), record(4, 3), record(5, 1)]
+        rows = bill_content_rows(records, [10, 11, 13, 14, 15], 7)
+        self.assertEqual([(x[0], x[1]) for x in rows], [(10, None), (11, 10), (15, 11)])
+
+    def test_root_is_legis_body(self):
+        rows = self._bulk_rows(_legis_body("bill_simple.xml"))
+        self.assertEqual(rows[0][4], "legis-body")
+        self.assertIsNone(rows[0][1])
+        self.assertEqual(rows[0][2], 0)
+
+
+class TestCopyBuffer(TestCase):
+    def test_null_and_escapes(self):
+        buffer = rows_to_copy_buffer([(1, None, "a\tb\nc\\d", "")])
+        self.assertEqual(buffer.read(), "1\t\\N\ta\\tb\\nc\\\\d\t\n")
+
+    def test_booleans(self):
+        buffer = rows_to_copy_buffer([(True, False)])
+        self.assertEqual(buffer.read(), "t\tf\n")
+
+
+def _synthetic_bill(sections, paragraphs):
+    """A bill wide enough that the streaming parser has to release siblings."""
+    body = []
+    for s in range(sections):
+        paras = "".join(
+            f'<paragraph id="s{s}p{p}"><enum>({p})</enum><text>Paragraph {p} of <quote>{s}</quote>.</text></paragraph>'
+            for p in range(paragraphs)
+        )
+        body.append(
+            f'<section id="s{s}"><enum>{s}.</enum><header>Section {s}</header>'
+            f"<text>Intro {s}</text>{paras}</section>"
+        )
+    return (
+        '<?xml version="1.0" encoding="utf-8"?><bill><metadata xmlns:dc="http://purl.org/dc/elements/1.1/">'
+        "<dublinCore><dc:title>119 HR 5 IH: Wide Act</dc:title></dublinCore></metadata>"
+        '<form><action><action-date date="01/02/2025">January 2, 2025</action-date></action></form>'
+        f'<legis-body id="lb">{"".join(body)}</legis-body></bill>'
+    ).encode()
+
+
+class TestStreamingBillDocument(TestCase):
+    def _assert_same(self, xml):
+        tree = read_bill_document(xml)
+        streamed = stream_bill_document(xml)
+        self.assertEqual(streamed["title"], tree["title"])
+        self.assertEqual(streamed["form_date"], tree["form_date"])
+        self.assertEqual(streamed["has_legis_body"], tree["has_legis_body"])
+        if tree["legis"] is None:
+            self.assertEqual(list(streamed["records"]), [])
+            return
+        self.assertEqual(
+            list(streamed["records"]), flatten_bill_content(tree["legis"])
+        )
+
+    def test_matches_tree_parse_on_fixtures(self):
+        for fixture in BILL_FIXTURES + ["bill_empty_legis_body.xml"]:
+            with self.subTest(fixture=fixture):
+                with open(os.path.join(FIXTURES_DIR, fixture), "rb") as f:
+                    self._assert_same(f.read())
+
+    def test_matches_tree_parse_on_wide_bill(self):
+        self._assert_same(_synthetic_bill(40, 12))
+
+    def test_accepts_decoded_string(self):
+        xml = _synthetic_bill(2, 2)
+        self.assertEqual(
+            list(stream_bill_document(xml.decode())["records"]),
+            list(stream_bill_document(xml)["records"]),
+        )
+
+    def test_date_element_preferred_over_action_date(self):
+        with open(os.path.join(FIXTURES_DIR, "bill_with_date_element.xml"), "rb") as f:
+            document = stream_bill_document(f.read())
+        self.assertEqual(document["form_date"][1], "July 4, 2025")
+
+    def test_reads_zip_member_without_decoding(self):
+        xml = _synthetic_bill(5, 3)
+        with tempfile.TemporaryDirectory() as tmp:
+            archive_path = os.path.join(tmp, "BILLS-119-1-hr.zip")
+            with zipfile.ZipFile(archive_path, "w", zipfile.ZIP_DEFLATED) as archive:
+                archive.writestr("BILLS-119hr5ih.xml", xml)
+            with zipfile.ZipFile(archive_path) as archive:
+                with archive.open("BILLS-119hr5ih.xml") as member:
+                    streamed = list(stream_bill_document(member)["records"])
+                with archive.open("BILLS-119hr5ih.xml") as member:
+                    tree = read_bill_document(member)
+        self.assertEqual(streamed, list(stream_bill_document(xml)["records"]))
+        self.assertEqual(tree["title"], "119 HR 5 IH: Wide Act")
@@ -0,0 +1,179 @@
+"""
+Tests for utils/citation.resolve_citations.
+
+The single-pass version has to produce exactly the markup of the recursive version it
+replaced, quirks included, so that re-imported releases do not show spurious diffs.
+A copy of the recursive version is kept here and both are run over generated text.
+"""
+
+import random
+import re
+import sys
+from unittest import TestCase
+
+from congress_parser.utils.citation import resolve_citations
+
+
+def _recursive_resolve_citations(text: str, title_num: str) -> str:
+    """Mirror of the recursive resolve_citations."""
+    title_cites = [
+        r"\W(sections? (?P<inner>.*?) of (?P<title>(?:this )?title(?:\d\d?)?))\W",
+        r"\W(section (?P<section>\d*)(?P<subsection>\(.*?\))? of (?P<title>this title))\W",
+        r"\W(section (?P<section>\d*)(?P<subsection>\(.*?\))? of title (?P<title>\d\d?))\W",
+        r"\W(section (?P<section>\d*))\W",
+    ]
+
+    def spit_out_xml(t, s, text):
+        return f'<usccite src="/usc/{t}/{s}">{text}</usccite>'
+
+    subsect_reg = r"(?P<section>\d+)?(?P<subsections>(?:\(.*?\))*)?"
+    for regex_str in title_cites:
+        matches = re.search(regex_str, text, re.MULTILINE + re.IGNORECASE)
+        if matches is not None:
+            group_matches = matches.groupdict()
+            last_ind = 0
+            title_num_m = group_matches.get("title", "this title")
+            if title_num_m == "this title":
+                title_num_m = title_num
+            if "section" in group_matches:
+                sec_num = group_matches.get("section")
+                if "title" in group_matches:
+                    end_ind = matches.end("title")
+                else:
+                    end_ind = matches.end("section")
+                p_str = spit_out_xml(
+                    title_num_m,
+                    sec_num,
+                    f"section {text[matches.start('section'):end_ind]}",
+                )
+                return (
+                    _recursive_resolve_citations(
+                        text[last_ind : matches.start("section") - len("section ")],
+                        title_num_m,
+                    )
+                    + p_str
+                    + _recursive_resolve_citations(text[end_ind:], title_num_m)
+                )
+            elif "inner" in group_matches:
+                end_ind = matches.end("inner")
+                inner_str = group_matches.get("inner")
+                current_section = None
+                p_str = ""
+                last_inner_ind = 0
+                for sub_match in re.finditer(subsect_reg, inner_str):
+                    if sub_match.group(0) != "":
+                        g_dict = sub_match.groupdict()
+                        current_section = g_dict.get("section") or current_section
+                        p_str += inner_str[
+                            last_inner_ind : sub_match.start()
+                        ] + spit_out_xml(
+                            title_num_m,
+                            current_section,
+                            inner_str[sub_match.start() : sub_match.end()],
+                        )
+                        last_inner_ind = sub_match.end()
+                return (
+                    _recursive_resolve_citations(
+                        text[last_ind : matches.start("inner")], title_num_m
+                    )
+                    + p_str
+                    + _recursive_resolve_citations(text[end_ind:], title_num_m)
+                )
+    return text
+
+
+TOKENS = [
+    "section",
+    "sections",
+    "Section",
+    "SECTION",
+    "of",
+    "this",
+    "title",
+    "Title",
+    "title26",
+    "26",
+    "5",
+    "1395",
+    "1395a",
+    "(a)",
+    "(1)",
+    "(B)(ii)",
+    "(",
+    ")",
+    "and",
+    "or",
+    "through",
+    "the",
+    "Act",
+    "subsection",
+    "paragraph",
+    ",",
+    ".",
+    ";",
+    "-",
+    "\n",
+]
+
+
+def _random_text(rng: random.Random) -> str:
+    words = []
+    for _ in range(rng.randint(0, 40)):
+        words.append(rng.choice(TOKENS))
+        words.append(rng.choice([" ", " ", " ", "", "  "]))
+    return "".join(words)
+
+
+class TestResolveCitations(TestCase):
+    def test_matches_recursive_version_on_generated_text(self):
+        rng = random.Random(1395)
+        for _ in range(3000):
+            text = _random_text(rng)
+            title = rng.choice(["42", "5", "26"])
+            self.assertEqual(
+                resolve_citations(text, title),
+                _recursive_resolve_citations(text, title),
+                repr(text),
+            )
+
+    def test_matches_recursive_version_on_statute_text(self):
+        texts = [
+            " as defined in section 1861(s) of this title, and ",
+            " under sections 1395 and 1395a of this title. ",
+            " pursuant to section 6506(d) of title 5, United States Code. ",
+            " see section 2 of the Act and section 3. ",
+            "Section 101 of this title applies. ",
+            " sections 1(a)(2) and 3 of title26 shall ",
+        ]
+        for text in texts:
+            with self.subTest(text=text):
+                self.assertEqual(
+                    resolve_citations(text, "42"),
+                    _recursive_resolve_citations(text, "42"),
+                )
+
+    def test_markup(self):
+        # "sections? ... of title" takes precedence, the title group is taken as is
+        self.assertEqual(
+            resolve_citations(" under section 1395 of this title. ", "42"),
+            ' under section <usccite src="/usc/42/1395">1395</usccite> of this title. ',
+        )
+        self.assertEqual(
+            resolve_citations(" see section 6506(d) of title 5, as ", "42"),
+            ' see section <usccite src="/usc/title/6506">6506(d)</usccite> of title 5, as ',
+        )
+        self.assertEqual(
+            resolve_citations(" as defined in section 1861(s), and ", "42"),
+            ' as defined in <usccite src="/usc/42/1861">section 1861</usccite>(s), and ',
+        )
+
+    def test_text_without_citations_is_returned(self):
+        text = "Nothing in this subchapter shall be construed."
+        self.assertIs(resolve_citations(text, "42"), text)
+
+    def test_many_citations_do_not_recurse(self):
+        text = " section 1, " * (sys.getrecursionlimit() * 2)
+        resolved = resolve_citations(text, "42")
+        self.assertEqual(resolved.count("<usccite"), sys.getrecursionlimit() * 2)
+        stripped = re.sub(r'<usccite src="[^"]*">', "", resolved)
+        self.assertEqual(stripped.replace("</usccite>", ""), text)
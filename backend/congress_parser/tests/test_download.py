@@ -0,0 +1,164 @@
+"""
+Tests for utils/download.fetch against a local HTTP server standing in for govinfo.
+"""
+
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import TestCase
+
+from congress_parser.utils.download import (
+    PART_SUFFIX,
+    VALIDATORS_SUFFIX,
+    fetch,
+    mark_parsed,
+    read_validators,
+    write_validators,
+)
+
+LAST_MODIFIED = "Tue, 01 Oct 2024 00:00:00 GMT"
+
+
+class StandIn(BaseHTTPRequestHandler):
+    """
+    Serves self.server.files, {path: (body, etag)}, honouring If-None-Match and
+    Range/If-Range, and records every request it sees
+    """
+
+    def log_message(self, *args):
+        pass
+
+    def _entity(self):
+        self.server.seen.append((self.command, self.path, dict(self.headers)))
+        return self.server.files.get(self.path)
+
+    def _head(self, status, body, etag, extra=None):
+        self.send_response(status)
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", LAST_MODIFIED)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (extra or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+
+    def do_HEAD(self):
+        entity = self._entity()
+        if entity is None:
+            self.send_error(404)
+            return
+        self._head(200, *entity)
+
+    def do_GET(self):
+        entity = self._entity()
+        if entity is None:
+            self.send_error(404)
+            return
+        body, etag = entity
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        byte_range = self.headers.get("Range")
+        if byte_range and self.headers.get("If-Range") == etag:
+            start = int(byte_range.split("=")[1].rstrip("-"))
+            if start >= len(body):
+                self.send_response(416)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            rest = body[start:]
+            self._head(
+                206,
+                rest,
+                etag,
+                {"Content-Range": f"bytes {start}-{len(body) - 1}/{len(body)}"},
+            )
+            self.wfile.write(rest)
+            return
+        self._head(200, body, etag)
+        self.wfile.write(body)
+
+
+class TestFetch(TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+        self.server.files = {"/BILLS-118-1-hr.zip": (b"x" * 5000, '"v1"')}
+        self.server.seen = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/BILLS-118-1-hr.zip"
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "BILLS-118-1-hr.zip")
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmp.cleanup()
+
+    def _read(self):
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def test_download_then_unchanged(self):
+        first = fetch(self.url, self.tmp.name)
+        self.assertEqual(first, {"path": self.path, "changed": True})
+        self.assertEqual(self._read(), b"x" * 5000)
+        self.assertEqual(read_validators(self.path)["etag"], '"v1"')
+        self.assertFalse(os.path.exists(self.path + PART_SUFFIX))
+
+        mark_parsed(self.path)
+        second = fetch(self.url, self.tmp.name)
+        self.assertEqual(second, {"path": self.path, "changed": False})
+        self.assertEqual(self.server.seen[-1][2]["If-None-Match"], '"v1"')
+
+    def test_unparsed_download_stays_changed(self):
+        fetch(self.url, self.tmp.name)
+        # The parse crashed, so mark_parsed was never called
+        self.assertTrue(fetch(self.url, self.tmp.name)["changed"])
+        self.assertEqual(self.server.seen[-1][2]["If-None-Match"], '"v1"')
+        mark_parsed(self.path)
+        self.assertFalse(fetch(self.url, self.tmp.name)["changed"])
+
+    def test_changed_on_server(self):
+        fetch(self.url, self.tmp.name)
+        mark_parsed(self.path)
+        self.server.files["/BILLS-118-1-hr.zip"] = (b"y" * 300, '"v2"')
+        download = fetch(self.url, self.tmp.name)
+        self.assertTrue(download["changed"])
+        self.assertEqual(self._read(), b"y" * 300)
+        self.assertEqual(read_validators(self.path)["etag"], '"v2"')
+
+    def test_missing_archive(self):
+        self.assertIsNone(fetch(self.url.replace("hr", "s"), self.tmp.name))
+
+    def test_resumes_partial_download(self):
+        with open(self.path + PART_SUFFIX, "wb") as f:
+            f.write(b"x" * 1200)
+        write_validators(
+            self.path + PART_SUFFIX,
+            {"etag": '"v1"', "last_modified": LAST_MODIFIED, "content_length": 5000},
+        )
+        download = fetch(self.url, self.tmp.name)
+        self.assertTrue(download["changed"])
+        self.assertEqual(self._read(), b"x" * 5000)
+        self.assertEqual(self.server.seen[-1][2]["Range"], "bytes=1200-")
+        self.assertFalse(os.path.exists(self.path + PART_SUFFIX + VALIDATORS_SUFFIX))
+
+    def test_partial_of_old_version_is_restarted(self):
+        with open(self.path + PART_SUFFIX, "wb") as f:
+            f.write(b"o" * 1200)
+        write_validators(
+            self.path + PART_SUFFIX,
+            {"etag": '"v0"', "last_modified": LAST_MODIFIED, "content_length": 9000},
+        )
+        fetch(self.url, self.tmp.name)
+        self.assertEqual(self._read(), b"x" * 5000)
+
+    def test_existing_file_without_validators_is_adopted(self):
+        with open(self.path, "wb") as f:
+            f.write(b"x" * 5000)
+        download = fetch(self.url, self.tmp.name)
+        self.assertEqual(download, {"path": self.path, "changed": True})
+        self.assertEqual([x[0] for x in self.server.seen], ["HEAD"])
+        mark_parsed(self.path)
+        self.assertFalse(fetch(self.url, self.tmp.name)["changed"])
@@ -0,0 +1,120 @@
+from unittest import TestCase
+
+from congress_db.models import LegislationContent
+from congress_parser.actions.incremental import (
+    diff_versions,
+    fingerprint_contents,
+    group_by_parent,
+)
+
+
+def _bill(offset, sections):
+    """
+    Builds a small content tree, `sections` is a list of
+    (lc_ident, text, quoted_block_text) tuples under a single legis-body.
+    """
+    contents = [
+        LegislationContent(
+            legislation_content_id=offset,
+            parent_id=None,
+            lc_ident="lb",
+            content_type="legis-body",
+        )
+    ]
+    next_id = offset + 1
+    for lc_ident, text, quote in sections:
+        section_id = next_id
+        contents.append(
+            LegislationContent(
+                legislation_content_id=section_id,
+                parent_id=offset,
+                lc_ident=lc_ident,
+                content_type="section",
+                section_display=lc_ident,
+                content_str=text,
+            )
+        )
+        next_id += 1
+        if quote is not None:
+            contents.append(
+                LegislationContent(
+                    legislation_content_id=next_id,
+                    parent_id=section_id,
+                    lc_ident=f"{lc_ident}-q",
+                    content_type="quoted-block",
+                )
+            )
+            contents.append(
+                LegislationContent(
+                    legislation_content_id=next_id + 1,
+                    parent_id=next_id,
+                    lc_ident=f"{lc_ident}-q1",
+                    content_type="paragraph",
+                    content_str=quote,
+                )
+            )
+            next_id += 2
+    return {x.lc_ident: x.legislation_content_id for x in contents}, fingerprint_contents(
+        group_by_parent(contents)
+    )
+
+
+class TestIncrementalDiff(TestCase):
+    def test_identical_versions_are_fully_reusable(self):
+        sections = [("s1", "Section 1 of title 5 is amended", None)]
+        previous_ids, previous = _bill(100, sections)
+        current_ids, current = _bill(200, sections)
+        delta = diff_versions(previous, current)
+        self.assertEqual(delta["added"], [])
+        self.assertEqual(delta["removed"], [])
+        self.assertEqual(delta["modified"], {})
+        self.assertEqual(len(delta["reusable"]), len(current))
+        self.assertEqual(delta["reusable"][current_ids["s1"]], previous_ids["s1"])
+
+    def test_added_removed_and_modified(self):
+        previous_ids, previous = _bill(
+            100, [("s1", "Old text", None), ("s2", "Dropped", None)]
+        )
+        current_ids, current = _bill(
+            200, [("s1", "New text", None), ("s3", "Added", None)]
+        )
+        delta = diff_versions(previous, current)
+        self.assertEqual(delta["modified"], {current_ids["s1"]: previous_ids["s1"]})
+        self.assertEqual(delta["added"], [current_ids["s3"]])
+        self.assertEqual(delta["removed"], [previous_ids["s2"]])
+        self.assertIn(current_ids["lb"], delta["reusable"])
+
+    def test_quoted_block_change_blocks_reuse_of_parent(self):
+        previous_ids, previous = _bill(
+            100, [("s1", "is amended by adding at the end the following:", "(c) Old.")]
+        )
+        current_ids, current = _bill(
+            200, [("s1", "is amended by adding at the end the following:", "(c) New.")]
+        )
+        delta = diff_versions(previous, current)
+        self.assertIn(current_ids["s1"], delta["unchanged"])
+        self.assertNotIn(current_ids["s1"], delta["reusable"])
+        self.assertIn(current_ids["s1-q1"], delta["modified"])
+
+    def test_parent_change_blocks_reuse_of_children(self):
+        previous_ids, previous = _bill(100, [("s1", "Section 2 of title 5", "(a) Text.")])
+        current_ids, current = _bill(200, [("s1", "Section 3 of title 5", "(a) Text.")])
+        delta = diff_versions(previous, current)
+        self.assertIn(current_ids["s1"], delta["modified"])
+        self.assertIn(current_ids["s1-q1"], delta["unchanged"])
+        self.assertNotIn(current_ids["s1-q1"], delta["reusable"])
+
+    def test_duplicate_identities_are_not_matched(self):
+        sections = [("s1", "One", None), ("s1", "Two", None)]
+        _, previous = _bill(100, sections)
+        _, current = _bill(200, sections)
+        delta = diff_versions(previous, current)
+        self.assertEqual(len(delta["added"]), 2)
+        self.assertEqual(len(delta["removed"]), 2)
+
+    def test_missing_lc_ident_falls_back_to_path(self):
+        _, previous = _bill(100, [(None, "Text", None)])
+        _, current = _bill(200, [(None, "Text", None)])
+        delta = diff_versions(previous, current)
+        self.assertEqual(delta["added"], [])
+        self.assertEqual(len(delta["reusable"]), 2)
@@ -0,0 +1,92 @@
+from unittest import TestCase
+
+from lxml import etree
+from sqlalchemy.dialects import postgresql
+
+from congress_db.models import USCContent
+from congress_parser.importers.release_delta import (
+    carried_section,
+    in_release,
+    normalize_text,
+    section_hash,
+)
+
+NS = "http://xml.house.gov/schemas/uslm/1.0"
+SECTION = f"""<section xmlns="{NS}" id="g1" identifier="/us/usc/t42/s1395">
+<num value="1395">§1395.</num><heading>Prohibition</heading>
+<subsection id="g2" identifier="/us/usc/t42/s1395/a"><num value="a">(a)</num>
+<content>Nothing in this title shall be construed.</content></subsection>
+</section>"""
+
+
+def _hash(xml):
+    return section_hash(etree.fromstring(xml))
+
+
+class TestSectionHash(TestCase):
+    def test_stable(self):
+        self.assertEqual(_hash(SECTION), _hash(SECTION))
+
+    def test_ignores_formatting(self):
+        reformatted = SECTION.replace("shall be", "shall\n      be").replace(
+            "Prohibition", "Prohibition "
+        )
+        self.assertEqual(_hash(SECTION), _hash(reformatted))
+
+    def test_text_change(self):
+        self.assertNotEqual(_hash(SECTION), _hash(SECTION.replace("Nothing", "All")))
+
+    def test_guid_change(self):
+        self.assertNotEqual(_hash(SECTION), _hash(SECTION.replace('"g2"', '"g3"')))
+
+    def test_tail_of_section_not_included(self):
+        root = etree.fromstring(f"<title>{SECTION}after</title>")
+        self.assertEqual(section_hash(root[0]), _hash(SECTION))
+
+    def test_normalize_text(self):
+        self.assertEqual(normalize_text(" a\n\tb—c "), "a b--c")
+        self.assertEqual(normalize_text(None), "")
+
+
+class TestCarriedSection(TestCase):
+    def setUp(self):
+        self.previous = {
+            "/us/usc/t42/s1": {
+                "usc_section_id": 10,
+                "source_version_id": 1,
+                "section_hash": "aaa",
+            },
+            "/us/usc/t42/s2": None,
+        }
+
+    def test_unchanged_is_carried(self):
+        match = carried_section(self.previous, {}, "/us/usc/t42/s1", "aaa")
+        self.assertEqual(match["usc_section_id"], 10)
+
+    def test_changed_new_and_ambiguous_are_written(self):
+        self.assertIsNone(carried_section(self.previous, {}, "/us/usc/t42/s1", "bbb"))
+        self.assertIsNone(carried_section(self.previous, {}, "/us/usc/t42/s2", "aaa"))
+        self.assertIsNone(carried_section(self.previous, {}, "/us/usc/t42/s3", "aaa"))
+
+    def test_repeated_identifier_is_written(self):
+        seen = {}
+        self.assertIsNotNone(
+            carried_section(self.previous, seen, "/us/usc/t42/s1", "aaa")
+        )
+        self.assertIsNone(carried_section(self.previous, seen, "/us/usc/t42/s1", "aaa"))
+
+
+class TestInRelease(TestCase):
+    def test_carried_rows_matched_with_their_owner(self):
+        sql = str(
+            in_release(USCContent, 5).compile(
+                dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+            )
+        )
+        self.assertIn("usc_content.version_id = 5", sql)
+        self.assertIn(
+            "(usc_content.usc_section_id, usc_content.version_id) IN "
+            "(SELECT usc_section_version.usc_section_id, "
+            "usc_section_version.source_version_id",
+            sql,
+        )
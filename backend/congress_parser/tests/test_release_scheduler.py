@@ -0,0 +1,70 @@
+import io
+import zipfile
+from contextlib import redirect_stdout
+from unittest import TestCase
+
+from congress_parser.importers.release_scheduler import (
+    plan_titles,
+    print_timings,
+    title_number,
+)
+
+
+def _info(name, size):
+    info = zipfile.ZipInfo(name)
+    info.file_size = size
+    return info
+
+
+class TestPlanTitles(TestCase):
+    def test_largest_first(self):
+        jobs = plan_titles(
+            [
+                _info("usc01.xml", 10),
+                _info("usc42.xml", 900),
+                _info("usc26.xml", 1200),
+                _info("usc05A.xml", 10),
+                _info("usc10.xml", 700),
+            ]
+        )
+        self.assertEqual(
+            [x["chapter_number"] for x in jobs], ["26", "42", "10", "01", "05A"]
+        )
+        self.assertEqual(
+            jobs[0], {"member": "usc26.xml", "chapter_number": "26", "file_size": 1200}
+        )
+
+    def test_only_xml_members(self):
+        jobs = plan_titles(
+            [_info("usc42.xml", 1), _info("readme.txt", 5), _info("xml/", 0)]
+        )
+        self.assertEqual([x["member"] for x in jobs], ["usc42.xml"])
+
+    def test_title_number(self):
+        self.assertEqual(title_number("usc42.xml"), "42")
+        self.assertEqual(title_number("xml/usc05A.xml"), "05A")
+
+
+class TestPrintTimings(TestCase):
+    def test_slowest_title_reported(self):
+        timings = [
+            {
+                "member": f"usc{x}.xml",
+                "chapter_number": x,
+                "file_size": 1000,
+                "pid": 1,
+                "parse_seconds": seconds,
+                "wait_seconds": 0.5,
+                "write_seconds": 1.0,
+                "written": 3,
+                "carried": 0,
+            }
+            for x, seconds in [("01", 1.0), ("42", 30.0)]
+        ] + [None]
+        output = io.StringIO()
+        with redirect_stdout(output):
+            print_timings(timings, 40.0)
+        lines = output.getvalue().splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[1].strip().startswith("42"))
+        self.assertEqual(lines[-1], "2 titles in 40.0s, slowest title 42 took 31.5s")
@@ -0,0 +1,59 @@
+from unittest import TestCase
+
+from sqlalchemy.dialects import postgresql
+
+from congress_parser.importers.search_documents import (
+    record_latest_versions,
+    refresh_search_documents,
+)
+
+
+class _RecordingSession:
+    def __init__(self):
+        self.executed = []
+        self.commits = 0
+
+    def execute(self, statement, params=None):
+        self.executed.append((str(statement.compile(dialect=postgresql.dialect())), params))
+
+    def commit(self):
+        self.commits += 1
+
+
+class TestRefreshSearchDocuments(TestCase):
+    def test_one_statement_for_the_batch(self):
+        session = _RecordingSession()
+        self.assertEqual(refresh_search_documents(session, [3, 1, 3, None]), 2)
+        self.assertEqual(len(session.executed), 1)
+        sql, params = session.executed[0]
+        self.assertEqual(params, {"legislation_ids": [1, 3]})
+        self.assertIn("INSERT INTO legislation_search", sql)
+        self.assertIn("ON CONFLICT (legislation_id) DO UPDATE", sql)
+        self.assertIn("setweight(to_tsvector('english', title), 'A')", sql)
+        self.assertIn("LEFT JOIN legislation_latest_version", sql)
+        self.assertEqual(session.commits, 1)
+
+    def test_nothing_to_refresh(self):
+        session = _RecordingSession()
+        self.assertEqual(refresh_search_documents(session, []), 0)
+        self.assertEqual(session.executed, [])
+        self.assertEqual(session.commits, 0)
+
+    def test_left_to_the_callers_commit(self):
+        session = _RecordingSession()
+        refresh_search_documents(session, [1], commit=False)
+        self.assertEqual(len(session.executed), 1)
+        self.assertEqual(session.commits, 0)
+
+
+class TestRecordLatestVersions(TestCase):
+    def test_upserts_the_newest_version(self):
+        session = _RecordingSession()
+        self.assertEqual(record_latest_versions(session, [5, 5, 2], commit=False), 2)
+        sql, params = session.executed[0]
+        self.assertEqual(params, {"legislation_ids": [2, 5]})
+        self.assertIn("max(legislation_version_id)", sql)
+        self.assertIn("ON CONFLICT (legislation_id) DO UPDATE", sql)
+        self.assertEqual(session.commits, 0)
+        self.assertEqual(record_latest_versions(session, []), 0)
+        self.assertEqual(len(session.executed), 1)
@@ -0,0 +1,122 @@
+"""
+Tests for the ZIP member fingerprint check in parse_archives, which skips bill XML
+that has not changed since the last run.
+"""
+
+import hashlib
+import io
+import os
+import tempfile
+from unittest import TestCase
+from zipfile import ZipFile
+
+from congress_parser.run_through import (
+    _HashingReader,
+    _member_sha256,
+    partition_by_fingerprint,
+    record_source_fingerprint,
+    stream_bill_document,
+)
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def _member(path, crc32, file_size):
+    return {"path": path, "crc32": crc32, "file_size": file_size}
+
+
+class TestPartitionByFingerprint(TestCase):
+    def test_unchanged_members_are_skipped(self):
+        names = [
+            _member("BILLS-119hr1ih.xml", 10, 100),
+            _member("BILLS-119hr2ih.xml", 20, 200),
+        ]
+        fingerprints = {"BILLS-119hr1ih.xml": (10, 100, None)}
+        to_parse, counts = partition_by_fingerprint(names, fingerprints)
+        self.assertEqual([x["path"] for x in to_parse], ["BILLS-119hr2ih.xml"])
+        self.assertEqual(counts, {"parsed": 1, "skipped": 1, "changed": 0})
+        self.assertFalse(to_parse[0]["changed"])
+
+    def test_changed_crc_or_size_is_reparsed(self):
+        names = [
+            _member("BILLS-119hr1ih.xml", 11, 100),
+            _member("BILLS-119hr2ih.xml", 20, 201),
+        ]
+        fingerprints = {
+            "BILLS-119hr1ih.xml": (10, 100, None),
+            "BILLS-119hr2ih.xml": (20, 200, None),
+        }
+        to_parse, counts = partition_by_fingerprint(names, fingerprints)
+        self.assertEqual(len(to_parse), 2)
+        self.assertTrue(all(x["changed"] for x in to_parse))
+        self.assertEqual(counts, {"parsed": 2, "skipped": 0, "changed": 2})
+
+    def test_member_name_ignores_directories(self):
+        names = [_member("bills/BILLS-119hr1ih.xml", 10, 100)]
+        fingerprints = {"BILLS-119hr1ih.xml": (10, 100, None)}
+        to_parse, _ = partition_by_fingerprint(names, fingerprints)
+        self.assertEqual(to_parse, [])
+
+    def test_verify_catches_crc_collisions(self):
+        names = [_member("BILLS-119hr1ih.xml", 10, 100)]
+        fingerprints = {"BILLS-119hr1ih.xml": (10, 100, "abc")}
+        to_parse, counts = partition_by_fingerprint(
+            names, fingerprints, verify=lambda x: "def"
+        )
+        self.assertEqual(len(to_parse), 1)
+        self.assertEqual(counts["changed"], 1)
+        to_parse, counts = partition_by_fingerprint(
+            names, fingerprints, verify=lambda x: "abc"
+        )
+        self.assertEqual(counts["skipped"], 1)
+
+
+class TestHashingReader(TestCase):
+    def test_hashes_everything_read(self):
+        data = b"<bill>" + b"x" * 5000 + b"</bill>"
+        reader = _HashingReader(io.BytesIO(data))
+        while reader.read(1024):
+            pass
+        self.assertEqual(reader.hexdigest(), hashlib.sha256(data).hexdigest())
+
+    def test_digest_covers_unread_rest(self):
+        data = b"<bill>" + b"x" * 5000 + b"</bill>"
+        reader = _HashingReader(io.BytesIO(data))
+        reader.read(10)
+        self.assertEqual(reader.hexdigest(), hashlib.sha256(data).hexdigest())
+
+
+class _RecordingSession:
+    def __init__(self):
+        self.executed = []
+
+    def execute(self, statement, params=None):
+        self.executed.append(statement)
+
+
+class TestRecordSourceFingerprint(TestCase):
+    def test_skipped_bill_records_whole_member_hash(self):
+        # parse_bill returns for an already ingested bill right after
+        # stream_bill_document, which stops at the first content record
+        member_name = "BILLS-119hr1ih.xml"
+        with tempfile.TemporaryDirectory() as tmp:
+            archive_path = os.path.join(tmp, "BILLS-119-hr.zip")
+            with open(os.path.join(FIXTURES, "bill_simple.xml"), "rb") as f:
+                data = f.read()
+            with ZipFile(archive_path, "w") as archive:
+                # Longer than lxml reads at once, so the parse stops short of the end
+                archive.writestr(member_name, data + b"<!--" + b" " * 500000 + b"-->\n")
+            archive_obj = {
+                "archive": "BILLS-119-hr.zip",
+                "file": member_name,
+                "fingerprint": {"crc32": 1, "file_size": 2},
+            }
+            with ZipFile(archive_path).open(member_name, "r") as member:
+                archive_obj["reader"] = _HashingReader(member)
+                stream_bill_document(archive_obj["reader"])
+                session = _RecordingSession()
+                record_source_fingerprint(session, archive_obj, 7)
+            expected = _member_sha256(archive_path, member_name)
+
+        (statement,) = session.executed
+        self.assertEqual(statement.compile().params["sha256"], expected)
@@ -0,0 +1,121 @@
+import os
+from unittest import TestCase
+
+from sqlalchemy.dialects import postgresql
+
+from congress_db.models import LegislationChamber, LegislationType
+from congress_parser.status_parser import (
+    StatusLookups,
+    parse_status_record,
+    write_status_batch,
+)
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "bill_status.xml")
+
+
+def _record():
+    with open(FIXTURE, "rb") as f:
+        return parse_status_record(f.read())
+
+
+class _RecordingSession:
+    def __init__(self):
+        self.executed = []
+        self.commits = 0
+
+    def execute(self, statement, params=None):
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+        table = getattr(statement, "table", None)
+        self.executed.append((table.name if table is not None else params, sql))
+
+    def commit(self):
+        self.commits += 1
+
+
+def _lookups(session):
+    """
+    StatusLookups as loaded from a database that already knows everything in the
+    fixture, one H.R. 1 and one H.Res. 1 in the 119th Congress
+    """
+    lookups = StatusLookups.__new__(StatusLookups)
+    lookups.session = session
+    lookups.congress_ids = {119: 5}
+    lookups.legislation = {
+        119: {
+            (LegislationChamber.House, 1): [
+                (LegislationType.Res, 40),
+                (LegislationType.Bill, 41),
+            ]
+        }
+    }
+    lookups.committees = {
+        ("hsju00", LegislationChamber.House): 7,
+        ("hsju01", LegislationChamber.House): 8,
+    }
+    lookups.subjects = {
+        "Criminal law and procedure": 1,
+        "Detention of persons": 2,
+        "Immigration status and procedures": 3,
+    }
+    lookups.policy_areas = {"Immigration": 4}
+    return lookups
+
+
+class TestParseStatusRecord(TestCase):
+    def test_fixture(self):
+        record = _record()
+        self.assertEqual(
+            (record["congress"], record["chamber"], record["bill_type"], record["number"]),
+            (119, "House", "HR", 1),
+        )
+        self.assertEqual(len(record["actions"]), 3)
+        self.assertEqual(record["actions"][0]["text"], "Introduced in House")
+        self.assertEqual(record["policy_area"], "Immigration")
+        self.assertEqual(len(record["subjects"]), 3)
+        self.assertEqual(
+            [
+                (x["system_code"], x["parent_system_code"], x["referred_date"])
+                for x in record["committees"]
+            ],
+            [
+                ("hsju00", None, "2025-01-07T14:00:00Z"),
+                ("hsju01", "hsju00", "2025-01-08T14:00:00Z"),
+            ],
+        )
+        self.assertIsNone(record["committees"][0]["discharge_date"])
+
+
+class TestWriteStatusBatch(TestCase):
+    def test_one_statement_per_table(self):
+        session = _RecordingSession()
+        missing = {**_record(), "number": 2}
+        matched = write_status_batch(session, [_record(), missing], _lookups(session))
+        self.assertEqual(matched, 1)
+        self.assertEqual(
+            [x[0] for x in session.executed],
+            [
+                "legislation_action",
+                "legislation_committee_association",
+                "legislative_subject_association",
+                "legislative_policy_area_association",
+                {"legislation_ids": [41]},
+                None,
+            ],
+        )
+        # The batch, then the cache version bump
+        self.assertEqual(session.commits, 2)
+        for table, sql in session.executed[:-1]:
+            self.assertIn("ON CONFLICT", sql)
+        self.assertIn("INSERT INTO legislation_search", session.executed[-2][1])
+        self.assertIn("nextval('api_cache_version')", session.executed[-1][1])
+        committee_sql = session.executed[1][1]
+        self.assertIn(
+            "ON CONFLICT (legislation_committee_id, legislation_id) DO UPDATE", committee_sql
+        )
+        self.assertIn("discharge_date = excluded.discharge_date", committee_sql)
+
+    def test_status_type_picks_the_bill(self):
+        lookups = _lookups(None)
+        self.assertEqual(lookups.legislation_id(_record()), 41)
+        self.assertEqual(lookups.legislation_id({**_record(), "bill_type": "HRES"}), 40)
+        self.assertIsNone(lookups.legislation_id({**_record(), "number": 9}))
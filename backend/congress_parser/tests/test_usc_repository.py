@@ -0,0 +1,64 @@
+from unittest import TestCase
+
+from sqlalchemy.dialects import postgresql
+
+from congress_parser.actions.repository import (
+    CONTENT_BY_IDENT,
+    DESCENDANTS,
+    LAST_CHILD,
+    USCRepository,
+)
+from congress_parser.actions.snapshot import USCSnapshot
+from congress_parser.tests.test_usc_snapshot import _FakeSession
+
+
+class _Row:
+    def __init__(self, usc_content_id):
+        self.usc_content_id = usc_content_id
+
+
+class _Result:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def first(self):
+        return self.rows[0] if self.rows else None
+
+
+class _StatementSession:
+    def __init__(self):
+        self.executed = []
+
+    def execute(self, statement, params):
+        self.executed.append((statement, params))
+        if params.get("usc_ident") == "/us/usc/t42/s1":
+            return _Result([(_Row(1),)])
+        return _Result([])
+
+
+class TestUSCRepository(TestCase):
+    def test_statements_filter_on_version(self):
+        for statement in [CONTENT_BY_IDENT, LAST_CHILD, DESCENDANTS]:
+            sql = str(statement.compile(dialect=postgresql.dialect()))
+            self.assertIn("version_id = %(base_id)s", sql)
+
+    def test_exact_lookups_are_cached(self):
+        session = _StatementSession()
+        repository = USCRepository(session, 3)
+        self.assertEqual(repository.content("/us/usc/t42/s1").usc_content_id, 1)
+        self.assertEqual(repository.content("/us/usc/t42/s1").usc_content_id, 1)
+        self.assertIsNone(repository.content("/us/usc/t42/s2"))
+        self.assertIsNone(repository.content("/us/usc/t42/s2"))
+        self.assertEqual((repository.hits, repository.misses), (2, 2))
+        # The same statement object is reused, only the parameters change
+        self.assertTrue(all(x[0] is CONTENT_BY_IDENT for x in session.executed))
+        self.assertEqual(session.executed[0][1], {"usc_ident": "/us/usc/t42/s1", "base_id": 3})
+
+    def test_snapshot_lookups_count_as_hits(self):
+        session = _FakeSession()
+        repository = USCRepository(session, 1, USCSnapshot(1))
+        repository.content("/us/usc/t42/s1395")
+        repository.content("/us/usc/t42/s1395/a")
+        section = repository.content("/us/usc/t42/s1395")
+        repository.descendants(section)
+        self.assertEqual((repository.hits, repository.misses), (3, 1))
@@ -0,0 +1,90 @@
+from unittest import TestCase
+
+from congress_parser.actions import snapshot
+from congress_parser.actions.snapshot import USCSnapshot, citation_title, get_usc_snapshot
+
+# usc_content_id, parent_id, usc_ident, order_number, heading, content_str, content_type, usc_section_id
+CONTENT_ROWS = [
+    (1, None, "/us/usc/t42/s1395", 0, "Section", None, "section", 10),
+    (2, 1, "/us/usc/t42/s1395/a", 0, None, "(a) text", "subsection", 10),
+    (3, 1, "/us/usc/t42/s1395/b", 1, None, "(b) text", "subsection", 10),
+    (4, 3, "/us/usc/t42/s1395/b/1", 0, None, "(1) text", "paragraph", 10),
+    (5, None, "/us/usc/t42/s1395a", 0, "Other", None, "section", 11),
+]
+SECTION_ROWS = [(10, None, "/us/usc/t42/s1395", "Section", 42)]
+
+
+class _Result:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+class _FakeSession:
+    def __init__(self):
+        self.executed = []
+
+    def execute(self, query):
+        self.executed.append(query)
+        table = query.get_final_froms()[0].name
+        if table == "usc_content":
+            return _Result(CONTENT_ROWS)
+        if table == "usc_section":
+            return _Result(SECTION_ROWS)
+        return _Result([("42", 7), ("42", 8)])
+
+
+class TestUSCSnapshot(TestCase):
+    def setUp(self):
+        self.session = _FakeSession()
+        self.snapshot = USCSnapshot(1)
+
+    def test_title_loaded_once(self):
+        self.snapshot.content(self.session, "/us/usc/t42/s1395/a")
+        self.snapshot.content(self.session, "/us/usc/t42/s1395/b")
+        self.snapshot.section(self.session, "/us/usc/t42/s1395")
+        self.assertEqual(len(self.session.executed), 2)
+
+    def test_exact_lookup(self):
+        content = self.snapshot.content(self.session, "/us/usc/t42/s1395/b")
+        self.assertEqual(content.usc_content_id, 3)
+        self.assertIsNone(self.snapshot.content(self.session, "/us/usc/t42/s9"))
+        self.assertIsNone(self.snapshot.content(self.session, "not a cite"))
+
+    def test_prefix_lookup_matches_like(self):
+        results = self.snapshot.contents_with_prefix(self.session, "/us/usc/t42/s1395")
+        self.assertEqual([x.usc_content_id for x in results], [1, 2, 3, 4, 5])
+        results = self.snapshot.contents_with_prefix(self.session, "/us/usc/t42/s1395/b")
+        self.assertEqual([x.usc_content_id for x in results], [3, 4])
+
+    def test_title_only_prefix_falls_back(self):
+        self.assertIsNone(self.snapshot.contents_with_prefix(self.session, "/us/usc/t4"))
+
+    def test_children(self):
+        section = self.snapshot.content(self.session, "/us/usc/t42/s1395")
+        self.assertEqual(self.snapshot.last_child(section).usc_content_id, 3)
+        self.assertEqual(
+            sorted(x.usc_content_id for x in self.snapshot.descendants(section)),
+            [1, 2, 3, 4],
+        )
+
+    def test_chapter_id(self):
+        self.assertEqual(self.snapshot.chapter_id(self.session, "42"), 7)
+        self.assertIsNone(self.snapshot.chapter_id(self.session, "5"))
+        self.assertEqual(self.snapshot.queries, 1)
+
+    def test_citation_title(self):
+        self.assertEqual(citation_title("/us/usc/t42/s1395/a"), "t42")
+        self.assertIsNone(citation_title("/us/pl/118/5"))
+
+
+class TestSnapshotCache(TestCase):
+    def tearDown(self):
+        snapshot._SNAPSHOT = None
+
+    def test_shared_until_base_changes(self):
+        first = get_usc_snapshot(1)
+        self.assertIs(get_usc_snapshot(1), first)
+        self.assertIsNot(get_usc_snapshot(2), first)
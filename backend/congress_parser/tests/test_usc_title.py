@@ -0,0 +1,431 @@
+"""
+Tests for the set-based title loader in importers/usc_title.py, run over the
+usc_title_sample.xml fixture and a generated wide title.
+"""
+
+import io
+import os
+from unittest import TestCase
+
+from lxml import etree
+
+from congress_parser.importers.release_delta import section_hash
+from congress_parser.importers.usc_title import (
+    SECTION_COLUMNS,
+    CONTENT_COLUMNS,
+    flatten_title,
+    is_leaf_section,
+    roman_value,
+    section_sort_key,
+    section_sort_orders,
+    stream_title,
+    title_rows,
+    write_title_chunks,
+)
+from congress_parser.utils.bulk import rows_to_copy_buffer
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "usc_title_sample.xml")
+
+
+def _elements():
+    with open(FIXTURE, "rb") as f:
+        root = etree.fromstring(f.read())
+    return root.xpath("//*[@identifier]")
+
+
+def _joined(document):
+    records = {"sections": [], "contents": [], "section_versions": []}
+    for chunk in document["chunks"]:
+        for name, values in chunk.items():
+            records[name] += values
+    return records
+
+
+def _previous_s1395():
+    section = [x for x in _elements() if x.attrib["identifier"] == "/us/usc/t42/s1395"][0]
+    return {
+        "/us/usc/t42/s1395": {
+            "usc_section_id": 99,
+            "source_version_id": 1,
+            "section_hash": section_hash(section),
+        }
+    }
+
+
+class TestFlattenTitle(TestCase):
+    def setUp(self):
+        self.records = flatten_title(_elements(), "42")
+
+    def test_sections_and_parents(self):
+        sections = self.records["sections"]
+        self.assertEqual(
+            [(x["usc_ident"], x["content_type"]) for x in sections],
+            [
+                ("/us/usc/t42/ch7", "chapter"),
+                ("/us/usc/t42/ch7/schXVIII", "subchapter"),
+                ("/us/usc/t42/s1395", "section"),
+                ("/us/usc/t42/s1395a", "section"),
+                ("/us/usc/t42/ch8", "chapter"),
+                ("/us/usc/t42/s1401", "section"),
+            ],
+        )
+        self.assertEqual(
+            [x["parent_index"] for x in sections], [None, 0, 1, 1, None, 4]
+        )
+        self.assertEqual(sections[2]["number"], "1395")
+        self.assertEqual(sections[0]["heading"], "SOCIAL SECURITY")
+
+    def test_content_preorder(self):
+        contents = self.records["contents"]
+        self.assertEqual(
+            [
+                (x["usc_ident"], x["parent_index"], x["order_number"], x["section_index"])
+                for x in contents
+            ],
+            [
+                ("/us/usc/t42/s1395", None, 0, 2),
+                ("/us/usc/t42/s1395/a", 0, 0, 2),
+                ("/us/usc/t42/s1395/b", 0, 1, 2),
+                ("/us/usc/t42/s1395/b/1", 2, 0, 2),
+                ("/us/usc/t42/s1395/b/2", 2, 1, 2),
+                ("/us/usc/t42/s1395a", None, 0, 3),
+                ("/us/usc/t42/s1395a/a", 5, 0, 3),
+                ("/us/usc/t42/s1401", None, 0, 5),
+            ],
+        )
+
+    def test_content_fields(self):
+        contents = self.records["contents"]
+        self.assertEqual(contents[1]["heading"], "General rule")
+        self.assertTrue(contents[1]["content_str"].startswith("The insurance program"))
+        # No heading, the content sits in the second child
+        self.assertIsNone(contents[3]["heading"])
+        self.assertTrue(contents[3]["content_str"].startswith("an individual"))
+
+    def test_every_leaf_section_versioned(self):
+        self.assertEqual(
+            [
+                (x["usc_ident"], x["section_index"])
+                for x in self.records["section_versions"]
+            ],
+            [("/us/usc/t42/s1395", 2), ("/us/usc/t42/s1395a", 3), ("/us/usc/t42/s1401", 5)],
+        )
+
+    def test_unchanged_sections_are_carried(self):
+        elements = _elements()
+        section = [x for x in elements if x.attrib["identifier"] == "/us/usc/t42/s1395"][0]
+        previous = {
+            "/us/usc/t42/s1395": {
+                "usc_section_id": 99,
+                "source_version_id": 1,
+                "section_hash": section_hash(section),
+            },
+            "/us/usc/t42/s1401": {
+                "usc_section_id": 98,
+                "source_version_id": 1,
+                "section_hash": "stale",
+            },
+        }
+        records = flatten_title(elements, "42", previous)
+        self.assertNotIn(
+            "/us/usc/t42/s1395", [x["usc_ident"] for x in records["sections"]]
+        )
+        self.assertEqual(len(records["contents"]), 3)
+        carried = [x for x in records["section_versions"] if x["section_index"] is None]
+        self.assertEqual([x["usc_section_id"] for x in carried], [99])
+
+
+def _wide_title(chapters, sections):
+    ns = "http://xml.house.gov/schemas/uslm/1.0"
+    parts = [f'<uscDoc xmlns="{ns}"><meta><title>Title 9</title></meta><main>']
+    parts.append('<title identifier="/us/usc/t9"><num value="9">Title 9</num>')
+    parts.append("<heading>WIDE</heading>")
+    for c in range(chapters):
+        parts.append(f'<chapter id="c{c}" identifier="/us/usc/t9/ch{c}"><num value="{c}">{c}</num>')
+        parts.append(f"<heading>Chapter {c}</heading>")
+        for s in range(sections):
+            ident = f"/us/usc/t9/s{c}{s:03d}"
+            parts.append(
+                f'<section id="s{c}{s}" identifier="{ident}"><num value="{c}{s:03d}">{c}{s:03d}</num>'
+                f"<heading>Section {s}</heading><chapeau>Text {s}</chapeau>"
+                f'<subsection id="s{c}{s}a" identifier="{ident}/a"><num value="a">(a)</num>'
+                f"<content>Sub {s}</content></subsection></section>"
+            )
+            parts.append("<note>Between sections</note>")
+        parts.append("</chapter>")
+    parts.append("</title></main></uscDoc>")
+    return "".join(parts).encode()
+
+
+class TestStreamTitle(TestCase):
+    def test_matches_tree_flatten(self):
+        with open(FIXTURE, "rb") as f:
+            source = f.read()
+        document = stream_title(source, "42")
+        self.assertEqual(document["title_ident"], "/us/usc/t42")
+        self.assertEqual(document["long_title"], "THE PUBLIC HEALTH AND WELFARE")
+        self.assertEqual(_joined(document), flatten_title(_elements(), "42"))
+
+    def test_matches_tree_flatten_on_wide_title(self):
+        source = _wide_title(3, 50)
+        elements = etree.fromstring(source).xpath("//*[@identifier]")
+        with io.BytesIO(source) as f:
+            records = _joined(stream_title(f, "9"))
+        self.assertEqual(records, flatten_title(elements, "9"))
+        self.assertEqual(len(records["section_versions"]), 150)
+        self.assertEqual(len(records["contents"]), 300)
+
+    def test_chunks_join_to_tree_flatten(self):
+        source = _wide_title(3, 50)
+        elements = etree.fromstring(source).xpath("//*[@identifier]")
+        with io.BytesIO(source) as f:
+            chunks = list(stream_title(f, "9", chunk_size=7)["chunks"])
+        # A leaf section brings 3 records, so a chunk closes after at most 3 of them
+        self.assertEqual(len(chunks), 51)
+        self.assertTrue(all(len(x["contents"]) <= 6 for x in chunks))
+        self.assertEqual(_joined({"chunks": chunks}), flatten_title(elements, "9"))
+
+    def test_previous_loaded_by_title(self):
+        with open(FIXTURE, "rb") as f:
+            source = f.read()
+        section = [x for x in _elements() if x.attrib["identifier"] == "/us/usc/t42/s1395"][0]
+        requested = []
+
+        def load_previous(title_ident):
+            requested.append(title_ident)
+            return {
+                "/us/usc/t42/s1395": {
+                    "usc_section_id": 99,
+                    "source_version_id": 1,
+                    "section_hash": section_hash(section),
+                }
+            }
+
+        records = _joined(stream_title(source, "42", load_previous))
+        self.assertEqual(requested, ["/us/usc/t42"])
+        carried = [x for x in records["section_versions"] if x["section_index"] is None]
+        self.assertEqual([x["usc_section_id"] for x in carried], [99])
+        self.assertEqual(len(records["contents"]), 3)
+
+
+class _Result:
+    def __init__(self, values):
+        self.values = values
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self.values
+
+
+class _CopyConnection:
+    def __init__(self):
+        self.copied = {}
+
+    def cursor(self):
+        return self
+
+    def copy_expert(self, sql, buffer):
+        table = sql.split()[1]
+        self.copied[table] = self.copied.get(table, "") + buffer.read()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+class _SessionConnection:
+    # copy_rows takes the DBAPI connection from session.connection().connection
+    def __init__(self, connection):
+        self.connection = connection
+
+
+class _CopySession:
+    """
+    Stands in for the session in write_title_chunks: hands out ids from a counter per
+    table, and keeps the text of every COPY and the parameters of other statements
+    """
+
+    def __init__(self):
+        self.next_id = {}
+        self.executed = []
+        self.commits = 0
+        self.dbapi = _CopyConnection()
+
+    def execute(self, statement, params=None):
+        if isinstance(params, dict) and "count" in params:
+            start = self.next_id.get(params["table_name"], 1)
+            self.next_id[params["table_name"]] = start + params["count"]
+            return _Result(list(range(start, start + params["count"])))
+        self.executed.append((str(statement), params))
+
+    def connection(self):
+        return _SessionConnection(self.dbapi)
+
+    def commit(self):
+        self.commits += 1
+
+
+class _CountingSlots:
+    def __init__(self):
+        self.taken = 0
+
+    def __enter__(self):
+        self.taken += 1
+
+    def __exit__(self, *args):
+        return False
+
+
+class TestWriteTitleChunks(TestCase):
+    def test_matches_single_write(self):
+        with open(FIXTURE, "rb") as f:
+            source = f.read()
+        previous = _previous_s1395()
+        records = flatten_title(_elements(), "42", previous)
+        section_ids = list(range(1, len(records["sections"]) + 1))
+        content_ids = list(range(1, len(records["contents"]) + 1))
+        sections, contents, versions = title_rows(
+            records, section_ids, content_ids, 7, 3
+        )
+        session = _CopySession()
+        slots = _CountingSlots()
+        document = stream_title(source, "42", lambda x: previous, chunk_size=2)
+        stats = write_title_chunks(session, document["chunks"], 7, 3, slots, commit=True)
+
+        self.assertEqual((stats["written"], stats["carried"]), (2, 1))
+        # The sections go in without sort_order, one UPDATE ranks the whole title
+        unranked = [x[:-1] + (None,) for x in sections]
+        self.assertEqual(
+            session.dbapi.copied["usc_section"], rows_to_copy_buffer(unranked).read()
+        )
+        self.assertEqual(
+            session.dbapi.copied["usc_content"], rows_to_copy_buffer(contents).read()
+        )
+        (update, ranks), (_, version_params) = session.executed
+        self.assertIn("UPDATE usc_section", update)
+        self.assertEqual(
+            ranks, {"section_ids": section_ids, "sort_orders": [x[-1] for x in sections]}
+        )
+        self.assertEqual(version_params, versions)
+        # One slot per chunk, and one for the sort order, versions and commit
+        self.assertEqual(slots.taken, 4)
+        self.assertEqual(session.commits, 1)
+
+
+class TestTitleRows(TestCase):
+    def test_ids_are_wired(self):
+        records = flatten_title(_elements(), "42")
+        section_ids = [100 + i for i in range(len(records["sections"]))]
+        content_ids = [200 + i for i in range(len(records["contents"]))]
+        sections, contents, versions = title_rows(
+            records, section_ids, content_ids, 7, 3
+        )
+        self.assertEqual(len(sections[0]), len(SECTION_COLUMNS))
+        self.assertEqual(len(contents[0]), len(CONTENT_COLUMNS))
+        by_id = {x[0]: x for x in sections}
+        # s1395 -> schXVIII -> ch7
+        self.assertEqual(by_id[102][1], 101)
+        self.assertEqual(by_id[101][1], 100)
+        self.assertEqual({x[8] for x in sections}, {7})
+        # /us/usc/t42/s1395/b/1 hangs off /us/usc/t42/s1395/b in section s1395
+        self.assertEqual(contents[3][1], 202)
+        self.assertEqual(contents[3][10], 102)
+        self.assertEqual(
+            [(x["usc_section_id"], x["source_version_id"]) for x in versions],
+            [(102, 3), (103, 3), (105, 3)],
+        )
+        # ch7, schXVIII, s1395, s1395a, ch8, s1401 are already in natural order
+        self.assertEqual([x[-1] for x in sections], [0, 1, 2, 3, 4, 5])
+
+    def test_carried_sections_placed_in_release(self):
+        elements = _elements()
+        section = [x for x in elements if x.attrib["identifier"] == "/us/usc/t42/s1395"][0]
+        previous = {
+            "/us/usc/t42/s1395": {
+                "usc_section_id": 99,
+                "source_version_id": 1,
+                "section_hash": section_hash(section),
+            }
+        }
+        records = flatten_title(elements, "42", previous)
+        section_ids = [100 + i for i in range(len(records["sections"]))]
+        content_ids = [200 + i for i in range(len(records["contents"]))]
+        _, _, versions = title_rows(records, section_ids, content_ids, 7, 3)
+        # s1395 and s1395a under this release's schXVIII, s1401 under its ch8
+        self.assertEqual(
+            [(x["usc_section_id"], x["usc_chapter_id"], x["parent_id"]) for x in versions],
+            [(99, 7, 101), (102, 7, 101), (104, 7, 103)],
+        )
+
+    def test_carried_sections_ranked_with_written(self):
+        elements = _elements()
+        section = [x for x in elements if x.attrib["identifier"] == "/us/usc/t42/s1395"][0]
+        previous = {
+            "/us/usc/t42/s1395": {
+                "usc_section_id": 99,
+                "source_version_id": 1,
+                "section_hash": section_hash(section),
+            }
+        }
+        records = flatten_title(elements, "42", previous)
+        section_ids = [100 + i for i in range(len(records["sections"]))]
+        content_ids = [200 + i for i in range(len(records["contents"]))]
+        sections, _, versions = title_rows(records, section_ids, content_ids, 7, 3)
+        # ch7, schXVIII, s1395a, ch8, s1401 around the carried s1395
+        self.assertEqual([x[-1] for x in sections], [0, 1, 3, 4, 5])
+        self.assertEqual([x["sort_order"] for x in versions], [2, 3, 5])
+
+    def test_is_leaf_section(self):
+        self.assertTrue(is_leaf_section("/us/usc/t42/s1395"))
+        self.assertFalse(is_leaf_section("/us/usc/t42/st1"))
+        self.assertFalse(is_leaf_section("/us/usc/t42/s1395/a"))
+        self.assertFalse(is_leaf_section("/us/usc/t42/ch7"))
+        self.assertFalse(is_leaf_section(None))
+
+
+class TestSectionSortKey(TestCase):
+    def test_natural_order(self):
+        numbers = ["1395w-101", "1395", "1395aa", "1395z", "1395w-4", "1395a", "1395w"]
+        self.assertEqual(
+            sorted(numbers, key=section_sort_key),
+            ["1395", "1395a", "1395w", "1395w-4", "1395w-101", "1395z", "1395aa"],
+        )
+
+    def test_distinguishes_lettered_sections(self):
+        self.assertLess(section_sort_key("1395a"), section_sort_key("1395b"))
+        self.assertLess(section_sort_key("9"), section_sort_key("10"))
+
+    def test_roman_numerals(self):
+        self.assertEqual(roman_value("XVIII"), 18)
+        self.assertEqual(roman_value("iv"), 4)
+        self.assertIsNone(roman_value("A"))
+        self.assertIsNone(roman_value(""))
+        self.assertLess(
+            section_sort_key("IX", roman=True), section_sort_key("X", roman=True)
+        )
+
+    def test_orders_are_hierarchical(self):
+        sections = [
+            (None, "7"),
+            (0, "XVIII"),
+            (0, "IV"),
+            (None, "8"),
+            (1, "1395a"),
+            (1, "1395"),
+            (2, "10"),
+        ]
+        self.assertEqual(section_sort_orders(sections), [0, 3, 1, 6, 5, 4, 2])
+
+    def test_lettered_siblings_are_not_roman(self):
+        # Subchapters A, B, C, D of title 26 are letters, not 100, 500
+        sections = [(None, "A"), (None, "D"), (None, "C"), (None, "B")]
+        self.assertEqual(section_sort_orders(sections), [0, 3, 2, 1])
+        sections = [(None, "V"), (None, "X"), (None, "IX")]
+        self.assertEqual(section_sort_orders(sections), [0, 2, 1])
+
+    def test_ties_keep_document_order(self):
+        self.assertEqual(section_sort_orders([(None, "1"), (None, "1")]), [0, 1])
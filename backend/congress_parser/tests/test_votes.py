@@ -0,0 +1,83 @@
+import threading
+import time
+from unittest import TestCase
+
+from congress_db.models import LegislatorVoteType
+from congress_parser.importers.votes import legislator_vote_rows, probe_rollcalls
+
+TEMPLATE = "https://clerk.house.gov/evs/{year}/roll{h_index:03}.xml"
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class FakeClerk:
+    """
+    Answers roll1.xml .. roll{last}.xml with 200 and anything after with 404, tracking
+    how many requests are in flight at once
+    """
+
+    def __init__(self, last):
+        self.last = last
+        self.urls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def get(self, url, timeout=None):
+        with self.lock:
+            self.urls.append(url)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.01)
+        with self.lock:
+            self.in_flight -= 1
+        index = int(url.split("roll")[1].split(".")[0])
+        return FakeResponse(200 if index <= self.last else 404)
+
+
+class TestProbeRollcalls(TestCase):
+    def _walk(self, clerk, start, ahead):
+        formatted = {"year": 2024, "h_index": start}
+        seen = []
+        for index, resp in probe_rollcalls(
+            TEMPLATE, formatted, "h_index", http=clerk, ahead=ahead
+        ):
+            if resp.status_code == 404:
+                break
+            seen.append(index)
+        return seen
+
+    def test_in_order_until_first_gap(self):
+        clerk = FakeClerk(last=30)
+        self.assertEqual(self._walk(clerk, 5, 4), list(range(6, 31)))
+        self.assertLessEqual(clerk.max_in_flight, 4)
+        self.assertGreater(clerk.max_in_flight, 1)
+        # Nothing far past the gap is requested
+        self.assertLessEqual(len(clerk.urls), 25 + 4)
+        self.assertIn("https://clerk.house.gov/evs/2024/roll006.xml", clerk.urls)
+
+    def test_nothing_new(self):
+        clerk = FakeClerk(last=10)
+        self.assertEqual(self._walk(clerk, 10, 8), [])
+
+
+class TestLegislatorVoteRows(TestCase):
+    def test_resolves_and_skips_unknown(self):
+        by_legislator = {
+            "S354": {"vote": LegislatorVoteType.from_string("Yea")},
+            "S999": {"vote": LegislatorVoteType.from_string("Nay")},
+        }
+        rows = legislator_vote_rows(7, by_legislator, {"S354": "W000817"})
+        self.assertEqual(
+            rows,
+            [
+                {
+                    "legislation_vote_id": 7,
+                    "legislator_bioguide_id": "W000817",
+                    "vote": LegislatorVoteType.from_string("Yea"),
+                }
+            ],
+        )
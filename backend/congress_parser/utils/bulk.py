@@ -0,0 +1,100 @@
+"""
+Bulk write helpers for the ingest pipelines.
+
+The ORM paths flush (or commit) after every node so that children can see the
+primary key of their parent. For large documents that turns into one round
+trip per node. These helpers let a loader reserve a block of primary keys up
+front, wire the parent/child graph client-side, and then stream all the rows
+into Postgres with a single COPY.
+"""
+
+import io
+from typing import Any, Iterable, List, Optional, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+
+def reserve_ids(session: "Session", table_name: str, pk_column: str, count: int) -> List[int]:
+    """
+    Pulls `count` values from the serial sequence backing `table_name.pk_column`
+    in a single statement.
+
+    Args:
+        session (Session): Active session, the ids are reserved on its connection
+        table_name (str): Table owning the sequence (e.g. "legislation_content")
+        pk_column (str): Serial primary key column
+        count (int): How many ids we need
+
+    Returns:
+        List[int]: Ascending list of reserved ids
+    """
+    if count <= 0:
+        return []
+    query = text(
+        "SELECT nextval(pg_get_serial_sequence(:table_name, :pk_column)) "
+        "FROM generate_series(1, :count)"
+    )
+    ids = session.execute(
+        query, {"table_name": table_name, "pk_column": pk_column, "count": count}
+    ).scalars().all()
+    # nextval() under generate_series is ascending in practice, but the callers
+    # rely on the ids following insertion order, so make it explicit.
+    return sorted(ids)
+
+
+def _copy_escape(value: Any) -> str:
+    """
+    Formats a single value for COPY ... FROM STDIN in the default text format.
+    """
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    value = str(value)
+    return (
+        value.replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def rows_to_copy_buffer(rows: Iterable[Sequence[Any]]) -> io.StringIO:
+    """
+    Serializes rows into a buffer ready to be fed to COPY.
+    """
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(_copy_escape(x) for x in row))
+        buffer.write("\n")
+    buffer.seek(0)
+    return buffer
+
+
+def copy_rows(
+    session: "Session",
+    table_name: str,
+    columns: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+    *,
+    schema: Optional[str] = None,
+) -> None:
+    """
+    Streams the rows into the table with a single COPY on the session's connection,
+    so it participates in the session's transaction.
+
+    Args:
+        session (Session): Active session
+        table_name (str): Destination table
+        columns (Sequence[str]): Column names, in the same order as each row
+        rows (Iterable[Sequence[Any]]): The row tuples
+        schema (Optional[str], optional): Schema of the table. Defaults to None.
+    """
+    target = f"{schema}.{table_name}" if schema else table_name
+    buffer = rows_to_copy_buffer(rows)
+    raw_connection = session.connection().connection
+    with raw_connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {target} ({', '.join(columns)}) FROM STDIN", buffer
+        )
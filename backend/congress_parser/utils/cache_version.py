@@ -0,0 +1,16 @@
+"""
+Signals the API that imported data changed.
+
+The FastAPI app caches responses per api_cache_version (congress_fastapi.utils.cache)
+and drops them when the sequence moves. Importers call bump_cache_version once their
+writes are committed, so the next cache fill sees them.
+"""
+
+from sqlalchemy import select
+
+from congress_db.models import api_cache_version
+
+
+def bump_cache_version(session) -> None:
+    session.execute(select(api_cache_version.next_value()))
+    session.commit()
@@ -1,81 +1,119 @@
 import re
+from bisect import bisect_left
 
-
-def resolve_citations(text: str, title_num: str) -> str:
-    """
-    Puts xml tags around all citations
-    """
-    title_cites = [
+# In order of precedence, the first pattern that matches anywhere in a piece of text
+# is the one that splits it
+TITLE_CITES = [
+    re.compile(x, re.MULTILINE + re.IGNORECASE)
+    for x in [
         r"\W(sections? (?P<inner>.*?) of (?P<title>(?:this )?title(?:\d\d?)?))\W",
         r"\W(section (?P<section>\d*)(?P<subsection>\(.*?\))? of (?P<title>this title))\W",
         r"\W(section (?P<section>\d*)(?P<subsection>\(.*?\))? of title (?P<title>\d\d?))\W",
         r"\W(section (?P<section>\d*))\W",
     ]
+]
+SUBSECTIONS = re.compile(r"(?P<section>\d+)?(?P<subsections>(?:\(.*?\))*)?")
+# Every citation contains the word section, and the first three also contain " of ...
+# title" after it. Their positions tell which pieces of the text cannot match at all.
+SECTION_WORD = re.compile("section", re.IGNORECASE)
+OF_TITLE = re.compile(r" of (?:this )?title", re.IGNORECASE)
 
-    def spit_out_xml(t, s, text):
-        return f'<usccite src="/usc/{t}/{s}">{text}</usccite>'
 
-    subsect_reg = r"(?P<section>\d+)?(?P<subsections>(?:\(.*?\))*)?"
-    for regex_str in title_cites:
-        result = ""
-        matches = re.search(regex_str, text, re.MULTILINE + re.IGNORECASE)
-        if matches is not None:
-            group_matches = matches.groupdict()
-            last_ind = 0
-            title_num_m = group_matches.get("title", "this title")
-            if title_num_m == "this title":
-                title_num_m = title_num
-            if "section" in group_matches:
-                sec_num = group_matches.get("section")
+def spit_out_xml(t, s, text):
+    return f'<usccite src="/usc/{t}/{s}">{text}</usccite>'
+
+
+def _first_citation(text, start, end, sections, anchors, anchor_starts):
+    """
+    The first pattern that matches in text[start:end] and its leftmost match there.
+    Searching with pos/endpos is the same as searching the slice, none of the patterns
+    have anchors or lookbehinds.
+    """
+    i = bisect_left(sections, start)
+    if i == len(sections) or sections[i] + len("section") > end:
+        return None, None
+    j = bisect_left(anchor_starts, sections[i])
+    has_anchor = j < len(anchors) and anchors[j][1] <= end
+    # The \W before the first "section" is where the earliest match could start
+    pos = max(start, sections[i] - 1)
+    for index, pattern in enumerate(TITLE_CITES):
+        if index < 3 and not has_anchor:
+            continue
+        match = pattern.search(text, pos, end)
+        if match is not None:
+            return index, match
+    return None, None
 
-                end_ind = 0
-                if "title" in group_matches:
-                    end_ind = matches.end("title")
-                else:
-                    end_ind = matches.end("section")
-                p_str = spit_out_xml(
-                    title_num_m,
-                    sec_num,
-                    f"section {text[matches.start('section'):end_ind]}",
-                )
-                # TODO: Is recursion the best option here?
-                return (
-                    resolve_citations(
-                        text[last_ind : matches.start("section") - len("section ")],
+
+def resolve_citations(text: str, title_num: str) -> str:
+    """
+    Puts xml tags around all citations
+
+    The text is split at the citation found by the first matching pattern, and the
+    pieces on either side are resolved the same way, with the title of that citation
+    standing in for "this title". The pieces are kept on a stack of (start, end, title)
+    offsets into the text, so nothing is copied or searched twice and long notes
+    paragraphs do not recurse.
+    """
+    sections = [x.start() for x in SECTION_WORD.finditer(text)]
+    if not sections:
+        return text
+    anchors = [(x.start(), x.end()) for x in OF_TITLE.finditer(text)]
+    anchor_starts = [x[0] for x in anchors]
+
+    output = []
+    # Either a (start, end, title) piece still to resolve or finished markup
+    stack = [(0, len(text), title_num)]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            output.append(item)
+            continue
+        start, end, title = item
+        index, matches = _first_citation(
+            text, start, end, sections, anchors, anchor_starts
+        )
+        if matches is None:
+            output.append(text[start:end])
+            continue
+        group_matches = matches.groupdict()
+        title_num_m = group_matches.get("title", "this title")
+        if title_num_m == "this title":
+            title_num_m = title
+        if index > 0:
+            sec_num = group_matches.get("section")
+            if "title" in group_matches:
+                end_ind = matches.end("title")
+            else:
+                end_ind = matches.end("section")
+            p_str = spit_out_xml(
+                title_num_m,
+                sec_num,
+                f"section {text[matches.start('section'):end_ind]}",
+            )
+            left_end = matches.start("section") - len("section ")
+        else:
+            end_ind = matches.end("inner")
+            inner_str = group_matches.get("inner")
+            current_section = None
+            p_str = ""
+            last_inner_ind = 0
+            for sub_match in SUBSECTIONS.finditer(inner_str):
+                if sub_match.group(0) != "":
+                    g_dict = sub_match.groupdict()
+                    current_section = g_dict.get("section") or current_section
+                    p_str += inner_str[last_inner_ind : sub_match.start()] + spit_out_xml(
                         title_num_m,
+                        current_section,
+                        inner_str[sub_match.start() : sub_match.end()],
                     )
-                    + p_str
-                    + resolve_citations(text[end_ind:], title_num_m)
-                )
-            elif "inner" in group_matches:
-                inner_ind = matches.start("inner")
-                end_ind = matches.end("inner")
-                inner_str = group_matches.get("inner")
-                inner_matches = re.finditer(subsect_reg, inner_str)
-                current_section = None
-                p_str = ""
-                last_inner_ind = 0
-                for sub_match in inner_matches:
-                    if sub_match.group(0) != "":
-                        g_dict = sub_match.groupdict()
-                        current_section = g_dict.get("section") or current_section
-                        subsect = g_dict.get("subsections")
-                        p_str += inner_str[
-                            last_inner_ind : sub_match.start()
-                        ] + spit_out_xml(
-                            title_num_m,
-                            current_section,
-                            inner_str[sub_match.start() : sub_match.end()],
-                        )
-                        last_inner_ind = sub_match.end()
-                return (
-                    resolve_citations(
-                        text[last_ind : matches.start("inner")], title_num_m
-                    )
-                    + p_str
-                    + resolve_citations(text[end_ind:], title_num_m)
-                )
-    return text
+                    last_inner_ind = sub_match.end()
+            left_end = matches.start("inner")
+        # Pushed in reverse, the left piece is resolved first
+        stack.append((end_ind, end, title_num_m))
+        stack.append(p_str)
+        stack.append((start, left_end, title_num_m))
+    return "".join(output)
 
 
 def remove_citations(text: str) -> str:
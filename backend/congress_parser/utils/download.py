@@ -0,0 +1,192 @@
+"""
+Cached downloads for the bulk archives (govinfo BILLS/BILLSTATUS, uscode release points).
+
+Next to every downloaded file we keep a small JSON file with the ETag and
+Last-Modified the server sent for it. On the next run the request is made
+conditional on those, so an unchanged archive costs a 304 instead of a full
+download.
+
+Whether the caller still has to parse a file is tracked separately. Once it has
+imported the file it calls mark_parsed, which copies the validators into
+"<file>.parsed.json". fetch reports changed for as long as the two differ, so an
+archive whose import crashed after the download is still reported as changed on
+the next run.
+
+Downloads are streamed in chunks to a ".part" file and only renamed into place once
+complete. If a run dies part way through, the next one asks for the rest with a
+Range request, guarded by If-Range so a file that changed in the meantime is fetched
+again from the start.
+"""
+
+import json
+import os
+from typing import Any, Dict, Optional, TypedDict
+
+import requests
+
+CHUNK_SIZE = 1 << 20
+TIMEOUT = int(os.environ.get("PARSE_DOWNLOAD_TIMEOUT", 60))
+VALIDATORS_SUFFIX = ".validators.json"
+PARSED_SUFFIX = ".parsed.json"
+PART_SUFFIX = ".part"
+
+
+class Validators(TypedDict):
+    etag: Optional[str]
+    last_modified: Optional[str]
+    content_length: Optional[int]
+
+
+class Download(TypedDict):
+    path: str
+    # False when our copy is current and mark_parsed was called for it
+    changed: bool
+
+
+def _validators(headers) -> Validators:
+    length = headers.get("Content-Length")
+    return {
+        "etag": headers.get("ETag"),
+        "last_modified": headers.get("Last-Modified"),
+        "content_length": int(length) if length is not None else None,
+    }
+
+
+def read_validators(path: str) -> Optional[Validators]:
+    try:
+        with open(path + VALIDATORS_SUFFIX) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_validators(path: str, validators: Validators):
+    with open(path + VALIDATORS_SUFFIX, "w") as f:
+        json.dump(validators, f)
+
+
+def mark_parsed(path: str):
+    """
+    Records that the current copy of path was imported, later fetches report it
+    unchanged until the server has a new one
+    """
+    validators = read_validators(path)
+    if validators is None:
+        return
+    with open(path + PARSED_SUFFIX, "w") as f:
+        json.dump(validators, f)
+
+
+def _result(path: str) -> Download:
+    try:
+        with open(path + PARSED_SUFFIX) as f:
+            parsed = json.load(f)
+    except (OSError, ValueError):
+        parsed = None
+    return {"path": path, "changed": parsed != read_validators(path)}
+
+
+def conditional_headers(validators: Optional[Validators]) -> Dict[str, str]:
+    headers = {}
+    if validators is None:
+        return headers
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+def _adopt_existing(http: Any, url: str, path: str) -> Optional[Validators]:
+    """
+    A file downloaded before validators were recorded. If the server's copy is the
+    same size we take its validators for ours instead of downloading it again.
+    """
+    res = http.head(url, allow_redirects=True, timeout=TIMEOUT)
+    if res.status_code != 200:
+        return None
+    validators = _validators(res.headers)
+    if validators["content_length"] != os.path.getsize(path):
+        return None
+    write_validators(path, validators)
+    return validators
+
+
+def _resume_headers(part_path: str) -> Dict[str, str]:
+    validators = read_validators(part_path)
+    if validators is None or not os.path.exists(part_path):
+        return {}
+    # If-Range needs a strong ETag or a date
+    if_range = validators.get("etag")
+    if if_range is None or if_range.startswith("W/"):
+        if_range = validators.get("last_modified")
+    if if_range is None:
+        return {}
+    return {"Range": f"bytes={os.path.getsize(part_path)}-", "If-Range": if_range}
+
+
+def _discard_part(part_path: str):
+    for stale in [part_path, part_path + VALIDATORS_SUFFIX]:
+        if os.path.exists(stale):
+            os.remove(stale)
+
+
+def fetch(url: str, dir_name: str, session: Any = None) -> Optional[Download]:
+    """
+    Downloads url into dir_name, unless the copy already there is current
+
+    Args:
+        url: File to download, the last path component is used as the file name
+        dir_name: Directory to download into, created if needed
+        session: requests.Session (or the requests module) to issue the requests with
+
+    Returns:
+        The local path and whether it changed since mark_parsed, None if the server
+        does not have it
+    """
+    http = session or requests
+    os.makedirs(dir_name, exist_ok=True)
+    path = os.path.join(dir_name, url.split("/")[-1])
+    part_path = path + PART_SUFFIX
+
+    validators = None
+    if os.path.exists(path):
+        validators = read_validators(path)
+        if validators is None and _adopt_existing(http, url, path) is not None:
+            return _result(path)
+
+    headers = _resume_headers(part_path)
+    if not headers:
+        _discard_part(part_path)
+        headers = conditional_headers(validators)
+    # Byte ranges and Content-Length are only meaningful for the file as stored
+    headers["Accept-Encoding"] = "identity"
+    with http.get(url, headers=headers, stream=True, timeout=TIMEOUT) as res:
+        if res.status_code == 304:
+            return _result(path)
+        if res.status_code == 404:
+            return None
+        if res.status_code == 416:
+            # The partial file is not a prefix of what the server has now
+            _discard_part(part_path)
+            return fetch(url, dir_name, session)
+        res.raise_for_status()
+        if res.status_code == 206:
+            mode = "ab"
+            received = read_validators(part_path)
+        else:
+            mode = "wb"
+            received = _validators(res.headers)
+            write_validators(part_path, received)
+        with open(part_path, mode) as f:
+            for chunk in res.iter_content(chunk_size=CHUNK_SIZE):
+                f.write(chunk)
+    size = os.path.getsize(part_path)
+    if received.get("content_length") is not None and size != received["content_length"]:
+        # Keep the partial file, the next run resumes it
+        raise IOError(
+            f"{url}: got {size} of {received['content_length']} bytes, will resume"
+        )
+    os.replace(part_path, path)
+    os.replace(part_path + VALIDATORS_SUFFIX, path + VALIDATORS_SUFFIX)
+    return _result(path)